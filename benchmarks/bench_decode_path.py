@@ -0,0 +1,104 @@
+"""Measure what the direct decode path saves over whisper.transcribe per call.
+
+For clips up to 30 s, Transcriber computes the mel and calls the model's
+decode directly instead of going through whisper.transcribe's seek loop,
+30 s padded STFT, compression checks and segment bookkeeping. For each clip
+length this reports:
+
+* overhead: both paths with the model's decode replaced by a stub that
+  returns at once, so only the per-call machinery around it is timed.
+* end to end: both paths with real decoding.
+
+A randomly initialised model with base.en's dimensions is used unless
+``--model`` names a downloaded Whisper model.
+
+Usage:
+    python benchmarks/bench_decode_path.py [--model base.en] [--seconds 2,5,10,20,29] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import numpy as np
+import torch
+from whisper.decoding import DecodingResult
+from whisper.model import ModelDimensions, Whisper
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from prosody.transcription import Transcriber  # noqa: E402
+
+BASE_EN = ModelDimensions(
+    n_mels=80, n_audio_ctx=1500, n_audio_state=512, n_audio_head=8, n_audio_layer=6,
+    n_vocab=51864, n_text_ctx=448, n_text_state=512, n_text_head=8, n_text_layer=6,
+)
+
+
+def random_model() -> Whisper:
+    """A base.en-sized model with random weights."""
+    torch.manual_seed(0)
+    model = Whisper(BASE_EN).eval()
+    # Whisper leaves this uninitialized until a checkpoint is loaded
+    torch.nn.init.normal_(model.decoder.positional_embedding, std=0.01)
+    return model
+
+
+def stub_decode(segment, options):
+    """Stand-in for model.decode that returns a fixed result at once."""
+    return DecodingResult(
+        audio_features=segment, language="en", tokens=[1], text="",
+        avg_logprob=0.0, no_speech_prob=0.0, temperature=0.0, compression_ratio=1.0,
+    )
+
+
+def best_time(transcriber, audio: np.ndarray, repeat: int) -> float:
+    """Best wall time of one transcription, after a warm-up call."""
+    transcriber.transcribe(audio, normalized=True)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        transcriber.transcribe(audio, normalized=True)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", help="Downloaded Whisper model (default random base.en-sized weights)")
+    parser.add_argument("--seconds", default="2,5,10,20,29", help="Comma-separated clip lengths")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    transcribers = {}
+    for direct in (False, True):
+        if args.model:
+            transcribers[direct] = Transcriber(model_name=args.model, decoding="fastest", direct_decode=direct)
+        else:
+            with patch("whisper.load_model", side_effect=lambda *a, **k: random_model()):
+                transcribers[direct] = Transcriber(decoding="fastest", direct_decode=direct, thread_profile=False)
+
+    rng = np.random.default_rng(0)
+    print(f"{'clip s':>7}{'overhead: transcribe ms':>25}{'direct ms':>11}{'saved ms':>10}"
+          f"{'end to end: transcribe s':>26}{'direct s':>10}")
+    for seconds in (float(s) for s in args.seconds.split(",")):
+        audio = (rng.standard_normal(int(seconds * 16000)) * 0.1).astype(np.float32)
+
+        overhead = {}
+        for direct, transcriber in transcribers.items():
+            # Replace the counting wrapper too; it is restored below
+            decode, transcriber.model.decode = transcriber.model.decode, stub_decode
+            try:
+                overhead[direct] = best_time(transcriber, audio, args.repeat)
+            finally:
+                transcriber.model.decode = decode
+
+        total = {direct: best_time(t, audio, max(1, args.repeat // 2)) for direct, t in transcribers.items()}
+        print(f"{seconds:>7.0f}{overhead[False] * 1000:>25.1f}{overhead[True] * 1000:>11.1f}"
+              f"{(overhead[False] - overhead[True]) * 1000:>10.1f}{total[False]:>26.3f}{total[True]:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
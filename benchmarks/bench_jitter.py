@@ -0,0 +1,110 @@
+"""Measure UI frame jitter while inference runs, with and without a scheduling policy.
+
+A 60 fps loop stands in for the waveform animation: every frame it does a
+little NumPy work, like PolishedWaveformIndicator does, and records how late
+it woke up. Frame lateness is measured in three cases:
+
+* ``idle``: no inference running.
+* ``default``: inference runs in a background thread with torch defaults.
+* ``policy``: the same, with SchedulingPolicy applied to the inference thread.
+
+Inference uses a randomly initialised Whisper model with base.en's
+dimensions, so no download is needed and the work matches the real model.
+
+Usage:
+    python benchmarks/bench_jitter.py [--seconds 10] [--nice 10] [--reserved-cores 1] [--cpus 2-7]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import torch
+from whisper.model import ModelDimensions, Whisper
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from prosody.scheduling import SchedulingPolicy, parse_cpu_list  # noqa: E402
+from prosody.tuning import time_inference  # noqa: E402
+
+BASE_EN = ModelDimensions(
+    n_mels=80, n_audio_ctx=1500, n_audio_state=512, n_audio_head=8, n_audio_layer=6,
+    n_vocab=51864, n_text_ctx=448, n_text_state=512, n_text_head=8, n_text_layer=6,
+)
+
+
+def frame_lateness(seconds: float, fps: float = 60.0) -> np.ndarray:
+    """Run a UI-like frame loop and return how late each frame started, in ms."""
+    period = 1.0 / fps
+    history = np.zeros(50, dtype=np.float32)
+    late = []
+    deadline = time.perf_counter() + period
+    end = time.perf_counter() + seconds
+    while deadline < end:
+        time.sleep(max(0.0, deadline - time.perf_counter()))
+        late.append(time.perf_counter() - deadline)
+        # The waveform's per-frame work: shift the history and add a level
+        history[:-1] = history[1:]
+        history[-1] = float(np.random.rand())
+        deadline += period
+    return np.array(late) * 1000
+
+
+def run_case(model, seconds: float, policy) -> np.ndarray:
+    """Measure frame lateness, optionally with inference running alongside."""
+    if model is None:
+        return frame_lateness(seconds)
+
+    stop = threading.Event()
+
+    def infer():
+        # Fresh thread per case, so torch's worker threads inherit the policy
+        if policy is not None:
+            policy.apply()
+        while not stop.is_set():
+            time_inference(model, repeats=1)
+
+    thread = threading.Thread(target=infer, daemon=True)
+    thread.start()
+    time.sleep(1.0)  # Let inference get going
+    try:
+        return frame_lateness(seconds)
+    finally:
+        stop.set()
+        thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0, help="Measurement time per case")
+    parser.add_argument("--nice", type=int, default=10)
+    parser.add_argument("--reserved-cores", type=int, default=1)
+    parser.add_argument("--cpus", help="CPU list inference may use, e.g. 2-7")
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    model = Whisper(BASE_EN).eval()
+    policy = SchedulingPolicy(
+        nice=args.nice,
+        cpus=parse_cpu_list(args.cpus) if args.cpus else None,
+        reserved_cores=args.reserved_cores,
+    )
+    print(f"{os.cpu_count()} CPUs, torch threads {torch.get_num_threads()}, "
+          f"policy nice={args.nice} inference CPUs={sorted(policy.inference_cpus() or [])}")
+    print(f"{'case':<10}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}{'max ms':>8}{'late>16ms':>11}")
+    for name, case_model, case_policy in (
+        ("idle", None, None),
+        ("default", model, None),
+        ("policy", model, policy),
+    ):
+        late = run_case(case_model, args.seconds, case_policy)
+        p50, p95, p99 = np.percentile(late, [50, 95, 99])
+        missed = np.count_nonzero(late > 1000 / 60)
+        print(f"{name:<10}{p50:>8.2f}{p95:>8.2f}{p99:>8.2f}{late.max():>8.2f}{missed:>11}")
+
+
+if __name__ == "__main__":
+    main()
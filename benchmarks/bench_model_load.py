@@ -0,0 +1,120 @@
+"""Compare model load time and memory for the checkpoint and the mmap cache.
+
+Each path loads in a fresh process so neither sees the other's memory:
+
+* checkpoint: ``whisper.load_model`` on Whisper's .pt file, which builds a
+  randomly initialised model, unpickles every tensor into private memory
+  and copies it into the parameters.
+* mmap cache: ``load_mmap_checkpoint``, which builds the model without
+  initialising it and assigns tensors mapped from the cache file.
+
+Reported are the load time, and the process's resident memory after the
+load and after one encoder pass, split into private (anonymous) pages and
+file pages that the page cache shares with other processes. Both files are
+read once beforehand so the page cache is warm for each.
+
+A checkpoint with random weights and base.en's dimensions is written to a
+temporary directory unless ``--model`` names a downloaded Whisper model.
+
+Usage:
+    python benchmarks/bench_model_load.py [--model base.en] [--repeat 3]
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import torch
+import whisper
+from whisper.model import ModelDimensions, Whisper
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from prosody.transcription import load_mmap_checkpoint, save_mmap_checkpoint  # noqa: E402
+
+BASE_EN = ModelDimensions(
+    n_mels=80, n_audio_ctx=1500, n_audio_state=512, n_audio_head=8, n_audio_layer=6,
+    n_vocab=51864, n_text_ctx=448, n_text_state=512, n_text_head=8, n_text_layer=6,
+)
+
+
+def memory() -> dict:
+    """Resident memory of this process in MB, from /proc."""
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in ("VmRSS", "RssAnon", "RssFile"):
+                fields[name] = int(value.split()[0]) / 1024
+    return fields
+
+
+def measure(path: str, mmap: bool) -> None:
+    """Load one model in this process and print the measurements as JSON."""
+    started = time.perf_counter()
+    model = load_mmap_checkpoint(path) if mmap else whisper.load_model(path, device="cpu")
+    seconds = time.perf_counter() - started
+    loaded = memory()
+    with torch.no_grad():
+        model.embed_audio(torch.zeros(1, model.dims.n_mels, 3000))
+    print(json.dumps({"seconds": seconds, "loaded": loaded, "inference": memory()}))
+
+
+def run(path: str, mmap: bool) -> dict:
+    """Measure one load in a child process."""
+    command = [sys.executable, __file__, "--measure", path] + (["--mmap"] if mmap else [])
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def write_random_checkpoint(path: str) -> None:
+    """Save a base.en-sized model with random weights in Whisper's format."""
+    torch.manual_seed(0)
+    model = Whisper(BASE_EN)
+    torch.nn.init.normal_(model.decoder.positional_embedding, std=0.01)
+    torch.save({"dims": dataclasses.asdict(BASE_EN), "model_state_dict": model.state_dict()}, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", help="Downloaded Whisper model (default random base.en-sized weights)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    parser.add_argument("--mmap", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.mmap)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.model:
+            checkpoint = os.path.join(os.path.expanduser("~/.cache/whisper"), f"{args.model}.pt")
+            if not os.path.exists(checkpoint):
+                sys.exit(f"{checkpoint} not found; run Prosody once to download it")
+        else:
+            checkpoint = os.path.join(directory, "base.en.pt")
+            write_random_checkpoint(checkpoint)
+        cache = os.path.join(directory, "base.en-mmap.pt")
+        save_mmap_checkpoint(whisper.load_model(checkpoint, device="cpu"), cache)
+
+        print(f"{'path':<12}{'load s':>8}{'RSS MB':>9}{'private':>9}{'shared':>8}"
+              f"{'after encode: RSS':>19}{'private':>9}")
+        for name, path, mmap in (("checkpoint", checkpoint, False), ("mmap cache", cache, True)):
+            with open(path, "rb") as f:
+                while f.read(1 << 24):
+                    pass  # Warm the page cache
+            results = [run(path, mmap) for _ in range(args.repeat)]
+            best = min(results, key=lambda result: result["seconds"])
+            loaded, inference = best["loaded"], best["inference"]
+            print(f"{name:<12}{best['seconds']:>8.3f}{loaded['VmRSS']:>9.0f}{loaded['RssAnon']:>9.0f}"
+                  f"{loaded['RssFile']:>8.0f}{inference['VmRSS']:>19.0f}{inference['RssAnon']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Measure end-to-end stop-to-text latency on recorded audio, without hardware.
+
+Each WAV/.npy file is replayed through AudioRecorder via a FileSource. The
+recording is then stopped and goes through the same VAD and transcription
+steps as ProsodyApp.stop_recording. The time from stop to text is reported
+per file.
+
+With ``--streaming`` a StreamingTranscriber transcribes finished segments
+while the file is replayed (always in real time, since segments can only be
+processed while recording goes on), and stop-to-text covers only the tail.
+
+Usage:
+    python benchmarks/bench_pipeline.py clip1.wav clip2.wav [--model base.en] [--realtime] [--streaming]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from prosody.audio import AudioRecorder  # noqa: E402
+from prosody.sources import FileSource  # noqa: E402
+from prosody.streaming import StreamingTranscriber  # noqa: E402
+from prosody.transcription import Transcriber  # noqa: E402
+from prosody.vad import VoiceActivityDetector  # noqa: E402
+
+
+def run_file(
+    path: str, transcriber: Transcriber, vad: VoiceActivityDetector, realtime: bool, streaming: bool
+) -> dict:
+    """Replay one file and time stop-to-text."""
+    source = FileSource(path, realtime=realtime or streaming)
+    recorder = AudioRecorder(source=source)
+
+    recorder.start_recording()
+    streamer = None
+    if streaming:
+        streamer = StreamingTranscriber(recorder, transcriber, vad=vad)
+        streamer.start()
+    source.wait()
+
+    started = time.perf_counter()
+    audio = recorder.stop_recording()
+    if streamer is not None:
+        text = streamer.finish(audio)
+    else:
+        speech = vad.trim(audio)
+        text = transcriber.transcribe(speech) if len(speech) else ""
+    latency = time.perf_counter() - started
+
+    return {
+        "file": os.path.basename(path),
+        "audio_s": len(audio) / recorder.samplerate,
+        "latency_s": latency,
+        "text": text,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="+", help="WAV or .npy (16 kHz) files")
+    parser.add_argument("--model", default="base.en")
+    parser.add_argument("--realtime", action="store_true", help="Replay at real time instead of as fast as possible")
+    parser.add_argument("--streaming", action="store_true", help="Transcribe segments while replaying")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    transcriber = Transcriber(model_name=args.model)
+    print(f"Model load: {time.perf_counter() - started:.2f}s")
+
+    vad = VoiceActivityDetector()
+    print(f"{'file':<28}{'audio s':>9}{'stop->text s':>14}  text")
+    for _ in range(args.repeat):
+        for path in args.files:
+            result = run_file(path, transcriber, vad, args.realtime, args.streaming)
+            print(f"{result['file']:<28}{result['audio_s']:>9.2f}{result['latency_s']:>14.3f}  {result['text'][:60]}")
+
+
+if __name__ == "__main__":
+    main()
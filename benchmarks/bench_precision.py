@@ -0,0 +1,107 @@
+"""Compare Whisper inference precisions: latency, memory and transcript drift.
+
+Each precision runs in its own process so resident memory is measured
+cleanly. For every precision the script reports model load time, RSS after
+loading and after transcribing, mean transcription latency per file, and
+drift: the word error rate of its transcripts against the fp32 ones.
+
+Usage:
+    python benchmarks/bench_precision.py clip1.wav clip2.wav [--model base.en] [--precisions fp32,int8,bf16]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+def rss_mb() -> float:
+    """Current resident set size in MB."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance divided by the reference length."""
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    previous = list(range(len(hyp) + 1))
+    for i, word in enumerate(ref, 1):
+        current = [i]
+        for j, other in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (word != other)))
+        previous = current
+    return previous[-1] / max(1, len(ref))
+
+
+def run_precision(precision: str, model: str, files: list, repeat: int) -> dict:
+    """Load the model at one precision and transcribe every file."""
+    import numpy as np
+    from prosody.sources import read_wav
+    from prosody.transcription import Transcriber
+
+    started = time.perf_counter()
+    transcriber = Transcriber(model_name=model, precision=precision)
+    load_s = time.perf_counter() - started
+    loaded_rss = rss_mb()
+
+    texts, latencies = [], []
+    for path in files:
+        audio = np.load(path) if path.endswith(".npy") else read_wav(path)[0][:, 0]
+        for _ in range(repeat):
+            started = time.perf_counter()
+            text = transcriber.transcribe(audio)
+            latencies.append(time.perf_counter() - started)
+        texts.append(text)
+
+    return {
+        "precision": transcriber.precision,
+        "load_s": load_s,
+        "rss_loaded_mb": loaded_rss,
+        "rss_after_mb": rss_mb(),
+        "latency_s": sum(latencies) / len(latencies),
+        "texts": texts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="+", help="WAV or .npy (16 kHz) files")
+    parser.add_argument("--model", default="base.en")
+    parser.add_argument("--precisions", default="fp32,int8,bf16")
+    parser.add_argument("--repeat", type=int, default=3, help="Transcriptions per file")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_precision(args.worker, args.model, args.files, args.repeat)))
+        return
+
+    results = []
+    for precision in args.precisions.split(","):
+        # Build the int8 cache in an untimed run so the reported load reads it
+        command = [sys.executable, __file__, *args.files, "--model", args.model,
+                   "--repeat", str(args.repeat), "--worker", precision]
+        if precision == "int8":
+            subprocess.run(command, check=True, capture_output=True)
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        result["requested"] = precision
+        results.append(result)
+
+    reference = next((r["texts"] for r in results if r["requested"] == "fp32"), None)
+    print(f"{'precision':<10}{'load s':>8}{'RSS MB':>9}{'after MB':>9}{'latency s':>11}{'drift WER':>11}")
+    for r in results:
+        drift = ""
+        if reference is not None:
+            drift = f"{sum(map(word_error_rate, reference, r['texts'])) / len(reference):.3f}"
+        name = r["requested"] if r["requested"] == r["precision"] else f"{r['requested']}->{r['precision']}"
+        print(f"{name:<10}{r['load_s']:>8.2f}{r['rss_loaded_mb']:>9.0f}{r['rss_after_mb']:>9.0f}"
+              f"{r['latency_s']:>11.3f}{drift:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark streaming preprocessing against whole-buffer normalization.
+
+Reports CPU time per second of audio for:
+
+* ``normalize (old)``: what transcription did to every finished recording,
+  a float32 conversion plus two ``np.abs(audio).max()`` passes.
+* ``normalize (peak)``: the same check done as one max/min pass.
+* each preprocessing stage on its own, and the full chain, run block by
+  block the way the audio callback runs them.
+
+Usage:
+    python benchmarks/bench_preprocess.py [--seconds 60] [--block-ms 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from prosody.preprocess import AudioPreprocessor  # noqa: E402
+
+
+def cpu_ms_per_second(run, seconds: float, repeats: int = 3) -> float:
+    """Run the workload and return the best CPU milliseconds per second of audio."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.process_time()
+        run()
+        best = min(best, time.process_time() - start)
+    return best * 1000 / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0, help="Audio length to process")
+    parser.add_argument("--block-ms", type=float, default=10.0, help="Callback block length")
+    args = parser.parse_args()
+
+    samplerate = 16000
+    block = int(samplerate * args.block_ms / 1000)
+    audio = (np.random.randn(int(samplerate * args.seconds)) * 1.5).astype(np.float32)
+    blocks = [audio[i:i + block].reshape(-1, 1) for i in range(0, len(audio), block)]
+
+    def old_normalize():
+        data = audio.astype(np.float32)
+        if np.abs(data).max() > 1.0:
+            data = data / np.abs(data).max()
+
+    def peak_normalize():
+        peak = max(float(audio.max()), -float(audio.min()))
+        if peak > 1.0:
+            audio / peak
+
+    def streaming(**stages):
+        preprocessor = AudioPreprocessor(samplerate=samplerate, **stages)
+
+        def run():
+            preprocessor.reset()
+            for b in blocks:
+                preprocessor.process(b)
+        return run
+
+    off = dict(dc_removal=False, highpass_hz=None, agc=False)
+    cases = [
+        ("normalize (old)", old_normalize),
+        ("normalize (peak)", peak_normalize),
+        ("stream: clip only", streaming(**off)),
+        ("stream: dc", streaming(**dict(off, dc_removal=True))),
+        ("stream: highpass", streaming(**dict(off, highpass_hz=80.0))),
+        ("stream: agc", streaming(**dict(off, agc=True))),
+        ("stream: dc+highpass+agc", streaming()),
+    ]
+
+    print(f"{args.seconds:.0f}s of audio, {block}-frame blocks")
+    for name, run in cases:
+        print(f"  {name:26s} {cpu_ms_per_second(run, args.seconds):7.3f} ms CPU per second of audio")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark the cost of capturing at the device rate and resampling to 16 kHz.
+
+Feeds synthetic callback-sized blocks through the same code the recorder
+runs and reports CPU time per second of audio:
+
+* ``direct 16k``: the previous path, where the device is opened at 16 kHz and
+  the callback only copies blocks into the capture buffer (any resampling
+  happens out of process in PortAudio/PulseAudio and is not counted here).
+* ``polyphase <rate>``: capture at the native rate and resample in the
+  callback with StreamingResampler before buffering.
+* ``scipy resample_poly``: one-shot reference, if SciPy is installed.
+
+Usage:
+    python benchmarks/bench_resample.py [--seconds 60] [--block-ms 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from prosody.audio import CaptureBuffer  # noqa: E402
+from prosody.resample import StreamingResampler  # noqa: E402
+
+
+def cpu_ms_per_second(run, seconds: float) -> float:
+    """Run the workload and return CPU milliseconds per second of audio."""
+    start = time.process_time()
+    run()
+    return (time.process_time() - start) * 1000 / seconds
+
+
+def bench(rate: int, seconds: float, block_ms: float) -> float:
+    """Time resampling plus buffering for one device rate."""
+    block = int(rate * block_ms / 1000)
+    audio = (np.random.randn(int(rate * seconds), 1) * 0.1).astype(np.float32)
+    resampler = StreamingResampler(rate, 16000)
+    buffer = CaptureBuffer(initial_frames=int(16000 * seconds) + 1)
+
+    def run():
+        for i in range(0, len(audio), block):
+            buffer.write(resampler.process(audio[i:i + block]))
+
+    return cpu_ms_per_second(run, seconds)
+
+
+def bench_direct(seconds: float, block_ms: float) -> float:
+    """Time buffering alone at 16 kHz."""
+    block = int(16000 * block_ms / 1000)
+    audio = (np.random.randn(int(16000 * seconds), 1) * 0.1).astype(np.float32)
+    buffer = CaptureBuffer(initial_frames=len(audio) + 1)
+
+    def run():
+        for i in range(0, len(audio), block):
+            buffer.write(audio[i:i + block])
+
+    return cpu_ms_per_second(run, seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--block-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"{'path':<24}{'CPU ms / audio s':>18}")
+    print(f"{'direct 16k':<24}{bench_direct(args.seconds, args.block_ms):>18.3f}")
+    for rate in (48000, 44100, 32000, 22050):
+        print(f"{f'polyphase {rate}':<24}{bench(rate, args.seconds, args.block_ms):>18.3f}")
+
+    try:
+        from scipy.signal import resample_poly
+    except ImportError:
+        return
+    audio = np.random.randn(int(48000 * args.seconds)).astype(np.float32)
+    cost = cpu_ms_per_second(lambda: resample_poly(audio, 1, 3), args.seconds)
+    print(f"{'scipy resample_poly 48k':<24}{cost:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
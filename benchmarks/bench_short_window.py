@@ -0,0 +1,102 @@
+"""Compare short-window encoding with Whisper's padded 30 second window.
+
+Two parts:
+
+* Encoder time per window bucket, on a randomly initialised model with
+  base.en's dimensions, showing how it scales with the window.
+* With audio files: transcripts from the padded and short-window paths on
+  the real model, their latency, and the word error rate between them.
+
+Usage:
+    python benchmarks/bench_short_window.py [clip1.wav clip2.wav ...] [--model base.en] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+from whisper.model import ModelDimensions, Whisper
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from prosody.transcription import SHORT_WINDOW_BUCKETS, Transcriber, short_window_encoder  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_precision import word_error_rate  # noqa: E402
+
+BASE_EN = ModelDimensions(
+    n_mels=80, n_audio_ctx=1500, n_audio_state=512, n_audio_head=8, n_audio_layer=6,
+    n_vocab=51864, n_text_ctx=448, n_text_state=512, n_text_head=8, n_text_layer=6,
+)
+
+
+def encoder_times(model, repeat: int) -> dict:
+    """Best encoder time for each bucket's window length."""
+    times = {}
+    with torch.no_grad():
+        for seconds in SHORT_WINDOW_BUCKETS:
+            mel = torch.randn(1, model.dims.n_mels, int(seconds * 100))
+            model.encoder(mel)  # Warm-up
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                model.encoder(mel)
+                best = min(best, time.perf_counter() - started)
+            times[seconds] = best
+    return times
+
+
+def compare_files(files: list, model: str, repeat: int) -> None:
+    """Transcribe every file on both paths and report latency and drift."""
+    from prosody.sources import read_wav
+
+    padded = Transcriber(model_name=model, decoding="fastest")
+    short = Transcriber(model_name=model, decoding="fastest", short_window=True)
+
+    print(f"\n{'file':<30}{'seconds':>8}{'padded s':>10}{'short s':>9}{'WER':>7}")
+    errors = []
+    for path in files:
+        audio = np.load(path) if path.endswith(".npy") else read_wav(path)[0][:, 0]
+        latencies = {}
+        texts = {}
+        for name, transcriber in (("padded", padded), ("short", short)):
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                texts[name] = transcriber.transcribe(audio)
+                best = min(best, time.perf_counter() - started)
+            latencies[name] = best
+        errors.append(word_error_rate(texts["padded"], texts["short"]))
+        print(f"{os.path.basename(path)[:29]:<30}{len(audio) / 16000:>8.1f}"
+              f"{latencies['padded']:>10.3f}{latencies['short']:>9.3f}{errors[-1]:>7.3f}")
+        if errors[-1]:
+            print(f"  padded: {texts['padded']}\n  short:  {texts['short']}")
+    print(f"Mean WER of short-window against padded: {sum(errors) / len(errors):.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="WAV or .npy (16 kHz) files to compare transcripts on")
+    parser.add_argument("--model", default="base.en", help="Model for the transcript comparison")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    model = short_window_encoder(Whisper(BASE_EN).eval())
+
+    times = encoder_times(model, args.repeat)
+    print(f"Encoder time on base.en-sized weights, {torch.get_num_threads()} thread(s)")
+    print(f"{'window s':>9}{'encoder ms':>12}{'vs 30 s':>9}")
+    for seconds, elapsed in times.items():
+        print(f"{seconds:>9.0f}{elapsed * 1000:>12.1f}{elapsed / times[30.0]:>9.2f}")
+
+    if args.files:
+        compare_files(args.files, args.model, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
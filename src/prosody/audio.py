@@ -2,12 +2,16 @@
 
 import os
 import sys
+import tempfile
 import threading
-import queue
 import numpy as np
 import sounddevice as sd
 from typing import Optional, Tuple
 
+from .preprocess import AudioPreprocessor
+from .resample import StreamingResampler
+from .sources import AudioSource, MicrophoneSource
+
 # Check if running in development mode
 DEV_MODE = os.environ.get('PROSODY_DEV') == '1' or sys.argv[0].endswith('__main__.py')
 # Suppress output in tests
@@ -21,113 +25,663 @@ def log(message: str, important: bool = False):
         print(message)
 
 
+# Audio the callback can get ahead of the recorder's writer thread
+STAGING_SECONDS = 5.0
+
+
+class CaptureBuffer:
+    """Preallocated sample buffer that the audio callback writes into.
+
+    With no ``max_frames`` the buffer grows by doubling, so a recording costs
+    a handful of allocations in total instead of one per block. With
+    ``max_frames`` set it becomes a fixed-size ring holding only the most
+    recent frames.
+
+    A growable buffer with ``spill_bytes`` set moves to an anonymous scratch
+    file once growing would take it past that many bytes. From then on
+    blocks are appended to the file, so they live in the page cache rather
+    than the process's memory, and ``view`` returns an ``np.memmap``.
+
+    So that the audio callback never allocates or does I/O, ``write`` on a
+    growable buffer only copies the block into a preallocated staging ring.
+    ``drain`` moves staged frames into the growing store (reallocating,
+    spilling or appending to the file as needed) and is meant to run on
+    another thread; ``view`` and ``read_since`` drain first.
+    """
+
+    def __init__(
+        self,
+        channels: int = 1,
+        dtype=np.float32,
+        initial_frames: int = 16000 * 30,
+        max_frames: Optional[int] = None,
+        spill_bytes: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        staging_frames: int = int(16000 * STAGING_SECONDS),
+    ):
+        """Initialize the capture buffer.
+
+        Args:
+            channels: Number of channels per frame
+            dtype: Sample dtype stored in the buffer
+            initial_frames: Frames preallocated for a growable buffer
+            max_frames: Fixed ring capacity, or None to grow without limit
+            spill_bytes: RAM limit before a growable buffer spills to disk
+                (None to always stay in RAM)
+            spill_dir: Directory for the scratch file (default system temp dir)
+            staging_frames: Frames a growable buffer can take between drains
+        """
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self.max_frames = max_frames
+        self.spill_bytes = spill_bytes
+        self.spill_dir = spill_dir
+        capacity = max_frames if max_frames else max(1, initial_frames)
+        self._data = np.empty((capacity, channels), dtype=self.dtype)
+        self._file = None
+        self._write = 0
+        self.frames_written = 0
+        if not max_frames:
+            self._staging = np.empty((max(1, staging_frames), channels), dtype=self.dtype)
+            # Only drain advances this: frames moved from staging to the store
+            self._drained = 0
+            self._drain_lock = threading.RLock()
+
+    @property
+    def capacity(self) -> int:
+        """Number of frames the buffer can hold without growing."""
+        return len(self._data)
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the buffer has moved to its scratch file."""
+        return self._file is not None
+
+    def __len__(self) -> int:
+        return min(self.frames_written, self.capacity) if self.max_frames else self.frames_written
+
+    def clear(self) -> None:
+        """Forget the buffered frames, keeping the allocation."""
+        self._write = 0
+        self.frames_written = 0
+        if not self.max_frames:
+            self._drained = 0
+
+    def write(self, block: np.ndarray) -> None:
+        """Copy a block of frames into the buffer.
+
+        Args:
+            block: Array of shape (frames, channels)
+        """
+        frames = len(block)
+        if frames == 0:
+            return
+
+        if not self.max_frames:
+            size = len(self._staging)
+            if self.frames_written - self._drained + frames > size:
+                # The writer fell behind, or the block is bigger than the
+                # staging ring: catch up here rather than lose audio
+                log("Capture writer fell behind; draining in the callback", important=True)
+                with self._drain_lock:
+                    self.drain()
+                    if frames > size:
+                        self._store(block)
+                        self.frames_written += frames
+                        self._drained += frames
+                        return
+            start = self.frames_written % size
+            first = min(frames, size - start)
+            self._staging[start:start + first] = block[:first]
+            if first < frames:
+                self._staging[:frames - first] = block[first:]
+        elif frames >= self.capacity:
+            # Block alone fills the ring; keep its tail
+            self._data[:] = block[frames - self.capacity:]
+            self._write = 0
+        else:
+            first = min(frames, self.capacity - self._write)
+            self._data[self._write:self._write + first] = block[:first]
+            if first < frames:
+                self._data[:frames - first] = block[first:]
+            self._write = (self._write + frames) % self.capacity
+
+        # Publishes the staged frames to drain
+        self.frames_written += frames
+
+    def drain(self) -> None:
+        """Move staged frames into the store. Only for growable buffers."""
+        with self._drain_lock:
+            end = self.frames_written
+            size = len(self._staging)
+            while self._drained < end:
+                start = self._drained % size
+                count = min(end - self._drained, size - start)
+                self._store(self._staging[start:start + count])
+                self._drained += count
+
+    def _store(self, block: np.ndarray) -> None:
+        """Append frames to the store, growing or spilling it. Call with the drain lock held."""
+        end = self._write + len(block)
+        if self._file is None and end > self.capacity:
+            self._grow(end)
+        if self._file is not None:
+            self._file.write(np.ascontiguousarray(block, dtype=self.dtype))
+        else:
+            self._data[self._write:end] = block
+        self._write = end
+
+    def _grow(self, min_frames: int) -> None:
+        """Reallocate to at least ``min_frames``, doubling the capacity."""
+        capacity = max(1, self.capacity)
+        while capacity < min_frames:
+            capacity *= 2
+        frame_bytes = self.channels * self.dtype.itemsize
+        if self.spill_bytes is not None and capacity * frame_bytes > self.spill_bytes:
+            self._spill()
+            return
+
+        data = np.empty((capacity, self.channels), dtype=self.dtype)
+        data[:self._write] = self._data[:self._write]
+        self._data = data
+
+    def _spill(self) -> None:
+        """Move the buffered frames to a scratch file and free the RAM copy."""
+        # TemporaryFile is unlinked on creation, so nothing is left behind
+        self._file = tempfile.TemporaryFile(dir=self.spill_dir)
+        self._file.write(self._data[:self._write])
+        self._data = self._data[:0].copy()
+
+    def close(self) -> None:
+        """Close the scratch file of a spilled buffer.
+
+        Memory maps already returned by ``view`` keep their own mapping of
+        the file and stay valid; the buffer itself takes no more writes.
+        """
+        if self._file is not None:
+            self._file.close()
+
+    def view(self) -> np.ndarray:
+        """Return the buffered frames in order.
+
+        A growable buffer, or a ring that has not wrapped, returns a view with
+        no copy. A wrapped ring is unrolled into one new contiguous array. A
+        spilled buffer returns a copy-on-write memory map of its scratch file.
+        """
+        if not self.max_frames:
+            with self._drain_lock:
+                self.drain()
+                if self._file is not None:
+                    self._file.flush()
+                    return np.memmap(self._file, dtype=self.dtype, mode="c", shape=(self._write, self.channels))
+                return self._data[:self._write]
+        if self.frames_written <= self.capacity:
+            return self._data[:len(self)]
+        return np.concatenate((self._data[self._write:], self._data[:self._write]))
+
+    def read_since(self, start: int) -> Tuple[np.ndarray, int]:
+        """Copy the frames of a growable buffer from ``start`` on.
+
+        Safe to call while the callback keeps writing, without holding it up.
+
+        Returns:
+            (frames, end) where ``end`` is the index just past the last frame
+        """
+        with self._drain_lock:
+            view = self.view()
+            return np.array(view[min(start, len(view)):]), len(view)
+
+
+class LevelEnvelope:
+    """Fixed-size ring of per-block RMS and peak levels.
+
+    Only the audio callback writes to it. Readers snapshot it without a lock:
+    a slot is filled before ``count`` is bumped to publish it, so a reader
+    only ever copies entries that are complete.
+    """
+
+    def __init__(self, size: int = 256):
+        """Initialize the envelope.
+
+        Args:
+            size: Number of blocks of level history kept
+        """
+        self.size = size
+        self.rms = np.zeros(size, dtype=np.float32)
+        self.peak = np.zeros(size, dtype=np.float32)
+        self.count = 0
+
+    def reset(self) -> None:
+        """Forget all history. Only call while the producer is idle."""
+        self.rms[:] = 0.0
+        self.peak[:] = 0.0
+        self.count = 0
+
+    def push(self, block: np.ndarray) -> float:
+        """Measure a block and append its levels.
+
+        Args:
+            block: Float or integer audio samples of any shape
+
+        Returns:
+            RMS level of the block, relative to full scale
+        """
+        flat = block.reshape(-1)
+        if len(flat) == 0:
+            return 0.0
+
+        # Reductions go straight to scalars, with no temporary array
+        if flat.dtype.kind == "f":
+            energy = float(np.dot(flat, flat))
+            full_scale = 1.0
+        else:
+            # Integer samples are accumulated in float64 so they can't overflow
+            energy = float(np.einsum("i,i->", flat, flat, dtype=np.float64))
+            full_scale = float(-np.iinfo(flat.dtype).min)
+
+        rms = float(np.sqrt(energy / len(flat))) / full_scale
+        slot = self.count % self.size
+        self.rms[slot] = rms
+        self.peak[slot] = max(float(flat.max()), -float(flat.min())) / full_scale
+        self.count += 1
+        return rms
+
+    def history(self, length: int, peak: bool = False) -> np.ndarray:
+        """Return the most recent levels, oldest first.
+
+        Args:
+            length: Number of entries wanted (at most ``size``)
+            peak: Return peak instead of RMS levels
+
+        Returns:
+            Array of ``length`` levels, zero-padded at the start if the
+            envelope has not seen that many blocks yet
+        """
+        source = self.peak if peak else self.rms
+        length = min(length, self.size)
+        count = self.count
+        available = min(length, count)
+
+        result = np.zeros(length, dtype=np.float32)
+        if available:
+            indices = np.arange(count - available, count) % self.size
+            result[length - available:] = source[indices]
+        return result
+
+
 class AudioRecorder:
-    """Handles audio recording from the default microphone."""
+    """Handles audio recording from the microphone or another AudioSource."""
 
-    def __init__(self, samplerate: int = 16000, channels: int = 1):
+    def __init__(
+        self,
+        samplerate: int = 16000,
+        channels: int = 1,
+        dtype: str = "float32",
+        capture_rate: Optional[int] = None,
+        device: Optional[str] = None,
+        source: Optional[AudioSource] = None,
+        preprocessor: Optional[AudioPreprocessor] = None,
+        buffer_seconds: float = 30.0,
+        max_seconds: Optional[float] = None,
+        spill_threshold_mb: Optional[float] = 64.0,
+        spill_dir: Optional[str] = None,
+        warm: bool = False,
+        preroll_seconds: float = 0.4,
+        blocksize: int = 0,
+        latency=None,
+    ):
         """Initialize the audio recorder.
 
         Args:
             samplerate: Sample rate for recording (default 16000 Hz for Whisper)
             channels: Number of channels (default 1 for mono)
+            dtype: Sample format captured and buffered, 'float32' or 'int16'.
+                int16 halves the memory a recording needs; it is converted to
+                float32 only when it reaches the transcriber.
+            capture_rate: Rate to open the device at; audio is resampled to
+                ``samplerate`` as it arrives (default the device's native rate)
+            device: Name (or part of a name) of the input device to pin; other
+                devices are tried if it is missing or fails to open
+            source: Where audio comes from (default a MicrophoneSource for ``device``)
+            preprocessor: Block-wise DC removal/high-pass/gain applied as audio
+                arrives, so the finished recording is already model-ready
+                (mono only, default none)
+            buffer_seconds: Audio preallocated per recording before the buffer grows
+            max_seconds: Keep only the last N seconds in a fixed ring (default unlimited)
+            spill_threshold_mb: Move a recording to a memory-mapped scratch file
+                once it would need more RAM than this (None to never spill)
+            spill_dir: Directory for scratch files (default system temp dir)
+            warm: Keep the input stream open between recordings and prepend
+                a pre-roll of the audio captured just before recording started
+            preroll_seconds: Length of the pre-roll kept in warm mode
+            blocksize: Frames per callback block (0 lets PortAudio choose)
+            latency: Stream latency in seconds, or 'low'/'high' (None for the default)
         """
         self.samplerate = samplerate
         self.channels = channels
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.int16):
+            raise ValueError(f"Unsupported sample format: {dtype}")
+        self.capture_rate = capture_rate
+        if preprocessor is not None and channels != 1:
+            raise ValueError("Preprocessing only supports mono recording")
+        self.preprocessor = preprocessor
+        self.source = source or MicrophoneSource(device=device)
+        self.source.on_change = self._on_devices_changed
+        self.buffer_seconds = buffer_seconds
+        self.max_seconds = max_seconds
+        self.spill_threshold_mb = spill_threshold_mb
+        self.spill_dir = spill_dir
+        self.warm = warm
+        self.preroll_seconds = preroll_seconds
+        self.blocksize = blocksize
+        self.latency = latency
         self.recording = False
-        self.audio_queue = queue.Queue()
         self.stream: Optional[sd.InputStream] = None
+        self._buffer: Optional[CaptureBuffer] = None
+        self._preroll: Optional[CaptureBuffer] = None
+        self._resampler: Optional[StreamingResampler] = None
         self._lock = threading.Lock()
+        # Guards the buffer handoff between the callback and start/stop in
+        # warm mode; only ever held for a few microseconds
+        self._buffer_lock = threading.Lock()
         self.current_level = 0.0
+        self.envelope = LevelEnvelope()
+        self.overflow_count = 0
+        self.underflow_count = 0
+        # Moves captured audio out of the buffer's staging ring while recording
+        self._writer: Optional[threading.Thread] = None
+        self._writer_stop = threading.Event()
+
+    def _new_buffer(self) -> CaptureBuffer:
+        """Allocate the capture buffer for a new recording."""
+        return CaptureBuffer(
+            channels=self.channels,
+            dtype=self.dtype,
+            initial_frames=int(self.buffer_seconds * self.samplerate),
+            max_frames=int(self.max_seconds * self.samplerate) if self.max_seconds else None,
+            spill_bytes=(
+                int(self.spill_threshold_mb * 1024 * 1024)
+                if self.spill_threshold_mb is not None
+                else None
+            ),
+            spill_dir=self.spill_dir,
+            staging_frames=int(STAGING_SECONDS * self.samplerate),
+        )
+
+    def _drain_buffer(self) -> None:
+        """Drain the recording's staging ring until stopped."""
+        while not self._writer_stop.wait(0.05):
+            buffer = self._buffer
+            if buffer is None or buffer.max_frames:
+                continue
+            try:
+                buffer.drain()
+            except Exception as e:
+                log(f"Audio buffer writer error: {e}", important=True)
+
+    def _start_writer(self) -> None:
+        """Start the writer thread for a new recording."""
+        self._writer_stop.clear()
+        self._writer = threading.Thread(target=self._drain_buffer, name="prosody-audio-writer", daemon=True)
+        self._writer.start()
+
+    def _stop_writer(self) -> None:
+        """Stop the writer thread; whatever is still staged is drained by the reader."""
+        self._writer_stop.set()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
 
     def _audio_callback(self, indata, frames, time, status):
         """Callback function for audio stream."""
         if status:
+            if status.input_overflow:
+                self.overflow_count += 1
+            if status.input_underflow:
+                self.underflow_count += 1
             log(f"Audio recording status: {status}", important=True)
 
-        # Copy audio data to queue
-        if self.recording:
-            self.audio_queue.put(indata.copy())
-            # Calculate current audio level (RMS)
-            self.current_level = float(np.sqrt(np.mean(indata**2)))
+        indata = self._condition(indata)
+
+        with self._buffer_lock:
+            # Write audio data straight into the preallocated buffer
+            buffer = self._buffer
+            if self.recording and buffer is not None:
+                buffer.write(indata)
+                # Record the block's RMS and peak in the level envelope
+                self.current_level = self.envelope.push(indata)
+            elif self._preroll is not None:
+                self._preroll.write(indata)
+
+    def _condition(self, indata: np.ndarray) -> np.ndarray:
+        """Resample and preprocess a block into the buffer's format."""
+        resampled = self._resampler is not None
+        if resampled:
+            indata = self._resampler.process(indata)
+
+        if self.preprocessor is not None:
+            if resampled and self.dtype.kind == "i":
+                # The resampler returns float32 still at int16's scale; the
+                # preprocessor takes floats to be in -1.0 to 1.0
+                indata *= 1.0 / -np.iinfo(self.dtype).min
+            indata = self.preprocessor.process(indata)
+            if self.dtype.kind == "i":
+                # Preprocessed audio is in -1.0 to 1.0; store it at full scale
+                indata *= np.iinfo(self.dtype).max
+        if self.dtype.kind == "i" and (resampled or self.preprocessor is not None):
+            # Back to real integer samples, so the level meter, pre-roll and
+            # buffer all see int16 data. Filter overshoot must not wrap
+            # around, and rounding keeps the conversion from truncating.
+            info = np.iinfo(self.dtype)
+            np.clip(indata, info.min, info.max, out=indata)
+            np.rint(indata, out=indata)
+            indata = indata.astype(self.dtype)
+        return indata
+
+    @property
+    def device_index(self) -> Optional[int]:
+        """Index of the input device in use (None for the default or non-microphone sources)."""
+        return getattr(self.source, "device_index", None)
+
+    def _open_stream(self) -> None:
+        """Open and start a stream from the source."""
+        stream, rate = self.source.open_stream(
+            self._audio_callback,
+            channels=self.channels,
+            dtype=self.dtype.name,
+            samplerate=self.capture_rate,
+            blocksize=self.blocksize,
+            latency=self.latency,
+            fallback_rate=self.samplerate,
+        )
+
+        self._resampler = None
+        if rate != self.samplerate:
+            log(f"Capturing at {rate} Hz, resampling to {self.samplerate} Hz")
+            self._resampler = StreamingResampler(rate, self.samplerate)
+
+        self.stream = stream
+        try:
+            self.stream.start()
+        except Exception as e:
+            self._close_stream()
+            raise RuntimeError(f"Failed to start audio recording: {e}")
+
+    def _on_devices_changed(self) -> None:
+        """Reopen an idle warm stream so it picks up hotplugged devices."""
+        if not self.warm or self.recording or self.stream is None:
+            return
+        with self._lock:
+            if self.recording:
+                return
+            self._close_stream()
+            try:
+                self._open_stream()
+            except RuntimeError as e:
+                log(str(e), important=True)
+
+    def _close_stream(self) -> None:
+        """Stop and close the input stream, ignoring errors."""
+        if self.stream:
+            try:
+                self.stream.stop()
+                self.stream.close()
+            except:
+                pass
+            self.stream = None
+
+    def open(self) -> None:
+        """Start watching for device changes and open the warm stream.
+
+        The stream is only opened (so the pre-roll starts filling) when the
+        recorder was created with ``warm=True``.
+        """
+        self.source.open()
+        with self._lock:
+            if self.warm and self.stream is None:
+                self._preroll = CaptureBuffer(
+                    channels=self.channels,
+                    dtype=self.dtype,
+                    max_frames=max(1, int(self.preroll_seconds * self.samplerate)),
+                )
+                self._open_stream()
+
+    def close(self) -> None:
+        """Close the input stream, discarding any recording in progress."""
+        self.source.close()
+        with self._lock:
+            self.recording = False
+            self._close_stream()
+            self._preroll = None
+            buffer, self._buffer = self._buffer, None
+            self._stop_writer()
+            if buffer is not None:
+                buffer.close()
 
     def start_recording(self) -> None:
-        """Start recording audio from the default microphone."""
+        """Start recording audio from the source."""
+        if self.warm:
+            self.open()
+
         with self._lock:
             if self.recording:
                 return
 
+            if self.warm and self.stream is not None:
+                # The stream is already running: swap in a fresh buffer seeded
+                # with the pre-roll so the first syllable is not lost
+                buffer = self._new_buffer()
+                with self._buffer_lock:
+                    if self._preroll is not None:
+                        buffer.write(self._preroll.view())
+                        self._preroll.clear()
+                    self._buffer = buffer
+                    self.envelope.reset()
+                    self.recording = True
+                self._start_writer()
+                return
+
             # Clean up any existing stream first
-            if self.stream:
-                try:
-                    self.stream.stop()
-                    self.stream.close()
-                except:
-                    pass
-                self.stream = None
+            self._close_stream()
 
-            # Clear any existing data in the queue
-            while not self.audio_queue.empty():
-                try:
-                    self.audio_queue.get_nowait()
-                except queue.Empty:
-                    break
+            # Each recording gets its own buffer; the previous one belongs
+            # to whoever received it from stop_recording
+            self._buffer = self._new_buffer()
+            self.envelope.reset()
+            if self.preprocessor is not None:
+                self.preprocessor.reset()
 
+            # Arm before starting so the very first block is kept
+            self.recording = True
             try:
-                # Create and start the audio stream
-                self.stream = sd.InputStream(
-                    samplerate=self.samplerate,
-                    channels=self.channels,
-                    callback=self._audio_callback,
-                    dtype=np.float32,
-                )
-                self.stream.start()
-                self.recording = True
-            except Exception as e:
+                self._open_stream()
+            except Exception:
                 self.recording = False
-                if self.stream:
-                    try:
-                        self.stream.close()
-                    except:
-                        pass
-                    self.stream = None
-                raise RuntimeError(f"Failed to start audio recording: {e}")
+                self._buffer = None
+                raise
+            self._start_writer()
 
     def stop_recording(self) -> np.ndarray:
         """Stop recording and return the recorded audio data.
 
+        The returned array is a view of the capture buffer, which is handed
+        over to the caller rather than copied. Recordings that outgrew the
+        spill threshold come back as an ``np.memmap``. In warm mode the stream stays
+        open and goes back to filling the pre-roll.
+
         Returns:
             NumPy array containing the recorded audio
         """
         with self._lock:
             if not self.recording:
-                return np.array([], dtype=np.float32)
+                return np.array([], dtype=self.dtype)
 
-            self.recording = False
-            self.current_level = 0.0
+            if not self.warm:
+                self.recording = False
+                # Stop and close the stream; this waits for the last callback
+                if self.stream:
+                    self.stream.stop()
+                    self.stream.close()
+                    self.stream = None
 
-            # Stop and close the stream
-            if self.stream:
-                self.stream.stop()
-                self.stream.close()
-                self.stream = None
-
-            # Collect all audio data from the queue
-            audio_chunks = []
-            while not self.audio_queue.empty():
-                try:
-                    audio_chunks.append(self.audio_queue.get_nowait())
-                except queue.Empty:
-                    break
-
-            # Concatenate all audio chunks
-            if audio_chunks:
-                audio_data = np.concatenate(audio_chunks, axis=0)
-                # Flatten to 1D array if mono
-                if self.channels == 1:
-                    audio_data = audio_data.flatten()
-                return audio_data
-            else:
-                return np.array([], dtype=np.float32)
+            # Detach the buffer so the next recording cannot overwrite it
+            with self._buffer_lock:
+                self.recording = False
+                self.current_level = 0.0
+                buffer, self._buffer = self._buffer, None
+            self._stop_writer()
+
+            if self.overflow_count or self.underflow_count:
+                log(
+                    f"Audio callback overflows: {self.overflow_count}, "
+                    f"underflows: {self.underflow_count}"
+                )
+
+            if buffer is None or len(buffer) == 0:
+                return np.array([], dtype=self.dtype)
+
+            audio_data = buffer.view()
+            # The memmap of a spilled recording holds its own mapping
+            buffer.close()
+            # Flatten to 1D array if mono (a view, the data is contiguous)
+            if self.channels == 1:
+                audio_data = audio_data.reshape(-1)
+            return audio_data
+
+    def recorded_since(self, start: int) -> Tuple[np.ndarray, int]:
+        """Copy the audio recorded so far, from frame ``start`` on.
+
+        Lets a consumer read the live recording without stopping it. Frames
+        are numbered from the start of the recording; in ring mode frames that
+        have already been overwritten are skipped.
+
+        Args:
+            start: Index of the first frame wanted
+
+        Returns:
+            (samples, end) where ``end`` is the index just past the last
+            frame returned; samples are flat for mono recordings
+        """
+        with self._buffer_lock:
+            buffer = self._buffer
+            if not self.recording or buffer is None:
+                return np.array([], dtype=self.dtype), start
+
+            if buffer.max_frames:
+                end = buffer.frames_written
+                view = buffer.view()
+                first = end - len(view)
+                # Copy under the lock: the callback writes the ring in place
+                audio_data = np.array(view[max(0, start - first):])
+
+        if not buffer.max_frames:
+            # Growable buffers copy under their own lock, leaving the callback free
+            audio_data, end = buffer.read_since(start)
+
+        if self.channels == 1:
+            audio_data = audio_data.reshape(-1)
+        return audio_data, end
 
     def get_current_level(self) -> float:
         """Get the current audio level (0.0 to 1.0).
@@ -137,33 +691,33 @@ class AudioRecorder:
         """
         return min(1.0, self.current_level * 10)  # Scale up and clamp to 0-1
 
+    def get_level_history(self, length: int) -> np.ndarray:
+        """Get the most recent per-block audio levels (0.0 to 1.0).
+
+        Args:
+            length: Number of levels wanted
+
+        Returns:
+            Array of levels, oldest first, scaled like get_current_level
+        """
+        levels = self.envelope.history(length)
+        np.multiply(levels, 10, out=levels)
+        return np.minimum(levels, 1.0, out=levels)
+
     def get_available_devices(self) -> list:
         """Get list of available audio input devices.
 
+        Returns the microphone source's cached enumeration, so repeated calls
+        do not query PortAudio. Other sources have no devices.
+
         Returns:
             List of device information dictionaries
         """
-        devices = sd.query_devices()
-        input_devices = []
-
-        for i, device in enumerate(devices):
-            if device["max_input_channels"] > 0:
-                input_devices.append(
-                    {
-                        "index": i,
-                        "name": device["name"],
-                        "channels": device["max_input_channels"],
-                    }
-                )
-
-        return input_devices
+        return self.source.list_devices()
 
     def __del__(self):
         """Cleanup when the recorder is destroyed."""
         try:
-            if self.stream:
-                self.stream.stop()
-                self.stream.close()
-                self.stream = None
+            self._close_stream()
         except:
             pass
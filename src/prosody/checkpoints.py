@@ -0,0 +1,145 @@
+"""Whisper checkpoint loading that verifies each downloaded file only once."""
+
+import hashlib
+import json
+import os
+import sys
+import whisper
+from typing import Optional
+
+# Check if running in development mode
+DEV_MODE = os.environ.get('PROSODY_DEV') == '1' or sys.argv[0].endswith('__main__.py')
+# Suppress output in tests
+if 'pytest' in sys.modules:
+    DEV_MODE = False
+
+
+def log(message: str, important: bool = False):
+    """Log a message, respecting dev/production mode."""
+    if DEV_MODE:
+        print(message)
+
+
+def download_root() -> str:
+    """Directory Whisper downloads its checkpoints to."""
+    default = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(os.getenv("XDG_CACHE_HOME", default), "whisper")
+
+
+def checkpoint_path(name: str) -> str:
+    """Where Whisper keeps the checkpoint of an official model."""
+    return os.path.join(download_root(), os.path.basename(whisper._MODELS[name]))
+
+
+def expected_sha256(name: str) -> str:
+    """The checksum Whisper publishes for an official model (part of its URL)."""
+    return whisper._MODELS[name].split("/")[-2]
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in blocks rather than all at once."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class VerifiedModels:
+    """Manifest of checkpoint files whose checksum has been verified.
+
+    Entries are keyed by path and record the file's size and modification
+    time along with the checksum it matched, so a file is hashed once and
+    any later change to it (a re-download, truncation or edit) shows up as
+    a mismatch and sends it back through verification.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the manifest.
+
+        Args:
+            path: JSON file the manifest is kept in
+        """
+        self.path = path
+
+    def _read(self) -> dict:
+        """The manifest's entries, or none if it is missing or unreadable."""
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    @staticmethod
+    def _signature(path: str) -> dict:
+        """Size and modification time identifying the file's current contents."""
+        stat = os.stat(path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def is_verified(self, path: str, sha256: str) -> bool:
+        """Whether the file is unchanged since it was verified against ``sha256``."""
+        entry = self._read().get(os.path.abspath(path))
+        try:
+            signature = self._signature(path)
+        except OSError:
+            return False
+        return entry == dict(signature, sha256=sha256)
+
+    def record(self, path: str, sha256: str) -> None:
+        """Note that the file, as it is now, matched ``sha256``. Written atomically."""
+        entries = self._read()
+        entries[os.path.abspath(path)] = dict(self._signature(path), sha256=sha256)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        partial = f"{self.path}.{os.getpid()}.tmp"
+        with open(partial, "w") as f:
+            json.dump(entries, f, indent=2)
+        os.replace(partial, self.path)
+
+
+def load_model(name: str, manifest: VerifiedModels, device: Optional[str] = None) -> "whisper.Whisper":
+    """Load a Whisper model, skipping the checksum of already verified files.
+
+    ``whisper.load_model`` reads and hashes the whole checkpoint on every
+    call. Here an official model's file is hashed the first time it is seen
+    and recorded in the manifest; while it stays unchanged it is loaded
+    straight from its path. Missing or corrupt files, and names that are not
+    official models, go through ``whisper.load_model`` as before, which
+    downloads what it needs.
+
+    Args:
+        name: Official model name, or path to a checkpoint
+        manifest: Record of verified files
+        device: Device for the model (default as ``whisper.load_model``)
+
+    Returns:
+        The loaded model
+    """
+    # Left to Whisper's own default unless given
+    options = {} if device is None else {"device": device}
+    if name not in whisper._MODELS:
+        return whisper.load_model(name, **options)
+
+    path = checkpoint_path(name)
+    sha256 = expected_sha256(name)
+    if not manifest.is_verified(path, sha256):
+        try:
+            verified = file_sha256(path) == sha256
+        except OSError:
+            verified = False
+        if verified:
+            log(f"Verified {path}")
+        else:
+            # Missing or damaged: Whisper downloads it again and checks it
+            model = whisper.load_model(name, **options)
+        try:
+            manifest.record(path, sha256)
+        except OSError as e:
+            log(f"Could not record verified checkpoint: {e}", important=True)
+        if not verified:
+            return model
+
+    model = whisper.load_model(path, **options)
+    # Only set by whisper.load_model for official model names
+    model.set_alignment_heads(whisper._ALIGNMENT_HEADS[name])
+    return model
@@ -0,0 +1,228 @@
+"""Audio input device discovery and selection for Prosody."""
+
+import os
+import subprocess
+import sys
+import threading
+import sounddevice as sd
+from typing import Callable, List, Optional
+
+# Check if running in development mode
+DEV_MODE = os.environ.get('PROSODY_DEV') == '1' or sys.argv[0].endswith('__main__.py')
+# Suppress output in tests
+if 'pytest' in sys.modules:
+    DEV_MODE = False
+
+
+def log(message: str, important: bool = False):
+    """Log a message, respecting dev/production mode."""
+    if DEV_MODE:
+        print(message)
+
+
+# Cleared once pactl turns out to be missing, so it is not looked for again
+_pactl_available = True
+
+
+def sound_server_sources() -> str:
+    """List the sound server's input sources, or "" without one.
+
+    Bluetooth headsets are set up by PulseAudio or PipeWire (through its
+    PulseAudio interface) and never appear as ALSA cards, so only the sound
+    server sees them connect.
+    """
+    global _pactl_available
+    if not _pactl_available:
+        return ""
+    try:
+        result = subprocess.run(
+            ["pactl", "list", "short", "sources"], capture_output=True, text=True, timeout=1.0, check=False
+        )
+    except FileNotFoundError:
+        _pactl_available = False
+        return ""
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    # Keep the names only; the state column changes as streams open and close
+    return ",".join(sorted(line.split("\t")[1] for line in result.stdout.splitlines() if "\t" in line))
+
+
+def hardware_signature() -> str:
+    """Return a cheap fingerprint of the attached sound hardware.
+
+    Reads the ALSA card list and the /dev/snd nodes, which change when a
+    USB device is plugged in, and the sound server's sources, which also
+    change when a Bluetooth headset connects, without touching PortAudio.
+    """
+    parts = [sound_server_sources()]
+    try:
+        with open("/proc/asound/cards") as f:
+            parts.append(f.read())
+    except OSError:
+        pass
+    try:
+        parts.append(",".join(sorted(os.listdir("/dev/snd"))))
+    except OSError:
+        pass
+    return "\n".join(parts)
+
+
+class DeviceRegistry:
+    """Caches the input device list and notices when hardware changes.
+
+    PortAudio only enumerates devices when it is initialized, so the
+    registry keeps the last enumeration and, once the hardware signature
+    changes, re-initializes PortAudio on the next refresh that is allowed to.
+    """
+
+    def __init__(self, preferred: Optional[str] = None, poll_interval: float = 2.0):
+        """Initialize the registry.
+
+        Args:
+            preferred: Name (or part of a name) of the device to pin
+            poll_interval: Seconds between hardware checks while monitoring
+        """
+        self.preferred = preferred
+        self.poll_interval = poll_interval
+        self.stale = False
+        self.on_change: Optional[Callable[[], None]] = None
+        self._devices: Optional[List[dict]] = None
+        self._signature = hardware_signature()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self, reinitialize: bool = False) -> List[dict]:
+        """Enumerate input devices again.
+
+        Args:
+            reinitialize: Restart PortAudio first so newly attached devices
+                show up. Only safe while no stream is open.
+
+        Returns:
+            List of input device dictionaries
+        """
+        with self._lock:
+            if reinitialize and hasattr(sd, "_terminate"):
+                try:
+                    sd._terminate()
+                    sd._initialize()
+                except Exception as e:
+                    log(f"Could not reinitialize PortAudio: {e}", important=True)
+
+            try:
+                all_devices = sd.query_devices()
+            except Exception as e:
+                log(f"Could not list audio devices: {e}", important=True)
+                all_devices = []
+
+            devices = []
+            for i, device in enumerate(all_devices):
+                if device["max_input_channels"] > 0:
+                    devices.append(
+                        {
+                            "index": i,
+                            "name": device["name"],
+                            "channels": device["max_input_channels"],
+                            "default_samplerate": device.get("default_samplerate"),
+                        }
+                    )
+
+            self._devices = devices
+            if reinitialize:
+                self.stale = False
+            return devices
+
+    def devices(self, reinitialize: bool = False) -> List[dict]:
+        """Return the cached input devices, enumerating on first use.
+
+        Args:
+            reinitialize: Allow restarting PortAudio if the hardware changed
+
+        Returns:
+            List of input device dictionaries
+        """
+        if self._devices is None or (self.stale and reinitialize):
+            return self.refresh(reinitialize=reinitialize and self.stale)
+        return self._devices
+
+    def find(self, name: str) -> Optional[dict]:
+        """Find a cached input device by case-insensitive (partial) name."""
+        name = name.lower()
+        for device in self.devices():
+            if name in device["name"].lower():
+                return device
+        return None
+
+    def candidates(self, reinitialize: bool = False) -> List[Optional[int]]:
+        """Return device indices to try, best first.
+
+        The pinned device comes first if it is present, then the system
+        default (None), then every other input device.
+
+        Args:
+            reinitialize: Allow restarting PortAudio if the hardware changed
+
+        Returns:
+            List of device indices, with None meaning the default device
+        """
+        devices = self.devices(reinitialize=reinitialize)
+        order: List[Optional[int]] = []
+
+        if self.preferred:
+            pinned = self.find(self.preferred)
+            if pinned is not None:
+                order.append(pinned["index"])
+            else:
+                log(f"Pinned input device '{self.preferred}' not found, using default")
+
+        order.append(None)
+
+        try:
+            default_index = sd.default.device[0]
+        except Exception:
+            default_index = None
+        for device in devices:
+            if device["index"] not in order and device["index"] != default_index:
+                order.append(device["index"])
+        return order
+
+    def check(self) -> bool:
+        """Compare the hardware signature with the last one seen.
+
+        Returns:
+            True if the hardware changed since the last check
+        """
+        signature = hardware_signature()
+        if signature == self._signature:
+            return False
+
+        self._signature = signature
+        self.stale = True
+        log("Audio hardware changed")
+        if self.on_change:
+            self.on_change()
+        return True
+
+    def _monitor(self):
+        """Poll the hardware signature until stopped."""
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.check()
+            except Exception as e:
+                log(f"Device monitor error: {e}", important=True)
+
+    def start(self) -> None:
+        """Start watching for hotplugged devices in the background."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._monitor, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching for hotplugged devices."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
@@ -0,0 +1,261 @@
+"""Whisper log-mel features computed incrementally while recording."""
+
+import os
+import sys
+import threading
+import numpy as np
+import torch
+from functools import lru_cache
+from typing import Optional
+from whisper.audio import HOP_LENGTH, N_FFT, mel_filters
+
+# Check if running in development mode
+DEV_MODE = os.environ.get('PROSODY_DEV') == '1' or sys.argv[0].endswith('__main__.py')
+# Suppress output in tests
+if 'pytest' in sys.modules:
+    DEV_MODE = False
+
+
+def log(message: str, important: bool = False):
+    """Log a message, respecting dev/production mode."""
+    if DEV_MODE:
+        print(message)
+
+
+# torch.stft centres frames, reflecting this many samples at the start
+PAD = N_FFT // 2
+
+
+@lru_cache(maxsize=None)
+def hann_window() -> torch.Tensor:
+    """The STFT window, built once (Whisper builds a new one per call)."""
+    return torch.hann_window(N_FFT)
+
+
+def log_mel(audio: np.ndarray, n_mels: int = 80) -> torch.Tensor:
+    """Whisper's normalized log-mel spectrogram of a whole recording.
+
+    Gives the same content frames as ``whisper.transcribe``, which pads
+    30 seconds of silence before its STFT, while padding only as much as
+    the frames at the end actually see. The steps are those of
+    ``whisper.log_mel_spectrogram``, with the window and filterbank cached.
+
+    Args:
+        audio: Float samples at 16 kHz
+        n_mels: Mel bands, as the model expects
+
+    Returns:
+        Tensor of shape (n_mels, len(audio) // HOP_LENGTH)
+    """
+    frames = len(audio) // HOP_LENGTH
+    audio = torch.nn.functional.pad(torch.as_tensor(audio), (0, N_FFT))
+    stft = torch.stft(audio, N_FFT, HOP_LENGTH, window=hann_window(), return_complex=True)
+    mel = mel_filters("cpu", n_mels) @ stft[..., :-1].abs() ** 2
+
+    log_spec = torch.clamp(mel, min=1e-10).log10()
+    log_spec = torch.maximum(log_spec, log_spec.max() - 8.0)
+    return ((log_spec + 4.0) / 4.0)[:, :frames]
+
+
+class StreamingLogMel:
+    """Whisper's log-mel spectrogram, built block by block as audio arrives.
+
+    Uses the same Hann window, hop, FFT size and filterbank as
+    ``whisper.log_mel_spectrogram``. Frames are emitted as soon as all of
+    their samples are in, and the samples a frame shares with the next one
+    are carried across block boundaries. Only the normalization, which
+    depends on the loudest frame of the whole recording, waits for
+    ``finalize``; it is a cheap elementwise pass.
+    """
+
+    def __init__(self, n_mels: int = 80):
+        """Initialize the spectrogram.
+
+        Args:
+            n_mels: Mel bands, as the model expects (80, or 128 for large-v3)
+        """
+        self.n_mels = n_mels
+        self._window = hann_window().numpy()
+        self._filters = mel_filters("cpu", n_mels)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all audio, ready for a new recording."""
+        self.samples = 0
+        self._started = False
+        # Signal from the start of the next frame on (once started, this
+        # includes the reflected padding in front of the first sample)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._frames = []
+        self._frame_count = 0
+
+    @property
+    def frames(self) -> int:
+        """Number of frames computed so far."""
+        return self._frame_count
+
+    def _log_power(self, signal: np.ndarray, count: int) -> torch.Tensor:
+        """Log10 mel power of ``count`` frames starting at the front of ``signal``."""
+        frames = np.lib.stride_tricks.sliding_window_view(signal, N_FFT)[::HOP_LENGTH][:count]
+        spectrum = torch.fft.rfft(torch.from_numpy(frames * self._window))
+        mel = self._filters @ (spectrum.abs() ** 2).T
+        return torch.clamp(mel, min=1e-10).log10()
+
+    def push(self, samples: np.ndarray) -> None:
+        """Add a block of 16 kHz mono audio.
+
+        Args:
+            samples: Float samples in -1.0 to 1.0, or integer samples at full scale
+        """
+        samples = np.asarray(samples).reshape(-1)
+        if samples.dtype.kind == "i":
+            # Same scaling as Transcriber.transcribe
+            samples = samples.astype(np.float32) * (1.0 / -np.iinfo(samples.dtype).min)
+        else:
+            samples = samples.astype(np.float32, copy=False)
+        self.samples += len(samples)
+        self._pending = np.concatenate((self._pending, samples))
+
+        if not self._started:
+            if len(self._pending) <= PAD:
+                return  # Not enough audio yet to reflect at the start
+            self._pending = np.concatenate((self._pending[PAD:0:-1], self._pending))
+            self._started = True
+
+        count = (len(self._pending) - N_FFT) // HOP_LENGTH + 1
+        if count > 0:
+            self._frames.append(self._log_power(self._pending, count))
+            self._frame_count += count
+            self._pending = self._pending[count * HOP_LENGTH:].copy()
+
+    def _tail(self) -> torch.Tensor:
+        """Frames overlapping the end of the audio, as Whisper computes them.
+
+        Whisper pads the recording with 30 seconds of silence before its STFT,
+        so the last frames see zeros past the end. Computed on a copy, so
+        more audio can still be pushed afterwards.
+        """
+        pending = self._pending
+        if not self._started:
+            padded = np.concatenate((pending, np.zeros(PAD + 1, dtype=np.float32)))
+            pending = np.concatenate((padded[PAD:0:-1], pending))
+
+        # The last frame whose window still reaches into the audio
+        last = (self.samples + PAD - 1) // HOP_LENGTH
+        count = last + 1 - self._frame_count
+        if count <= 0:
+            return torch.zeros(self.n_mels, 0)
+        needed = (count - 1) * HOP_LENGTH + N_FFT
+        pending = np.concatenate((pending, np.zeros(max(0, needed - len(pending)), dtype=np.float32)))
+        return self._log_power(pending, count)
+
+    def finalize(self, start: int = 0, end: Optional[int] = None) -> torch.Tensor:
+        """Return the normalized log-mel spectrogram of the audio so far.
+
+        For the whole recording the result matches the content frames of
+        ``whisper.log_mel_spectrogram(audio, padding=N_SAMPLES)``. A sample
+        range, such as the speech found by VAD, takes the frames covering it
+        and is normalized on its own.
+
+        Args:
+            start: First sample of the range (rounded down to a frame)
+            end: End of the range in samples (default all audio pushed)
+
+        Returns:
+            Tensor of shape (n_mels, frames), ready to slice into 30 s windows
+        """
+        end = self.samples if end is None else min(end, self.samples)
+        self._frames = [torch.cat(self._frames + [torch.zeros(self.n_mels, 0)], dim=1)]
+        log_spec = torch.cat((self._frames[0], self._tail()), dim=1)
+
+        first = start // HOP_LENGTH
+        content = log_spec[:, first:end // HOP_LENGTH]
+        if content.shape[1] == 0:
+            return content
+        # Whisper's dynamic range also counts the frames straddling the end
+        peak = log_spec[:, first:(end + PAD - 1) // HOP_LENGTH + 1].max()
+        content = torch.maximum(content, peak - 8.0)
+        return (content + 4.0) / 4.0
+
+
+class CaptureFeatures:
+    """Keeps a StreamingLogMel up to date with a live recording.
+
+    A background thread polls the recorder, like StreamingTranscriber does,
+    so the FFTs never run inside the audio callback. When recording stops,
+    only the last poll interval of audio is left to process.
+    """
+
+    def __init__(self, recorder, n_mels: int = 80, poll_interval: float = 0.1):
+        """Initialize the feature tracker.
+
+        Args:
+            recorder: AudioRecorder whose live recording is read
+            n_mels: Mel bands, as the model expects
+            poll_interval: Seconds between reads of the live recording
+        """
+        if recorder.samplerate != 16000 or recorder.channels != 1:
+            raise ValueError("Log-mel features need 16 kHz mono audio")
+        self.recorder = recorder
+        self.mel = StreamingLogMel(n_mels=n_mels)
+        self.poll_interval = poll_interval
+        self.valid = True
+        self._cursor = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll(self) -> None:
+        """Process the audio recorded since the last poll."""
+        audio, end = self.recorder.recorded_since(self._cursor)
+        if end - self._cursor != len(audio):
+            # A ring buffer overwrote audio before it was read
+            self.valid = False
+        elif len(audio):
+            self.mel.push(audio)
+        self._cursor = end
+
+    def _run(self):
+        """Poll the live recording until stopped."""
+        while self.valid and not self._stop_event.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception as e:
+                log(f"Feature extraction error: {e}", important=True)
+                self.valid = False
+
+    def start(self) -> None:
+        """Start following a new recording."""
+        self.mel.reset()
+        self.valid = True
+        self._cursor = 0
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """Stop the background thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def finish(self, audio_data: np.ndarray, start: int = 0, end: Optional[int] = None) -> Optional[torch.Tensor]:
+        """Process the rest of the finished recording and return its features.
+
+        Args:
+            audio_data: The complete recording returned by stop_recording
+            start: First sample of the range to return
+            end: End of the range (default the end of the recording)
+
+        Returns:
+            Normalized log-mel of the range, or None if the live recording
+            could not be followed
+        """
+        self.cancel()
+        if not self.valid or self._cursor > len(audio_data):
+            return None
+        tail = np.asarray(audio_data)[self._cursor:]
+        if len(tail):
+            self.mel.push(tail)
+        self._cursor = len(audio_data)
+        return self.mel.finalize(start, end)
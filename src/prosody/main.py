@@ -2,19 +2,28 @@
 
 import sys
 import os
-import threading
 import signal
 import subprocess
-from typing import Optional
+import time
+import numpy as np
+from typing import List, Optional
 
 from .hotkey import HotkeyListener
 from .audio import AudioRecorder
+from .features import CaptureFeatures
+from .preprocess import AudioPreprocessor
+from .residency import ModelResidency
+from .scheduling import SchedulingPolicy, parse_cpu_list
+from .sources import AudioSource
+from .streaming import StreamingTranscriber
 
 # Use polished UI with waveform
 from .ui_polished import PolishedWaveformIndicator as RecordingIndicator, type_text
 
 
 from .transcription import Transcriber
+from .vad import VoiceActivityDetector
+from .worker import TranscriptionWorker
 
 # Check if running in development mode
 DEV_MODE = os.environ.get('PROSODY_DEV') == '1' or sys.argv[0].endswith('__main__.py')
@@ -29,15 +38,101 @@ def log(message: str, important: bool = False):
         print(message)
 
 
+# Waiting recordings are merged while together they fit one Whisper window
+MERGE_MAX_SECONDS = 30.0
+MERGE_GAP_SECONDS = 0.5  # Silence between merged recordings, read as a pause
+
+
+def preprocessor_from_env() -> Optional[AudioPreprocessor]:
+    """Build the preprocessor for the stages listed in PROSODY_PREPROCESS.
+
+    Returns:
+        An AudioPreprocessor, or None if no stages are enabled
+    """
+    stages = {s.strip() for s in os.environ.get("PROSODY_PREPROCESS", "").split(",") if s.strip()}
+    if not stages:
+        return None
+    return AudioPreprocessor(
+        dc_removal="dc" in stages,
+        highpass_hz=80.0 if "highpass" in stages else None,
+        agc="agc" in stages,
+    )
+
+
+def scheduling_from_env() -> Optional[SchedulingPolicy]:
+    """Build the inference scheduling policy from PROSODY_NICE,
+    PROSODY_INFERENCE_CPUS and PROSODY_RESERVED_CORES.
+
+    Returns:
+        A SchedulingPolicy, or None if none of them are set
+    """
+    cpus = os.environ.get("PROSODY_INFERENCE_CPUS")
+    policy = SchedulingPolicy(
+        nice=int(os.environ.get("PROSODY_NICE", "0")),
+        cpus=parse_cpu_list(cpus) if cpus else None,
+        reserved_cores=int(os.environ.get("PROSODY_RESERVED_CORES", "0")),
+    )
+    return policy if policy.active else None
+
+
 class ProsodyApp:
     """Main application class that coordinates all components."""
 
-    def __init__(self):
-        """Initialize the Prosody application."""
-        self.audio_recorder = AudioRecorder()
-        self.transcriber = Transcriber()  # Initialize transcriber
+    def __init__(
+        self,
+        audio_recorder: Optional[AudioRecorder] = None,
+        audio_source: Optional[AudioSource] = None,
+    ):
+        """Initialize the Prosody application.
+
+        Args:
+            audio_recorder: Recorder to use (default built from the environment)
+            audio_source: Source for the default recorder, e.g. a FileSource
+                for headless runs (default the microphone)
+        """
+        self.audio_recorder = audio_recorder or AudioRecorder(
+            dtype=os.environ.get("PROSODY_SAMPLE_FORMAT", "float32"),
+            device=os.environ.get("PROSODY_INPUT_DEVICE") or None,
+            source=audio_source,
+            preprocessor=preprocessor_from_env(),
+            warm=os.environ.get("PROSODY_WARM_STREAM") == "1",
+        )
+        self._started = time.monotonic()
+        # The model loads in the background; recordings made before it is
+        # ready are queued and transcribed once it is. With an idle timeout
+        # it is unloaded between dictations and reloaded when recording starts.
+        options = {
+            "precision": os.environ.get("PROSODY_PRECISION", "fp32"),
+            "scheduling": scheduling_from_env(),
+            "decoding": os.environ.get("PROSODY_DECODING", "balanced"),
+            "short_window": os.environ.get("PROSODY_SHORT_WINDOW") == "1",
+            "warmup": os.environ.get("PROSODY_WARMUP", "1") == "1",
+            "model_cache": os.environ.get("PROSODY_MODEL_CACHE", "1") == "1",
+        }
+        if os.environ.get("PROSODY_WORKER") == "process":
+            # Keep torch in a child process, away from the hotkey and UI threads
+            self.transcriber = TranscriptionWorker(load=False, **options)
+        else:
+            self.transcriber = Transcriber(load=False, **options)
+        self.residency = ModelResidency(
+            self.transcriber,
+            idle_timeout=float(os.environ.get("PROSODY_MODEL_IDLE_TIMEOUT", "0")),
+            on_ready=self._on_model_ready,
+            on_error=self._on_model_error,
+            coalesce=self._coalesce,
+        )
+        self.vad = VoiceActivityDetector(samplerate=self.audio_recorder.samplerate)
+        # Transcribe finished segments while still recording
+        self.streaming = os.environ.get("PROSODY_STREAMING") == "1"
+        self.streamer: Optional[StreamingTranscriber] = None
+        # Compute Whisper's log-mel features while recording, so only the
+        # decoder is left to run when recording stops
+        self.features: Optional[CaptureFeatures] = None
+        if os.environ.get("PROSODY_LIVE_MEL") == "1" and isinstance(self.transcriber, Transcriber):
+            self.features = CaptureFeatures(self.audio_recorder)
         self.recording_indicator = RecordingIndicator(
-            get_audio_level=self._get_current_audio_level
+            get_audio_level=self._get_current_audio_level,
+            get_level_history=self.audio_recorder.get_level_history,
         )
         self.hotkey_listener = HotkeyListener(
             on_hotkey_pressed=self.toggle_recording,
@@ -56,6 +151,33 @@ class ProsodyApp:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
 
+        self.residency.prefetch()
+
+    def _on_model_ready(self):
+        """Log when the speech model has (re)loaded."""
+        if self.residency.loads == 1:
+            log(f"Ready to transcribe ({time.monotonic() - self._started:.2f}s after start)")
+        else:
+            log(f"Speech model reloaded in {self.transcriber.load_seconds:.2f}s")
+
+    def _on_model_error(self, error: Exception, dropped: int):
+        """Report a failed model load."""
+        if dropped:
+            log(f"Discarded {dropped} queued recording(s)", important=True)
+        try:
+            subprocess.run(
+                [
+                    "notify-send",
+                    "-i", "dialog-error",
+                    "-t", "3000",
+                    "Prosody Error",
+                    f"Failed to load speech model: {error}",
+                ],
+                check=False,
+            )
+        except:
+            pass
+
     def _signal_handler(self, signum, frame):
         """Handle system signals for graceful shutdown."""
         log("\nShutting down Prosody...")
@@ -104,12 +226,31 @@ class ProsodyApp:
         # Show recording indicator
         self.recording_indicator.show()
 
+        # Keep the model loaded while recording, reloading it in parallel
+        # with capture if it was evicted
+        self.residency.hold()
+
         # Start audio recording
         try:
             self.audio_recorder.start_recording()
+            if self.streaming:
+                self.streamer = StreamingTranscriber(
+                    self.audio_recorder,
+                    self.transcriber,
+                    vad=self.vad,
+                    normalized=self.audio_recorder.preprocessor is not None,
+                    # Segments queue with the other jobs on the model
+                    submit=self.residency.submit,
+                )
+                self.streamer.start()
+            elif self.features is not None:
+                self.features.start()
         except Exception as e:
             log(f"Error starting recording: {e}", important=True)
             self.is_recording = False
+            self.residency.release()
+            if self.features is not None:
+                self.features.cancel()
             self.recording_indicator.hide()
             # Show error notification
             try:
@@ -139,16 +280,47 @@ class ProsodyApp:
 
         # Stop recording and get audio data
         audio_data = self.audio_recorder.stop_recording()
+        streamer, self.streamer = self.streamer, None
+        # Any transcription below takes its own hold on the model
+        self.residency.release()
+
+        if len(audio_data) == 0:
+            log("No audio recorded")
+            if streamer is not None:
+                streamer.cancel(discard=True)
+            if self.features is not None:
+                self.features.cancel()
+            return
+
+        if streamer is not None:
+            # Earlier segments are done or in progress; only the tail is left
+            self.residency.submit(self._finish_streaming, streamer, audio_data)
+            return
 
-        if len(audio_data) > 0:
+        # Trim silence so Whisper only sees speech (and never sees pure silence)
+        audio_data = np.asarray(audio_data)
+        start, end = self.vad.detect(audio_data)
+        speech = audio_data[start:end]
+        trimmed = (len(audio_data) - len(speech)) / self.audio_recorder.samplerate
+        log(f"VAD trimmed {trimmed:.2f}s of {len(audio_data) / self.audio_recorder.samplerate:.2f}s")
+
+        if len(speech) > 0:
             log("Transcribing audio...")
 
-            # Transcribe in a separate thread to avoid blocking
-            threading.Thread(
-                target=self._transcribe_and_type, args=(audio_data,), daemon=True
-            ).start()
+            mel = None
+            if self.features is not None:
+                # Only the audio since the last poll is left to process
+                mel = self.features.finish(audio_data, start, end)
+
+            # Queued behind earlier recordings, so text is typed in order
+            self.residency.submit(self._transcribe_and_type, speech, mel)
+            if self.residency.queued > 1:
+                log(f"{self.residency.queued} recordings waiting for transcription, "
+                    f"oldest for {self.residency.oldest_wait:.2f}s")
         else:
-            log("No audio recorded")
+            log("No speech detected, skipping transcription")
+            if self.features is not None:
+                self.features.cancel()
 
     def cancel_recording(self):
         """Cancel recording without transcribing."""
@@ -163,6 +335,12 @@ class ProsodyApp:
 
         # Stop recording but discard audio
         self.audio_recorder.stop_recording()
+        self.residency.release()
+        if self.features is not None:
+            self.features.cancel()
+        if self.streamer is not None:
+            self.streamer.cancel(discard=True)
+            self.streamer = None
 
         # Notify user
         try:
@@ -181,11 +359,35 @@ class ProsodyApp:
         except:
             pass
 
-    def _transcribe_and_type(self, audio_data):
+    def _coalesce(self, target, args: tuple, next_args: tuple) -> Optional[tuple]:
+        """Merge two waiting recordings into one transcription while they are short.
+
+        The recordings are joined with a short silence, and their text is
+        typed together. Precomputed features are dropped, since the merged
+        audio is normalized as a whole.
+
+        Returns:
+            Arguments for one ``_transcribe_and_type`` call, or None to
+            transcribe them separately
+        """
+        if target != self._transcribe_and_type:
+            return None
+        audio, next_audio = np.asarray(args[0]), np.asarray(next_args[0])
+        samplerate = self.audio_recorder.samplerate
+        gap = np.zeros(int(MERGE_GAP_SECONDS * samplerate), dtype=audio.dtype)
+        if (len(audio) + len(gap) + len(next_audio)) / samplerate > MERGE_MAX_SECONDS:
+            return None
+        log("Merging waiting recordings into one transcription")
+        return (np.concatenate((audio, gap, next_audio)), None)
+
+    def _transcribe_and_type(self, audio_data, mel=None):
         """Transcribe audio and type the result."""
         try:
-            # Transcribe the audio
-            text = self.transcriber.transcribe(audio_data)
+            # Transcribe the audio; preprocessed audio is already normalized
+            kwargs = {"mel": mel} if mel is not None else {}
+            text = self.transcriber.transcribe(
+                audio_data, normalized=self.audio_recorder.preprocessor is not None, **kwargs
+            )
 
             if text:
                 log(f"Transcribed: {text}")
@@ -197,6 +399,21 @@ class ProsodyApp:
         except Exception as e:
             log(f"Transcription error: {e}", important=True)
 
+    def _finish_streaming(self, streamer: StreamingTranscriber, audio_data):
+        """Transcribe the tail of a streamed recording and type the whole text."""
+        try:
+            text = streamer.finish(audio_data)
+            log(f"Streamed {streamer.segments_transcribed} segment(s)")
+
+            if text:
+                log(f"Transcribed: {text}")
+                type_text(text)
+            else:
+                log("No speech detected")
+
+        except Exception as e:
+            log(f"Transcription error: {e}", important=True)
+
     def run(self):
         """Run the main application loop."""
         log("Prosody is starting...")
@@ -205,8 +422,17 @@ class ProsodyApp:
 
         # Start the hotkey listener
         self.hotkey_listener.start()
+        self.residency.start()
 
-        # Show ready notification only after model is loaded
+        # Open the input stream up front in warm mode so the pre-roll fills
+        try:
+            self.audio_recorder.open()
+        except Exception as e:
+            log(f"Could not open warm audio stream: {e}", important=True)
+
+        log(f"Ready to record ({time.monotonic() - self._started:.2f}s after start)")
+
+        # Recording works straight away; transcription follows once the model loads
         try:
             subprocess.run(
                 [
@@ -226,8 +452,6 @@ class ProsodyApp:
         try:
             # Keep running
             while self.running:
-                import time
-
                 time.sleep(0.1)
         except KeyboardInterrupt:
             pass
@@ -247,6 +471,10 @@ class ProsodyApp:
 
         # Stop components
         self.hotkey_listener.stop()
+        self.residency.stop()
+        if isinstance(self.transcriber, TranscriptionWorker):
+            self.transcriber.close()
+        self.audio_recorder.close()
         self.recording_indicator.hide()
 
         # Clean up PID file
@@ -259,8 +487,20 @@ class ProsodyApp:
         sys.exit(0)
 
 
-def main():
-    """Main entry point."""
+def main(argv: Optional[List[str]] = None):
+    """Main entry point.
+
+    Args:
+        argv: Command line arguments (default sys.argv[1:]); ``tune`` runs the
+            thread tuner instead of the app
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "tune":
+        from .tuning import main as tune_main
+
+        tune_main(argv[1:])
+        return
+
     app = ProsodyApp()
     app.run()
 
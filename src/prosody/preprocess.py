@@ -0,0 +1,174 @@
+"""Block-wise audio preprocessing applied while recording."""
+
+import numpy as np
+from typing import Optional
+
+
+class OnePoleRecursion:
+    """Vectorized first-order recursion ``y[n] = a * y[n-1] + u[n]``.
+
+    The signal is split into chunks short enough that ``a ** -chunk`` stays
+    well conditioned. Each chunk's response from rest is a scaled cumulative
+    sum computed for all chunks at once, and only the chunk boundary states
+    are carried forward in a short scalar loop.
+    """
+
+    def __init__(self, a: float, chunk: int = 64):
+        """Initialize the recursion.
+
+        Args:
+            a: Feedback coefficient (0 <= a < 1)
+            chunk: Samples per vectorized chunk
+        """
+        self.a = float(a)
+        self.chunk = chunk
+        k = np.arange(chunk)
+        self._powers = self.a ** k  # a^k
+        self._inverse_powers = self.a ** -k.astype(np.float64)  # a^-k
+        self._carry = self.a ** (k + 1)  # contribution of the previous state
+        self.state = 0.0
+
+    def reset(self) -> None:
+        """Return to rest."""
+        self.state = 0.0
+
+    def process(self, u: np.ndarray) -> np.ndarray:
+        """Run the recursion over a 1-D input block.
+
+        Args:
+            u: Input sequence
+
+        Returns:
+            Output sequence as float64
+        """
+        n = len(u)
+        if n == 0:
+            return np.zeros(0)
+
+        chunks = -(-n // self.chunk)
+        padded = np.zeros(chunks * self.chunk)
+        padded[:n] = u
+        padded = padded.reshape(chunks, self.chunk)
+
+        # Zero-state response of every chunk: a^n * cumsum(u[k] * a^-k)
+        y = np.cumsum(padded * self._inverse_powers, axis=1)
+        y *= self._powers
+
+        # Carry each chunk's final state into the next
+        state = self.state
+        for i in range(chunks):
+            y[i] += self._carry * state
+            state = y[i, -1]
+
+        y = y.reshape(-1)[:n]
+        self.state = float(y[-1])
+        return y
+
+
+class AudioPreprocessor:
+    """Stateful DC removal, high-pass and automatic gain, one block at a time.
+
+    Each stage can be switched off on its own. Output is float32 in the
+    range -1.0 to 1.0, so a recording that went through it is ready for
+    Whisper without another pass over the buffer.
+    """
+
+    def __init__(
+        self,
+        samplerate: int = 16000,
+        dc_removal: bool = True,
+        highpass_hz: Optional[float] = 80.0,
+        agc: bool = True,
+        target_rms_db: float = -20.0,
+        max_gain_db: float = 20.0,
+        agc_time: float = 0.5,
+    ):
+        """Initialize the preprocessor.
+
+        Args:
+            samplerate: Sample rate of the audio
+            dc_removal: Subtract a slowly tracked DC offset
+            highpass_hz: Cutoff of a first-order high-pass filter (None to disable)
+            agc: Apply automatic gain towards ``target_rms_db``
+            target_rms_db: RMS level the gain aims for, in dBFS
+            max_gain_db: Largest gain the AGC will apply
+            agc_time: Time constant of the RMS tracker in seconds
+        """
+        self.samplerate = samplerate
+        self.dc_removal = dc_removal
+        self.highpass_hz = highpass_hz
+        self.agc = agc
+        self.target_rms = 10 ** (target_rms_db / 20)
+        self.max_gain = 10 ** (max_gain_db / 20)
+        self._agc_time = agc_time
+
+        # DC tracker: dc[n] = a * dc[n-1] + (1 - a) * x[n], time constant ~1s
+        self._dc = OnePoleRecursion(np.exp(-1.0 / samplerate))
+        # High-pass: y[n] = a * (y[n-1] + x[n] - x[n-1])
+        self._highpass = None
+        if highpass_hz:
+            rc = 1.0 / (2 * np.pi * highpass_hz)
+            self._highpass = OnePoleRecursion(rc / (rc + 1.0 / samplerate))
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all state before a new recording."""
+        self._dc.reset()
+        if self._highpass is not None:
+            self._highpass.reset()
+        self._previous = 0.0
+        self._power = self.target_rms ** 2
+        self.gain = 1.0
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Process one block of mono audio.
+
+        Args:
+            block: Samples of shape (frames,) or (frames, 1); integer input is
+                taken relative to full scale
+
+        Returns:
+            Float32 samples of the same shape, in the range -1.0 to 1.0
+        """
+        shape = block.shape
+        x = block.reshape(-1).astype(np.float64)
+        if block.dtype.kind == "i":
+            x /= -np.iinfo(block.dtype).min
+        if len(x) == 0:
+            return x.astype(np.float32).reshape(shape)
+
+        if self.dc_removal:
+            a = self._dc.a
+            x -= self._dc.process((1 - a) * x)
+
+        if self._highpass is not None:
+            a = self._highpass.a
+            delta = np.empty_like(x)
+            delta[0] = x[0] - self._previous
+            np.subtract(x[1:], x[:-1], out=delta[1:])
+            self._previous = x[-1]
+            delta *= a
+            x = self._highpass.process(delta)
+
+        if self.agc:
+            x = self._apply_gain(x)
+
+        np.clip(x, -1.0, 1.0, out=x)
+        return x.astype(np.float32).reshape(shape)
+
+    def _apply_gain(self, x: np.ndarray) -> np.ndarray:
+        """Scale towards the target RMS, ramping the gain across the block."""
+        # Smooth the signal power with a time constant of agc_time
+        alpha = 1.0 - np.exp(-len(x) / (self._agc_time * self.samplerate))
+        self._power += alpha * (float(np.dot(x, x)) / len(x) - self._power)
+
+        gain = min(self.max_gain, self.target_rms / max(np.sqrt(self._power), 1e-9))
+        # Never push the block's peak past full scale
+        peak = max(float(x.max()), -float(x.min()))
+        if peak * gain > 0.99:
+            gain = 0.99 / peak
+
+        ramp = np.linspace(self.gain, gain, len(x) + 1)[1:]
+        x *= ramp
+        self.gain = gain
+        return x
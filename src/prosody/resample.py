@@ -0,0 +1,128 @@
+"""Streaming sample-rate conversion for audio captured at the device's rate."""
+
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def design_lowpass(num_taps: int, cutoff: float, beta: float = 8.0) -> np.ndarray:
+    """Design a Kaiser-windowed sinc lowpass filter.
+
+    Args:
+        num_taps: Filter length
+        cutoff: Cutoff frequency in cycles per sample (0 to 0.5)
+        beta: Kaiser window shape parameter (higher means more stopband attenuation)
+
+    Returns:
+        Filter coefficients with unity DC gain
+    """
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(num_taps, beta)
+    return taps / taps.sum()
+
+
+class StreamingResampler:
+    """Rational polyphase FIR resampler that carries state between blocks.
+
+    Converts ``from_rate`` to ``to_rate`` by the ratio ``up / down``. Each
+    output sample uses one phase of the interpolation filter, so the work
+    per output is a single ``taps_per_phase``-long dot product. Input history
+    and the output phase are kept between calls, so splitting a signal into
+    blocks of any size gives the same result as processing it whole.
+    """
+
+    def __init__(self, from_rate: int, to_rate: int, zero_crossings: int = 16, rolloff: float = 0.95):
+        """Initialize the resampler.
+
+        Args:
+            from_rate: Input sample rate in Hz
+            to_rate: Output sample rate in Hz
+            zero_crossings: Sinc zero crossings kept on each side of the filter
+            rolloff: Cutoff as a fraction of the lower Nyquist frequency
+        """
+        g = math.gcd(int(from_rate), int(to_rate))
+        self.from_rate = int(from_rate)
+        self.to_rate = int(to_rate)
+        self.up = self.to_rate // g
+        self.down = self.from_rate // g
+
+        # Filter runs at the upsampled rate; cut off below the lower Nyquist
+        factor = max(self.up, self.down)
+        self.taps_per_phase = max(1, math.ceil((2 * zero_crossings * factor + 1) / self.up))
+        num_taps = self.taps_per_phase * self.up
+        taps = design_lowpass(num_taps, 0.5 * rolloff / factor) * self.up
+
+        # phases[p, k] multiplies x[i0 - k]; store reversed so a forward
+        # window x[i0 - K + 1 : i0 + 1] lines up with it
+        self.phases = np.ascontiguousarray(
+            taps.reshape(self.taps_per_phase, self.up).T[:, ::-1], dtype=np.float32
+        )
+
+        self._history = None
+        self._next_output = 0
+        self._consumed = 0
+
+    @property
+    def delay(self) -> float:
+        """Group delay of the filter in output samples."""
+        return (self.taps_per_phase * self.up - 1) / 2 / self.down
+
+    def reset(self) -> None:
+        """Forget the input history and start a new stream."""
+        self._history = None
+        self._next_output = 0
+        self._consumed = 0
+
+    def output_length(self, frames: int) -> int:
+        """Number of output frames the next ``frames`` input frames produce."""
+        available = self._consumed + frames
+        # Output n is ready once input sample (n * down) // up has arrived
+        end = -(-available * self.up // self.down)
+        return max(0, end - self._next_output)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Resample one block of audio.
+
+        Args:
+            block: Array of shape (frames,) or (frames, channels)
+
+        Returns:
+            Resampled audio with the same trailing shape
+        """
+        block = np.asarray(block, dtype=np.float32)
+        if self.up == self.down:
+            return block
+
+        K = self.taps_per_phase
+        if self._history is None:
+            self._history = np.zeros((K - 1,) + block.shape[1:], dtype=np.float32)
+
+        count = self.output_length(len(block))
+        extended = np.concatenate((self._history, block))
+        if count == 0:
+            self._history = extended[len(extended) - (K - 1):]
+            self._consumed += len(block)
+            return np.zeros((0,) + block.shape[1:], dtype=np.float32)
+
+        n = np.arange(self._next_output, self._next_output + count)
+        position = n * self.down
+        # Index of the newest input in each window, relative to `extended`
+        newest = position // self.up - self._consumed + (K - 1)
+        phase = position % self.up
+
+        windows = sliding_window_view(extended, K, axis=0)[newest - (K - 1)]
+        if block.ndim == 1:
+            out = np.einsum("ik,ik->i", windows, self.phases[phase])
+        else:
+            out = np.einsum("ick,ik->ic", windows, self.phases[phase])
+
+        self._history = extended[len(extended) - (K - 1):]
+        self._next_output += count
+        self._consumed += len(block)
+
+        # Every `up` outputs consume exactly `down` inputs; rebase so the
+        # counters stay small however long the stream runs
+        cycles = self._next_output // self.up
+        self._next_output -= cycles * self.up
+        self._consumed -= cycles * self.down
+        return out
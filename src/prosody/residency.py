@@ -0,0 +1,262 @@
+"""Keeps the speech model loaded while it is needed, and only then."""
+
+import os
+import sys
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+# Check if running in development mode
+DEV_MODE = os.environ.get('PROSODY_DEV') == '1' or sys.argv[0].endswith('__main__.py')
+# Suppress output in tests
+if 'pytest' in sys.modules:
+    DEV_MODE = False
+
+
+def log(message: str, important: bool = False):
+    """Log a message, respecting dev/production mode."""
+    if DEV_MODE:
+        print(message)
+
+
+# Name of the thread that loads the model and runs jobs
+RUNNER_NAME = "prosody-model-runner"
+
+
+class ModelResidency:
+    """Loads a Transcriber's model in the background and evicts it when idle.
+
+    Jobs that need the model are handed to ``submit`` and run one at a time,
+    in the order submitted, on a single runner thread, which first loads the
+    model if it is missing. Running them in turn keeps back-to-back
+    dictations from competing for the cores and from typing their text out
+    of order. With a ``coalesce`` function, consecutive waiting jobs can be
+    merged into one, so a burst of short recordings costs one inference.
+
+    A recording in progress ``hold``s the model, which also starts a reload
+    if it was evicted, so loading overlaps with capture. When nothing has
+    held the model for ``idle_timeout`` seconds it is unloaded to give the
+    memory back.
+    """
+
+    def __init__(
+        self,
+        transcriber,
+        idle_timeout: float = 0.0,
+        on_ready: Optional[Callable[[], None]] = None,
+        on_error: Optional[Callable[[Exception, int], None]] = None,
+        coalesce: Optional[Callable[[Callable, tuple, tuple], Optional[tuple]]] = None,
+    ):
+        """Initialize the residency manager.
+
+        Args:
+            transcriber: Transcriber whose model is managed
+            idle_timeout: Seconds unused before the model is unloaded (0 to
+                keep it loaded for good)
+            on_ready: Called on the runner thread after every (re)load
+            on_error: Called with the error and the number of discarded jobs
+                when loading fails
+            coalesce: Called as ``coalesce(target, args, next_args)`` when the
+                job about to run has another job for the same target right
+                behind it; returns the arguments of a single job doing both,
+                or None to run them separately
+        """
+        self.transcriber = transcriber
+        self.idle_timeout = idle_timeout
+        self.on_ready = on_ready
+        self.on_error = on_error
+        self.coalesce = coalesce
+        self.loads = 0
+        self.evictions = 0
+        self.merged = 0
+        self.last_wait: Optional[float] = None
+
+        self._lock = threading.Lock()
+        self._users = 0
+        self._last_used = time.monotonic()
+        # (target, args, time submitted)
+        self._pending: List[Tuple[Callable, tuple, float]] = []
+        self._runner: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    @property
+    def busy(self) -> bool:
+        """Whether a load or a job is in progress, or jobs are waiting."""
+        return self._runner is not None
+
+    @property
+    def queued(self) -> int:
+        """Number of jobs waiting to run."""
+        return len(self._pending)
+
+    @property
+    def oldest_wait(self) -> float:
+        """Seconds the longest-waiting job has been queued (0 with none)."""
+        with self._lock:
+            if not self._pending:
+                return 0.0
+            return time.monotonic() - self._pending[0][2]
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the runner to load the model and empty the queue.
+
+        Args:
+            timeout: Seconds to wait at most (None to wait for good)
+
+        Returns:
+            True if nothing is left running
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            runner = self._runner
+            if runner is None:
+                return True
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            runner.join(remaining)
+
+    def _start_runner(self) -> None:
+        """Start the runner thread if there is work for it. Call with the lock held."""
+        if self._runner is not None or (self.transcriber.ready and not self._pending):
+            return
+        self._runner = threading.Thread(target=self._work, name=RUNNER_NAME, daemon=True)
+        self._runner.start()
+
+    def _work(self):
+        """Load the model if it is missing, then run queued jobs in order."""
+        if not self.transcriber.ready:
+            try:
+                self.transcriber.load()
+            except Exception as e:
+                with self._lock:
+                    dropped = len(self._pending)
+                    self._users -= dropped
+                    self._pending.clear()
+                    self._runner = None
+                log(f"Error loading speech model: {e}", important=True)
+                if self.on_error:
+                    self.on_error(e, dropped)
+                return
+
+            self.loads += 1
+            if self.on_ready:
+                self.on_ready()
+
+        # New jobs keep queueing behind this one until the queue is empty
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._runner = None
+                    break
+                target, args, submitted = self._pending.pop(0)
+                self.last_wait = time.monotonic() - submitted
+                waiting = len(self._pending)
+            args = self._merge(target, args)
+            log(f"Job started after {self.last_wait:.2f}s in the queue ({waiting} waiting)")
+            self._run(target, args)
+
+    def _merge(self, target: Callable, args: tuple) -> tuple:
+        """Fold the jobs right behind this one into it, as far as ``coalesce`` allows."""
+        if self.coalesce is None:
+            return args
+        while True:
+            with self._lock:
+                if not self._pending or self._pending[0][0] != target:
+                    return args
+                next_args = self._pending[0][1]
+            try:
+                merged = self.coalesce(target, args, next_args)
+            except Exception as e:
+                log(f"Could not merge jobs: {e}", important=True)
+                merged = None
+            if merged is None:
+                return args
+            with self._lock:
+                self._pending.pop(0)
+                # The merged job's hold is released along with this one's
+                self._users = max(0, self._users - 1)
+                self.merged += 1
+            args = merged
+
+    def _run(self, target: Callable, args: tuple):
+        """Run one job, then let go of the model."""
+        try:
+            target(*args)
+        except Exception as e:
+            log(f"Job failed: {e}", important=True)
+        finally:
+            self.release()
+
+    def prefetch(self) -> None:
+        """Start loading the model in the background if it is not loaded."""
+        with self._lock:
+            self._start_runner()
+
+    def hold(self) -> None:
+        """Keep the model resident until ``release``, loading it if needed."""
+        with self._lock:
+            self._users += 1
+            self._start_runner()
+
+    def release(self) -> None:
+        """Undo one ``hold``; the idle timer starts when nothing holds the model."""
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            self._last_used = time.monotonic()
+
+    def submit(self, target: Callable, *args) -> None:
+        """Queue a job that needs the model, to run after those before it.
+
+        Args:
+            target: Function to call
+            *args: Arguments for ``target``
+        """
+        with self._lock:
+            self._users += 1
+            self._pending.append((target, args, time.monotonic()))
+            if not self.transcriber.ready:
+                log(f"Speech model not loaded yet, {len(self._pending)} job(s) queued")
+            self._start_runner()
+
+    def evict_if_idle(self) -> bool:
+        """Unload the model if it has gone unused for ``idle_timeout`` seconds.
+
+        Returns:
+            True if the model was unloaded
+        """
+        with self._lock:
+            if self.idle_timeout <= 0 or self._users or self._runner is not None:
+                return False
+            idle = time.monotonic() - self._last_used
+            if not self.transcriber.ready or idle < self.idle_timeout:
+                return False
+            self.transcriber.unload()
+            self.evictions += 1
+        log(f"Speech model unloaded after {idle:.0f}s idle")
+        return True
+
+    def _watch(self):
+        """Check for idleness until stopped."""
+        interval = min(30.0, max(0.05, self.idle_timeout / 4))
+        while not self._stop_event.wait(interval):
+            try:
+                self.evict_if_idle()
+            except Exception as e:
+                log(f"Model eviction error: {e}", important=True)
+
+    def start(self) -> None:
+        """Start evicting the model when idle (no-op without an idle timeout)."""
+        if self.idle_timeout <= 0 or self._monitor is not None:
+            return
+        self._stop_event.clear()
+        self._monitor = threading.Thread(target=self._watch, daemon=True)
+        self._monitor.start()
+
+    def stop(self) -> None:
+        """Stop the idle monitor."""
+        self._stop_event.set()
+        if self._monitor is not None:
+            self._monitor.join(timeout=1.0)
+            self._monitor = None
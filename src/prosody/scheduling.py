@@ -0,0 +1,103 @@
+"""CPU scheduling policy for the threads that run inference."""
+
+import os
+import sys
+from typing import Iterable, Optional, Set
+
+import torch
+
+# Check if running in development mode
+DEV_MODE = os.environ.get('PROSODY_DEV') == '1' or sys.argv[0].endswith('__main__.py')
+# Suppress output in tests
+if 'pytest' in sys.modules:
+    DEV_MODE = False
+
+
+def log(message: str, important: bool = False):
+    """Log a message, respecting dev/production mode."""
+    if DEV_MODE:
+        print(message)
+
+
+def parse_cpu_list(text: str) -> Set[int]:
+    """Parse a CPU list such as '0-3,6' into a set of CPU numbers."""
+    cpus = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+
+class SchedulingPolicy:
+    """Niceness and CPU affinity for inference, leaving cores for the rest.
+
+    On Linux both are per-thread attributes that new threads inherit from
+    the thread that creates them. Applying the policy on the thread that
+    runs inference, before it starts any parallel work, therefore also
+    covers the OpenMP threads PyTorch creates for it. The audio callback,
+    hotkey listener and Tk threads keep their normal priority, and
+    ``reserved_cores`` CPUs are kept free of inference for them.
+    """
+
+    def __init__(self, nice: int = 0, cpus: Optional[Iterable[int]] = None, reserved_cores: int = 0):
+        """Initialize the policy.
+
+        Args:
+            nice: Niceness for inference threads (0 to leave it alone; only
+                raising it is possible without privileges)
+            cpus: CPUs inference may use (default all the process may use)
+            reserved_cores: How many of the lowest-numbered allowed CPUs to
+                keep free of inference
+        """
+        self.nice = nice
+        self.cpus = set(cpus) if cpus is not None else None
+        self.reserved_cores = reserved_cores
+        # Taken once, before any thread has been narrowed down by apply()
+        try:
+            self._allowed = set(os.sched_getaffinity(0))
+        except AttributeError:
+            self._allowed = set()  # Affinity is not supported on this platform
+
+    @property
+    def active(self) -> bool:
+        """Whether the policy changes anything."""
+        return bool(self.nice or self.cpus is not None or self.reserved_cores)
+
+    def inference_cpus(self) -> Optional[Set[int]]:
+        """CPUs the inference threads are pinned to, or None for no pinning."""
+        if self.cpus is None and not self.reserved_cores:
+            return None
+        allowed = set(self._allowed)
+        if self.cpus is not None:
+            allowed &= self.cpus
+        reserved = set(sorted(allowed)[: self.reserved_cores])
+        # Never reserve the last usable CPU
+        return (allowed - reserved) or allowed or None
+
+    def apply(self) -> None:
+        """Apply the policy to the calling thread and the threads it starts."""
+        if self.nice:
+            try:
+                current = os.getpriority(os.PRIO_PROCESS, 0)
+                if current < self.nice:
+                    # PRIO_PROCESS with 0 means the calling thread on Linux
+                    os.setpriority(os.PRIO_PROCESS, 0, self.nice)
+            except (OSError, AttributeError) as e:
+                log(f"Could not set inference niceness: {e}", important=True)
+
+        cpus = self.inference_cpus()
+        if cpus:
+            try:
+                os.sched_setaffinity(0, cpus)
+            except (OSError, AttributeError) as e:
+                log(f"Could not set inference CPU affinity: {e}", important=True)
+                return
+            # More threads than CPUs would only make them take turns
+            if torch.get_num_threads() > len(cpus):
+                torch.set_num_threads(len(cpus))
@@ -0,0 +1,334 @@
+"""Audio sources that feed the recorder: the microphone, or stored audio."""
+
+import os
+import sys
+import threading
+import time
+import wave
+import numpy as np
+import sounddevice as sd
+from typing import Callable, List, Optional, Tuple
+
+from .devices import DeviceRegistry
+
+# Check if running in development mode
+DEV_MODE = os.environ.get('PROSODY_DEV') == '1' or sys.argv[0].endswith('__main__.py')
+# Suppress output in tests
+if 'pytest' in sys.modules:
+    DEV_MODE = False
+
+
+def log(message: str, important: bool = False):
+    """Log a message, respecting dev/production mode."""
+    if DEV_MODE:
+        print(message)
+
+
+class AudioSource:
+    """Something that can open a stream of audio blocks for the recorder.
+
+    ``open_stream`` returns an unstarted stream object with ``start``,
+    ``stop`` and ``close`` methods, shaped like ``sounddevice.InputStream``,
+    which calls ``callback(indata, frames, time, status)`` once per block.
+    """
+
+    def __init__(self):
+        """Initialize the source."""
+        self.on_change: Optional[Callable[[], None]] = None
+
+    def open_stream(
+        self,
+        callback: Callable,
+        channels: int,
+        dtype: str,
+        samplerate: Optional[int] = None,
+        blocksize: int = 0,
+        latency=None,
+        fallback_rate: int = 16000,
+    ) -> Tuple[object, int]:
+        """Open a stream that delivers audio to ``callback``.
+
+        Args:
+            callback: Function called with each block of audio
+            channels: Number of channels per frame
+            dtype: Sample format, 'float32' or 'int16'
+            samplerate: Rate to deliver at, or None for the source's native rate
+            blocksize: Frames per block (0 for the source's choice)
+            latency: Stream latency hint, for sources that support one
+            fallback_rate: Rate to use if the native rate cannot be found
+
+        Returns:
+            (stream, samplerate) where samplerate is the rate actually delivered
+        """
+        raise NotImplementedError
+
+    def open(self) -> None:
+        """Acquire long-lived resources, such as device monitoring."""
+
+    def close(self) -> None:
+        """Release anything acquired by open."""
+
+    def list_devices(self) -> List[dict]:
+        """Return the input devices this source can choose between."""
+        return []
+
+
+class MicrophoneSource(AudioSource):
+    """Live input from a sounddevice/PortAudio microphone."""
+
+    def __init__(self, device: Optional[str] = None):
+        """Initialize the microphone source.
+
+        Args:
+            device: Name (or part of a name) of the input device to pin; other
+                devices are tried if it is missing or fails to open
+        """
+        super().__init__()
+        self.devices = DeviceRegistry(preferred=device)
+        self.devices.on_change = self._devices_changed
+        self.device_index: Optional[int] = None
+
+    def _devices_changed(self) -> None:
+        """Forward hardware changes to whoever owns this source."""
+        if self.on_change:
+            self.on_change()
+
+    def _device_rate(self, device: Optional[int], fallback_rate: int) -> int:
+        """Return an input device's native sample rate.
+
+        Falls back to ``fallback_rate`` when the device cannot be queried.
+        """
+        try:
+            return int(sd.query_devices(device, "input")["default_samplerate"])
+        except Exception:
+            return fallback_rate
+
+    def open_stream(
+        self,
+        callback: Callable,
+        channels: int,
+        dtype: str,
+        samplerate: Optional[int] = None,
+        blocksize: int = 0,
+        latency=None,
+        fallback_rate: int = 16000,
+    ) -> Tuple[object, int]:
+        """Open an input stream on the best available device.
+
+        Devices are tried in the registry's order. If none opens, the device
+        list is re-enumerated once in case the hardware changed.
+        """
+        errors = []
+        for attempt in range(2):
+            for device in self.devices.candidates(reinitialize=attempt > 0 or self.devices.stale):
+                rate = samplerate or self._device_rate(device, fallback_rate)
+                try:
+                    stream = sd.InputStream(
+                        device=device,
+                        samplerate=rate,
+                        channels=channels,
+                        callback=callback,
+                        dtype=dtype,
+                        blocksize=blocksize,
+                        latency=latency,
+                    )
+                except Exception as e:
+                    log(f"Could not open input device {device}: {e}")
+                    errors.append(str(e))
+                    continue
+                self.device_index = device
+                return stream, rate
+            self.devices.stale = True
+
+        raise RuntimeError(f"Failed to start audio recording: {errors[-1] if errors else 'no input devices'}")
+
+    def open(self) -> None:
+        """Start watching for hotplugged devices."""
+        self.devices.start()
+
+    def close(self) -> None:
+        """Stop watching for hotplugged devices."""
+        self.devices.stop()
+
+    def list_devices(self) -> List[dict]:
+        """Return the cached input device list."""
+        return self.devices.devices()
+
+
+class ReplayStream:
+    """Stream that plays stored audio into a callback from its own thread."""
+
+    def __init__(self, audio: np.ndarray, samplerate: int, callback: Callable, blocksize: int, realtime: bool):
+        """Initialize the replay stream.
+
+        Args:
+            audio: Samples of shape (frames, channels) in the delivered format
+            samplerate: Rate the audio is delivered at
+            callback: Function called with each block
+            blocksize: Frames per block
+            realtime: Pace blocks at the audio's own rate instead of as fast as possible
+        """
+        self.audio = audio
+        self.samplerate = samplerate
+        self.callback = callback
+        self.blocksize = blocksize
+        self.realtime = realtime
+        self.finished = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def active(self) -> bool:
+        """Whether blocks are still being delivered."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        """Deliver every block, then mark the stream finished."""
+        started = time.monotonic()
+        for offset in range(0, len(self.audio), self.blocksize):
+            block = self.audio[offset:offset + self.blocksize]
+            if self.realtime:
+                # A block is only "captured" once its last frame has played
+                deadline = started + (offset + len(block)) / self.samplerate
+                if self._stop_event.wait(max(0.0, deadline - time.monotonic())):
+                    break
+            elif self._stop_event.is_set():
+                break
+            self.callback(block, len(block), None, None)
+        self.finished.set()
+
+    def start(self) -> None:
+        """Start delivering blocks."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop delivering blocks and wait for the thread to exit."""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def close(self) -> None:
+        """Close the stream."""
+        self.stop()
+
+
+class ArraySource(AudioSource):
+    """Replays a NumPy array, in real time or as fast as possible.
+
+    Useful for benchmarks and headless runs: the recorder sees exactly the
+    blocks it would get from a microphone, with no sound hardware involved.
+    """
+
+    def __init__(self, audio: np.ndarray, samplerate: int = 16000, realtime: bool = True):
+        """Initialize the array source.
+
+        Args:
+            audio: Samples of shape (frames,) or (frames, channels), float in
+                -1.0 to 1.0 or integer PCM
+            samplerate: Sample rate of the audio
+            realtime: Pace playback at the audio's own rate
+        """
+        super().__init__()
+        self.audio = audio if audio.ndim == 2 else audio.reshape(-1, 1)
+        self.samplerate = int(samplerate)
+        self.realtime = realtime
+        self.stream: Optional[ReplayStream] = None
+
+    def _convert(self, channels: int, dtype: str) -> np.ndarray:
+        """Convert the stored audio to the requested channels and format."""
+        audio = self.audio
+        if audio.shape[1] != channels:
+            if channels == 1:
+                audio = audio.mean(axis=1, keepdims=True)
+            else:
+                audio = np.repeat(audio[:, :1], channels, axis=1)
+
+        target = np.dtype(dtype)
+        if audio.dtype == target:
+            return audio
+        if audio.dtype.kind == "i" and target.kind == "f":
+            return (audio / float(-np.iinfo(audio.dtype).min)).astype(target)
+        if audio.dtype.kind == "f" and target.kind == "i":
+            info = np.iinfo(target)
+            return np.clip(np.round(audio * info.max), info.min, info.max).astype(target)
+        return audio.astype(target)
+
+    def open_stream(
+        self,
+        callback: Callable,
+        channels: int,
+        dtype: str,
+        samplerate: Optional[int] = None,
+        blocksize: int = 0,
+        latency=None,
+        fallback_rate: int = 16000,
+    ) -> Tuple[object, int]:
+        """Open a replay stream at the audio's own rate.
+
+        The requested ``samplerate`` is ignored; the recorder resamples from
+        the returned rate like it does for a microphone.
+        """
+        self.stream = ReplayStream(
+            self._convert(channels, dtype),
+            self.samplerate,
+            callback,
+            blocksize or max(1, self.samplerate // 100),
+            self.realtime,
+        )
+        return self.stream, self.samplerate
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the current stream has delivered all of its audio.
+
+        Returns:
+            True if playback finished within the timeout
+        """
+        return self.stream is not None and self.stream.finished.wait(timeout)
+
+
+class FileSource(ArraySource):
+    """Replays a WAV or .npy file."""
+
+    def __init__(self, path: str, samplerate: int = 16000, realtime: bool = True):
+        """Initialize the file source.
+
+        Args:
+            path: Path to a PCM WAV file or a .npy array
+            samplerate: Sample rate of a .npy file (WAV files carry their own)
+            realtime: Pace playback at the audio's own rate
+        """
+        if path.endswith(".npy"):
+            audio = np.load(path, mmap_mode="r")
+        else:
+            audio, samplerate = read_wav(path)
+        super().__init__(audio, samplerate=samplerate, realtime=realtime)
+        self.path = path
+
+
+def read_wav(path: str) -> Tuple[np.ndarray, int]:
+    """Read a PCM WAV file.
+
+    Args:
+        path: Path to an 8, 16 or 32-bit PCM WAV file
+
+    Returns:
+        (samples of shape (frames, channels), sample rate)
+    """
+    with wave.open(path, "rb") as f:
+        width = f.getsampwidth()
+        channels = f.getnchannels()
+        samplerate = f.getframerate()
+        data = f.readframes(f.getnframes())
+
+    if width == 1:
+        # 8-bit WAV is unsigned; recentre it as int16
+        audio = (np.frombuffer(data, dtype=np.uint8).astype(np.int16) - 128) << 8
+    elif width == 2:
+        audio = np.frombuffer(data, dtype="<i2")
+    elif width == 4:
+        audio = np.frombuffer(data, dtype="<i4")
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width * 8} bits")
+    return audio.reshape(-1, channels), samplerate
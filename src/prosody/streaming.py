@@ -0,0 +1,214 @@
+"""Incremental transcription of finished speech segments during recording."""
+
+import os
+import sys
+import threading
+import numpy as np
+from typing import Callable, List, Optional
+
+from .vad import VoiceActivityDetector
+
+# Check if running in development mode
+DEV_MODE = os.environ.get('PROSODY_DEV') == '1' or sys.argv[0].endswith('__main__.py')
+# Suppress output in tests
+if 'pytest' in sys.modules:
+    DEV_MODE = False
+
+
+def log(message: str, important: bool = False):
+    """Log a message, respecting dev/production mode."""
+    if DEV_MODE:
+        print(message)
+
+
+class StreamingTranscriber:
+    """Transcribes a recording segment by segment while it is still running.
+
+    A background thread polls the recorder for audio it has not consumed yet.
+    Once that audio contains speech followed by a long enough pause, it cuts
+    in the middle of the pause and transcribes the segment. When recording
+    stops, only the audio after the last cut is left for ``finish``, so the
+    wait after stopping no longer grows with the length of the dictation.
+
+    With ``submit``, segments are handed to the app's model queue instead of
+    being transcribed on the polling thread, so they take turns with every
+    other job on the model. Segments still waiting there when recording
+    stops are picked up by ``finish``.
+    """
+
+    def __init__(
+        self,
+        recorder,
+        transcriber,
+        vad: Optional[VoiceActivityDetector] = None,
+        pause_ms: float = 600.0,
+        min_segment_seconds: float = 2.0,
+        max_segment_seconds: float = 25.0,
+        poll_interval: float = 0.25,
+        normalized: bool = False,
+        submit: Optional[Callable] = None,
+    ):
+        """Initialize the streaming transcriber.
+
+        Args:
+            recorder: AudioRecorder whose live recording is read
+            transcriber: Transcriber used for every segment
+            vad: Detector used to find pauses (default one at the recorder's rate)
+            pause_ms: Silence needed after speech before a segment is cut
+            min_segment_seconds: Shortest segment worth transcribing on its own
+            max_segment_seconds: Cut here even without a pause (Whisper sees
+                at most 30 seconds at a time)
+            poll_interval: Seconds between checks of the live recording
+            normalized: Recorded audio is already normalized (preprocessed)
+            submit: Queues a job that needs the model, such as
+                ``ModelResidency.submit`` (default transcribe segments on the
+                polling thread)
+        """
+        self.recorder = recorder
+        self.transcriber = transcriber
+        self.vad = vad or VoiceActivityDetector(samplerate=recorder.samplerate)
+        self.samplerate = recorder.samplerate
+        self.pause_frames = max(1, int(round(pause_ms / 1000 * self.samplerate / self.vad.frame_length)))
+        self.min_segment = int(min_segment_seconds * self.samplerate)
+        self.max_segment = int(max_segment_seconds * self.samplerate)
+        self.poll_interval = poll_interval
+        self.normalized = normalized
+        self.submit = submit
+
+        self.texts: List[str] = []
+        # Segments cut off but not transcribed yet, oldest first
+        self._segments: List[np.ndarray] = []
+        self._segments_lock = threading.Lock()
+        self.segments_transcribed = 0
+        self._cursor = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def find_cut(self, audio: np.ndarray) -> int:
+        """Find where the pending audio can be split off as a finished segment.
+
+        Args:
+            audio: Audio recorded since the last cut
+
+        Returns:
+            Number of samples to cut off the front, or 0 to keep waiting
+        """
+        if len(audio) < self.min_segment:
+            return 0
+
+        speech = self.vad.speech_frames(audio)
+        frame = self.vad.frame_length
+        voiced = np.flatnonzero(speech)
+
+        if len(voiced):
+            # Lengths of the silent gaps following each voiced frame
+            gaps = np.diff(np.append(voiced, len(speech))) - 1
+            pauses = np.flatnonzero(gaps >= self.pause_frames)
+            for i in pauses[::-1]:
+                # Cut in the middle of the latest pause that gives a segment
+                # of acceptable length
+                cut = (voiced[i] + 1 + gaps[i] // 2) * frame
+                if self.min_segment <= cut <= self.max_segment:
+                    return int(cut)
+
+        if len(audio) >= self.max_segment:
+            # No usable pause: cut at the last silent frame that fits, or hard
+            silent = np.flatnonzero(~speech[: self.max_segment // frame])
+            end = silent[-1] if len(silent) and silent[-1] * frame >= self.min_segment else self.max_segment // frame
+            return int(end * frame)
+        return 0
+
+    def poll(self) -> bool:
+        """Transcribe the next finished segment, if there is one.
+
+        Returns:
+            True if a segment was cut off
+        """
+        audio, _ = self.recorder.recorded_since(self._cursor)
+        cut = self.find_cut(audio)
+        if cut == 0:
+            return False
+
+        with self._segments_lock:
+            self._segments.append(audio[:cut])
+        self._cursor += cut
+        if self.submit is None:
+            self._transcribe_next()
+        else:
+            self.submit(self._transcribe_next)
+        return True
+
+    def _transcribe_next(self) -> None:
+        """Transcribe the oldest waiting segment, if ``finish`` has not taken it."""
+        with self._segments_lock:
+            if not self._segments:
+                return
+            segment = self._segments.pop(0)
+        self._transcribe(segment)
+
+    def _transcribe(self, segment: np.ndarray) -> None:
+        """Transcribe one segment's speech and keep the text."""
+        speech = self.vad.trim(segment)
+        if len(speech) == 0:
+            return
+        text = self.transcriber.transcribe(
+            speech,
+            normalized=self.normalized,
+            prompt=" ".join(self.texts) or None,
+        )
+        self.segments_transcribed += 1
+        if text:
+            log(f"Segment transcribed: {text}")
+            self.texts.append(text)
+
+    def _run(self):
+        """Poll the live recording until stopped."""
+        while not self._stop_event.wait(self.poll_interval):
+            if not self.transcriber.ready:
+                # Model still loading; everything is left for finish
+                continue
+            try:
+                while not self._stop_event.is_set() and self.poll():
+                    pass
+            except Exception as e:
+                log(f"Streaming transcription error: {e}", important=True)
+
+    def start(self) -> None:
+        """Start transcribing segments in the background."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def cancel(self, discard: bool = False) -> None:
+        """Stop the background thread, waiting for a segment in progress.
+
+        Args:
+            discard: Also drop segments still waiting to be transcribed
+        """
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        if discard:
+            with self._segments_lock:
+                self._segments.clear()
+
+    def finish(self, audio_data: np.ndarray) -> str:
+        """Transcribe what is left of the finished recording.
+
+        Args:
+            audio_data: The complete recording returned by stop_recording; the
+                recorder must keep the whole recording (no ``max_seconds`` ring)
+
+        Returns:
+            Text of the whole recording, segments joined in order
+        """
+        self.cancel()
+        # Segments still queued run here, in order; their queued jobs find
+        # nothing left to do
+        while self._segments:
+            self._transcribe_next()
+        tail = np.asarray(audio_data)[self._cursor:]
+        if len(tail):
+            self._transcribe(tail)
+        return " ".join(self.texts)
@@ -1,12 +1,25 @@
 """Speech transcription using OpenAI's Whisper model."""
 
+import contextlib
+import ctypes
+import dataclasses
+import gc
 import os
 import sys
 import numpy as np
+import torch
 import whisper
 from typing import Optional
+from whisper.audio import FRAMES_PER_SECOND, N_FRAMES, N_SAMPLES
+
+from .checkpoints import VerifiedModels, load_model
+from .features import hann_window, log_mel
+from .scheduling import SchedulingPolicy
+from .tuning import apply_profile, load_profile
 import warnings
 import subprocess
+import threading
+import time
 
 # Suppress warnings from whisper
 warnings.filterwarnings("ignore", category=UserWarning)
@@ -24,20 +37,340 @@ def log(message: str, important: bool = False):
         print(message)
 
 
+def release_memory() -> None:
+    """Hand freed allocator memory back to the operating system.
+
+    PyTorch's CPU tensors come from malloc, which keeps freed blocks for
+    reuse, so dropping a model barely moves RSS until glibc is asked to trim.
+    """
+    gc.collect()
+    try:
+        import torch
+
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except Exception:
+        pass
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass  # Not glibc
+
+
+PRECISIONS = ("fp32", "int8", "bf16")
+
+# Whisper decoding options for each latency/accuracy trade-off. Every
+# temperature in the list is one more full decode pass when the previous
+# output looks wrong; beam search and best-of multiply the work per pass.
+DECODING_PROFILES = {
+    # One greedy pass, text tokens only, capped output length
+    "fastest": {
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+        "without_timestamps": True,
+        "sample_len": 128,
+    },
+    # Greedy, with two fallback passes if the output is degenerate
+    "balanced": {
+        "temperature": (0.0, 0.4, 0.8),
+        "condition_on_previous_text": False,
+        "without_timestamps": True,
+    },
+    # Whisper's reference settings: beam search and full temperature fallback
+    "accurate": {
+        "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True,
+        "beam_size": 5,
+        "best_of": 5,
+    },
+}
+
+
+def bf16_supported() -> bool:
+    """Whether this CPU has native bfloat16 matrix instructions."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+def quantize_int8(model: "whisper.Whisper") -> "whisper.Whisper":
+    """Quantize a Whisper model's Linear layers to int8, in place.
+
+    Weights are stored as int8 and activations are quantized on the fly,
+    so the model still takes and returns float32.
+    """
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear):
+            # Whisper's Linear subclass only adds a cast for fp16 weights;
+            # the quantizer only converts plain nn.Linear
+            module.__class__ = torch.nn.Linear
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def autocast_bf16(model: "whisper.Whisper") -> "whisper.Whisper":
+    """Run a Whisper model's encoder and decoder under bfloat16 autocast.
+
+    Weights stay float32; matrix multiplies run in bfloat16. Each forward
+    pass still returns float32, which Whisper's decoding loop checks for.
+    """
+    for module in (model.encoder, model.decoder):
+        forward = module.forward
+
+        def run(*args, _forward=forward, **kwargs):
+            with torch.autocast("cpu", dtype=torch.bfloat16):
+                return _forward(*args, **kwargs).float()
+
+        module.forward = run
+    return model
+
+
+@contextlib.contextmanager
+def skip_weight_init():
+    """Leave new modules' weights uninitialized while they are built.
+
+    For models whose weights are replaced right after construction: the
+    freshly allocated memory is never written, so it costs neither time nor
+    resident pages. Not thread-safe; it swaps functions in ``torch.nn.init``.
+    """
+    names = ("uniform_", "normal_", "kaiming_uniform_", "ones_", "zeros_")
+    saved = {name: getattr(torch.nn.init, name) for name in names}
+    for name in names:
+        setattr(torch.nn.init, name, lambda tensor, *args, **kwargs: tensor)
+    try:
+        yield
+    finally:
+        for name, function in saved.items():
+            setattr(torch.nn.init, name, function)
+
+
+def save_mmap_checkpoint(model: "whisper.Whisper", path: str) -> None:
+    """Write a model in a form ``load_mmap_checkpoint`` can memory-map, atomically."""
+    checkpoint = {
+        "dims": dataclasses.asdict(model.dims),
+        "model_state_dict": model.state_dict(),
+        # Not part of the state dict, and set per model by whisper.load_model
+        "alignment_heads": model.alignment_heads.to_dense(),
+    }
+    partial = f"{path}.{os.getpid()}.tmp"
+    torch.save(checkpoint, partial)
+    os.replace(partial, path)
+
+
+def load_mmap_checkpoint(path: str) -> "whisper.Whisper":
+    """Load a model saved by ``save_mmap_checkpoint`` without copying its weights.
+
+    The tensors are backed by the file's pages, read in on first use and
+    shared through the page cache with every other process using the file.
+    """
+    checkpoint = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    with skip_weight_init():
+        model = whisper.Whisper(whisper.ModelDimensions(**checkpoint["dims"]))
+    model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+    model.register_buffer("alignment_heads", checkpoint["alignment_heads"].to_sparse(), persistent=False)
+    return model
+
+
+# Encoder window lengths, in seconds, used in short-window mode. A few
+# fixed sizes keep the set of shapes the CPU kernels see small.
+SHORT_WINDOW_BUCKETS = (5.0, 10.0, 15.0, 20.0, 30.0)
+
+
+def bucket_frames(frames: int) -> int:
+    """Mel frames to pad a window of ``frames`` to in short-window mode.
+
+    Picks the smallest bucket leaving at least a second of silence after
+    the audio, so the decoder still sees the speech end.
+    """
+    for seconds in SHORT_WINDOW_BUCKETS:
+        length = int(seconds * FRAMES_PER_SECOND)
+        if frames + FRAMES_PER_SECOND <= length:
+            return min(length, N_FRAMES)
+    return N_FRAMES
+
+
+def short_window_encoder(model: "whisper.Whisper") -> "whisper.Whisper":
+    """Let a Whisper encoder take windows shorter than 30 seconds.
+
+    The stock encoder insists on exactly 3000 mel frames. This forward pass
+    is the same except that the positional embedding is sliced to the
+    window's length, so encoder time scales with the window instead of
+    always covering 30 seconds. Full windows give identical results.
+    """
+    encoder = model.encoder
+
+    def forward(x: torch.Tensor) -> torch.Tensor:
+        x = torch.nn.functional.gelu(encoder.conv1(x))
+        x = torch.nn.functional.gelu(encoder.conv2(x))
+        x = x.permute(0, 2, 1)
+
+        if x.shape[1] > encoder.positional_embedding.shape[0]:
+            raise ValueError("Audio window longer than 30 seconds")
+        x = (x + encoder.positional_embedding[:x.shape[1]]).to(x.dtype)
+
+        for block in encoder.blocks:
+            x = block(x)
+        return encoder.ln_post(x)
+
+    encoder.forward = forward
+    return model
+
+
 class Transcriber:
     """Handles speech-to-text transcription using Whisper."""
 
-    def __init__(self, model_name: str = "base.en"):
+    def __init__(
+        self,
+        model_name: str = "base.en",
+        load: bool = True,
+        precision: str = "fp32",
+        cache_dir: Optional[str] = None,
+        thread_profile: bool = True,
+        scheduling: Optional[SchedulingPolicy] = None,
+        decoding: str = "balanced",
+        short_window: bool = False,
+        direct_decode: bool = True,
+        warmup: bool = False,
+        model_cache: bool = False,
+    ):
         """Initialize the transcriber with a Whisper model.
 
         Args:
             model_name: Name of the Whisper model to use (default "base.en")
                        Options: tiny, base, small, medium, large
                        Add .en suffix for English-only models (faster)
+            load: Load the model now; pass False to call ``load`` later,
+                e.g. from a background thread
+            precision: 'fp32', 'int8' (dynamically quantized Linear layers) or
+                'bf16' (autocast, falls back to fp32 without CPU support)
+            cache_dir: Where derived model files such as quantized weights are
+                kept (default ~/.cache/prosody)
+            thread_profile: Apply the thread counts saved by ``prosody tune``
+                in ``cache_dir`` before loading
+            scheduling: Niceness and CPU affinity applied to whichever thread
+                loads the model or transcribes
+            decoding: Decoding profile: 'fastest', 'balanced' or 'accurate'
+            short_window: Encode short clips in a window sized to the audio
+                (see SHORT_WINDOW_BUCKETS) instead of padding to 30 seconds.
+                Applies to the timestamp-free decoding profiles.
+            direct_decode: Decode clips of up to 30 seconds straight from their
+                mel spectrogram, bypassing ``whisper.transcribe``'s seek loop
+                and per-segment bookkeeping (timestamp-free profiles only)
+            warmup: After loading, run one short inference on synthetic audio
+                so the first dictation does not pay for first-call setup
+            model_cache: Convert the checkpoint once into a memory-mappable
+                file in ``cache_dir`` and load from that afterwards (CPU fp32
+                and bf16; int8 has its own cache, and with CUDA available
+                fp32 loads onto the GPU as before)
         """
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unsupported precision '{precision}', expected one of {', '.join(PRECISIONS)}")
+        if decoding not in DECODING_PROFILES:
+            raise ValueError(
+                f"Unknown decoding profile '{decoding}', expected one of {', '.join(DECODING_PROFILES)}"
+            )
+        if precision == "bf16" and not bf16_supported():
+            log("CPU has no native bfloat16 support, using fp32")
+            precision = "fp32"
+
         self.model_name = model_name
+        self.precision = precision
+        self.cache_dir = cache_dir or os.path.expanduser("~/.cache/prosody")
+        self.thread_profile = thread_profile
+        self.scheduling = scheduling
+        self.decoding = decoding
+        self.short_window = short_window
+        self.direct_decode = direct_decode
+        self.warmup = warmup
+        self.model_cache = model_cache
+        self.warmup_seconds: Optional[float] = None
+        self.last_decode_passes: Optional[int] = None
+        # Error swallowed by the last transcribe call, if it failed
+        self.last_error: Optional[Exception] = None
+        self._local = threading.local()
         self.model: Optional[whisper.Whisper] = None
-        self._load_model()
+        self.load_seconds: Optional[float] = None
+        if load:
+            self.load()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the model is loaded and transcription can run."""
+        return self.model is not None
+
+    def load(self) -> None:
+        """Load the model if it is not loaded yet.
+
+        Raises:
+            RuntimeError: If the model cannot be loaded
+        """
+        if self.model is None:
+            started = time.monotonic()
+            if self.thread_profile:
+                profile = load_profile(os.path.join(self.cache_dir, "threads.json"))
+                if profile is not None:
+                    apply_profile(profile)
+            if self.scheduling is not None:
+                self.scheduling.apply()
+            self._load_model()
+            self._count_decode_passes()
+            self.load_seconds = time.monotonic() - started
+            log(f"Model load took {self.load_seconds:.2f}s")
+            if self.warmup:
+                try:
+                    self._warm_up()
+                except Exception as e:
+                    # Only costs the first dictation some speed
+                    log(f"Warm-up failed: {e}", important=True)
+
+    def _warm_up(self) -> None:
+        """Build per-call caches and run one inference on synthetic audio.
+
+        The tokenizer, mel filterbank and STFT window are cached after their
+        first use; the warm-up pass then goes through ``transcribe`` itself,
+        so the allocator has grown and every kernel on the real path has been
+        dispatched once before the first dictation arrives.
+        """
+        from whisper.tokenizer import get_tokenizer
+
+        started = time.monotonic()
+        get_tokenizer(
+            self.model.is_multilingual,
+            num_languages=self.model.num_languages,
+            language="en",
+            task="transcribe",
+        )
+        whisper.audio.mel_filters("cpu", self.model.dims.n_mels)
+        hann_window()
+
+        # A second of faint noise: enough to run the encoder and decoder
+        audio = np.random.default_rng(0).standard_normal(16000).astype(np.float32) * 1e-3
+        self.transcribe(audio, normalized=True)
+        if self.last_error is not None:
+            raise self.last_error
+        self.last_decode_passes = None
+        self.warmup_seconds = time.monotonic() - started
+        log(f"Warm-up inference took {self.warmup_seconds:.2f}s")
+
+    def _count_decode_passes(self) -> None:
+        """Wrap the model's decode so each transcription counts its passes."""
+        decode = self.model.decode
+
+        def counted(*args, **kwargs):
+            self._local.decode_passes = getattr(self._local, "decode_passes", 0) + 1
+            return decode(*args, **kwargs)
+
+        self.model.decode = counted
+
+    def unload(self) -> None:
+        """Drop the model and release its memory; ``load`` brings it back."""
+        if self.model is None:
+            return
+        self.model = None
+        release_memory()
+        log(f"Unloaded Whisper model '{self.model_name}'")
 
     def _load_model(self):
         """Load the Whisper model."""
@@ -66,17 +399,109 @@ class Transcriber:
             else:
                 log(f"Loading Whisper model '{self.model_name}'...")
             
-            self.model = whisper.load_model(self.model_name)
-            log(f"Model loaded successfully")
+            if self.precision == "int8":
+                model = self._load_int8(model_path)
+            elif self.model_cache and (self.precision == "bf16" or not torch.cuda.is_available()):
+                # Mapped weights only help on the CPU; a GPU gets a copy anyway
+                model = self._load_cached(model_path)
+            elif self.precision == "bf16":
+                model = self._load_checkpoint(device="cpu")
+            else:
+                model = self._load_checkpoint()
+            # Patched after the int8 cache is written, and inside autocast
+            if self.short_window:
+                model = short_window_encoder(model)
+            if self.precision == "bf16":
+                model = autocast_bf16(model)
+            self.model = model
+            log(f"Model loaded successfully ({self.precision})")
         except Exception as e:
             raise RuntimeError(f"Failed to load Whisper model: {e}")
 
-    def transcribe(self, audio_data: np.ndarray, language: str = "en") -> str:
+    def _load_checkpoint(self, device: Optional[str] = None) -> "whisper.Whisper":
+        """Load Whisper's checkpoint, checksumming it only if it changed since the last check."""
+        manifest = VerifiedModels(os.path.join(self.cache_dir, "verified.json"))
+        return load_model(self.model_name, manifest, device=device)
+
+    @property
+    def quantized_path(self) -> str:
+        """Cache file for this model's int8 weights."""
+        return os.path.join(self.cache_dir, f"{self.model_name}-int8-torch{torch.__version__}.pt")
+
+    @property
+    def mmap_path(self) -> str:
+        """Cache file for this model's memory-mappable weights."""
+        return os.path.join(self.cache_dir, f"{self.model_name}-mmap-torch{torch.__version__}.pt")
+
+    def _load_cached(self, model_path: str) -> "whisper.Whisper":
+        """Load the model from the mmap cache, converting the checkpoint on a miss."""
+        path = self.mmap_path
+        # A checkpoint newer than the cache means the model was re-downloaded
+        if os.path.exists(path) and (
+            not os.path.exists(model_path) or os.path.getmtime(path) >= os.path.getmtime(model_path)
+        ):
+            try:
+                return load_mmap_checkpoint(path)
+            except Exception as e:
+                log(f"Ignoring unreadable model cache: {e}", important=True)
+
+        model = self._load_checkpoint(device="cpu")
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            save_mmap_checkpoint(model, path)
+            # Switch to the file-backed copy straight away
+            del model
+            release_memory()
+            return load_mmap_checkpoint(path)
+        except Exception as e:
+            log(f"Could not cache model for memory-mapped loading: {e}", important=True)
+            return self._load_checkpoint(device="cpu")
+
+    def _load_int8(self, model_path: str) -> "whisper.Whisper":
+        """Load the int8 model from the cache, quantizing and caching it on a miss."""
+        path = self.quantized_path
+        # A checkpoint newer than the cache means the model was re-downloaded
+        if os.path.exists(path) and (
+            not os.path.exists(model_path) or os.path.getmtime(path) >= os.path.getmtime(model_path)
+        ):
+            try:
+                # Our own cache file; it holds quantized modules, not just tensors
+                return torch.load(path, map_location="cpu", weights_only=False)
+            except Exception as e:
+                log(f"Ignoring unreadable quantized model cache: {e}", important=True)
+
+        model = quantize_int8(self._load_checkpoint(device="cpu"))
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            partial = f"{path}.{os.getpid()}.tmp"
+            torch.save(model, partial)
+            os.replace(partial, path)
+        except Exception as e:
+            log(f"Could not cache quantized model: {e}", important=True)
+        return model
+
+    def transcribe(
+        self,
+        audio_data: np.ndarray,
+        language: str = "en",
+        normalized: bool = False,
+        prompt: Optional[str] = None,
+        mel: Optional[torch.Tensor] = None,
+    ) -> str:
         """Transcribe audio data to text.
 
         Args:
-            audio_data: NumPy array containing audio samples (float32)
+            audio_data: NumPy array containing audio samples (float32, or int16
+                at full scale)
             language: Language code for transcription (default "en")
+            normalized: The audio is known to be float32 within -1.0 to 1.0
+                (e.g. it was preprocessed while recording), so skip the scan
+            prompt: Text that came just before this audio, given to Whisper as
+                context so a dictation split into segments reads continuously
+            mel: The audio's normalized log-mel spectrogram, computed while
+                recording (see features.CaptureFeatures). With a timestamp-free
+                decoding profile, Whisper's front end is skipped and this is
+                decoded directly.
 
         Returns:
             Transcribed text string
@@ -87,30 +512,130 @@ class Transcriber:
         if len(audio_data) == 0:
             return ""
 
+        if self.scheduling is not None:
+            # Cheap enough per call, and covers every thread that transcribes
+            self.scheduling.apply()
+
+        self.last_error = None
         try:
-            # Ensure audio is float32 and in the correct range
-            audio_data = audio_data.astype(np.float32)
+            audio_data = np.asarray(audio_data)
+            if audio_data.dtype.kind == "i":
+                # Integer capture is converted once here, scaled in place
+                scale = 1.0 / -np.iinfo(audio_data.dtype).min
+                audio_data = audio_data.astype(np.float32)
+                audio_data *= scale
+            else:
+                # Ensure audio is float32 (no copy if it already is, which keeps
+                # memory-mapped recordings on disk) and in the correct range
+                audio_data = np.asarray(audio_data, dtype=np.float32)
 
-            # Normalize audio if needed
-            if np.abs(audio_data).max() > 1.0:
-                audio_data = audio_data / np.abs(audio_data).max()
+            # Normalize audio if needed; max/min avoid an abs() temporary
+            if not normalized:
+                peak = max(float(audio_data.max()), -float(audio_data.min()))
+                if peak > 1.0:
+                    audio_data = audio_data / peak
+                    mel = None  # Computed from the unscaled audio
+
+            profile = DECODING_PROFILES[self.decoding]
+            if mel is not None and (
+                mel.shape[0] != self.model.dims.n_mels or not profile.get("without_timestamps")
+            ):
+                mel = None
+            if (
+                mel is None
+                and (self.direct_decode or self.short_window)
+                and profile.get("without_timestamps")
+                and len(audio_data) <= N_SAMPLES
+            ):
+                # The clip fits one window: one decode call (plus any
+                # fallbacks) instead of whisper.transcribe's machinery
+                mel = log_mel(audio_data, self.model.dims.n_mels)
 
             # Transcribe the audio
-            result = self.model.transcribe(
-                audio_data,
-                language=language,
-                fp16=False,  # Use FP32 for better CPU compatibility
-                verbose=False,
-            )
+            self._local.decode_passes = 0
+            if mel is not None:
+                text = self._transcribe_mel(mel, language, prompt)
+            else:
+                result = self.model.transcribe(
+                    audio_data,
+                    language=language,
+                    fp16=False,  # Reduced precision comes from self.precision instead
+                    verbose=False,
+                    initial_prompt=prompt,
+                    **profile,
+                )
+                text = result["text"]
+            self.last_decode_passes = self._local.decode_passes
+            log(f"Decoded with the '{self.decoding}' profile in {self.last_decode_passes} pass(es)")
 
             # Extract and clean the text
-            text = result["text"].strip()
-            return text
+            return text.strip()
 
         except Exception as e:
             log(f"Transcription error: {e}", important=True)
+            self.last_error = e
             return ""
 
+    def _transcribe_mel(self, mel: torch.Tensor, language: str, prompt: Optional[str]) -> str:
+        """Decode a precomputed log-mel spectrogram window by window.
+
+        Follows ``whisper.transcribe`` for profiles without timestamps, where
+        it steps through whole 30 s windows: the same temperature fallback and
+        silence checks, with the prompt given to the first window only. In
+        short-window mode a window is padded to its bucket, not to 30 s.
+        """
+        from whisper.decoding import DecodingOptions
+        from whisper.tokenizer import get_tokenizer
+
+        profile = DECODING_PROFILES[self.decoding]
+        tokenizer = get_tokenizer(
+            self.model.is_multilingual,
+            num_languages=self.model.num_languages,
+            language=language,
+            task="transcribe",
+        )
+        temperatures = profile["temperature"]
+        if isinstance(temperatures, (int, float)):
+            temperatures = (temperatures,)
+        options = {
+            key: value
+            for key, value in profile.items()
+            if key not in ("temperature", "condition_on_previous_text")
+        }
+        prompt_tokens = tokenizer.encode(" " + prompt.strip()) if prompt else []
+
+        tokens = []
+        for seek in range(0, mel.shape[-1], N_FRAMES):
+            window = mel[:, seek:seek + N_FRAMES]
+            length = bucket_frames(window.shape[-1]) if self.short_window else N_FRAMES
+            segment = whisper.pad_or_trim(window, length).to(self.model.device)
+            for temperature in temperatures:
+                kwargs = dict(options)
+                # Beam search only applies to greedy passes, best-of to sampled ones
+                kwargs.pop("beam_size" if temperature > 0 else "best_of", None)
+                result = self.model.decode(
+                    segment,
+                    DecodingOptions(
+                        language=language,
+                        temperature=temperature,
+                        prompt=prompt_tokens,
+                        fp16=False,
+                        **kwargs,
+                    ),
+                )
+                needs_fallback = result.compression_ratio > 2.4 or result.avg_logprob < -1.0
+                if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+                    needs_fallback = False  # Silence
+                if not needs_fallback:
+                    break
+            prompt_tokens = []
+
+            if result.no_speech_prob > 0.6 and result.avg_logprob <= -1.0:
+                continue  # No speech in this window
+            if tokenizer.decode(result.tokens).strip():
+                tokens.extend(result.tokens)
+        return tokenizer.decode(tokens)
+
     def get_available_models(self) -> list:
         """Get list of available Whisper models.
 
@@ -137,6 +662,12 @@ class Transcriber:
         """
         return {
             "name": self.model_name,
+            "precision": self.precision,
+            "decoding": self.decoding,
+            "short_window": self.short_window,
+            "model_cache": self.model_cache,
+            "load_seconds": self.load_seconds,
+            "warmup_seconds": self.warmup_seconds,
             "loaded": self.model is not None,
             "multilingual": not self.model_name.endswith(".en"),
             "n_text_ctx": getattr(self.model, "n_text_ctx", "unknown") if self.model else "unknown",
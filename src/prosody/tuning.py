@@ -0,0 +1,251 @@
+"""Per-machine tuning of PyTorch CPU threading for transcription."""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+import torch
+
+# Check if running in development mode
+DEV_MODE = os.environ.get('PROSODY_DEV') == '1' or sys.argv[0].endswith('__main__.py')
+# Suppress output in tests
+if 'pytest' in sys.modules:
+    DEV_MODE = False
+
+
+def log(message: str, important: bool = False):
+    """Log a message, respecting dev/production mode."""
+    if DEV_MODE:
+        print(message)
+
+
+def default_profile_path() -> str:
+    """Where the thread profile is stored."""
+    return os.path.join(os.path.expanduser("~/.cache/prosody"), "threads.json")
+
+
+def machine_signature() -> str:
+    """Identify the CPU a profile was measured on."""
+    model = platform.processor()
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    model = line.split(":", 1)[1].strip()
+                    break
+    except OSError:
+        pass
+    return f"{model} x{os.cpu_count()}"
+
+
+def thread_candidates(cpu_count: Optional[int] = None) -> List[int]:
+    """Thread counts worth trying: powers of two, half the CPUs, and all of them."""
+    cpu_count = cpu_count or os.cpu_count() or 1
+    candidates = {cpu_count, max(1, cpu_count // 2)}
+    n = 1
+    while n < cpu_count:
+        candidates.add(n)
+        n *= 2
+    return sorted(candidates)
+
+
+def load_profile(path: Optional[str] = None) -> Optional[dict]:
+    """Read a saved profile, if there is one for this machine.
+
+    Returns:
+        The profile, or None if it is missing, unreadable or from other hardware
+    """
+    try:
+        with open(path or default_profile_path()) as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if profile.get("machine") != machine_signature():
+        log("Ignoring thread profile measured on different hardware")
+        return None
+    return profile
+
+
+def save_profile(profile: dict, path: Optional[str] = None) -> str:
+    """Write a profile atomically.
+
+    Returns:
+        The path written
+    """
+    path = path or default_profile_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "w") as f:
+        json.dump(profile, f, indent=2)
+    os.replace(partial, path)
+    return path
+
+
+def apply_profile(profile: dict) -> bool:
+    """Apply a profile's thread counts to PyTorch.
+
+    Threading chosen through OMP_NUM_THREADS or MKL_NUM_THREADS is left
+    alone. The inter-op count can only be set before PyTorch starts any
+    parallel work, so it is skipped if that has already happened.
+
+    Returns:
+        True if the profile was applied
+    """
+    if os.environ.get("OMP_NUM_THREADS") or os.environ.get("MKL_NUM_THREADS"):
+        return False
+
+    torch.set_num_threads(int(profile["num_threads"]))
+    try:
+        torch.set_num_interop_threads(int(profile["interop_threads"]))
+    except RuntimeError:
+        pass
+    log(f"Using {profile['num_threads']} inference thread(s) from the tuned profile")
+    return True
+
+
+def time_inference(model, repeats: int = 3, tokens: int = 32) -> float:
+    """Time one encoder pass plus a fixed-length decoder pass.
+
+    The workload does not depend on what is said, so every thread count is
+    measured on exactly the same amount of work.
+
+    Returns:
+        Best wall time in seconds
+    """
+    mel = torch.randn(1, model.dims.n_mels, 2 * model.dims.n_audio_ctx)
+    sequence = torch.zeros(1, tokens, dtype=torch.long)
+    best = float("inf")
+    with torch.no_grad():
+        for i in range(repeats + 1):
+            started = time.perf_counter()
+            features = model.embed_audio(mel)
+            model.logits(sequence, features)
+            if i:  # The first pass is warm-up
+                best = min(best, time.perf_counter() - started)
+    return best
+
+
+def benchmark_clip(seconds: float = 3.0, samplerate: int = 16000) -> np.ndarray:
+    """A fixed clip to transcribe: a voiced-like tone under low noise.
+
+    Seeded, so every thread count and every run decodes the same audio.
+    """
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * samplerate), dtype=np.float32) / samplerate
+    tone = 0.3 * np.sin(2 * np.pi * 180 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    return (tone + 0.02 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def time_transcription(transcriber, clip: np.ndarray, repeats: int = 3) -> Tuple[float, int]:
+    """Time ``Transcriber.transcribe`` on a clip, decoding included.
+
+    Torch's RNG is reseeded before every run, so a profile's sampled
+    fallback passes decode the same way each time.
+
+    Returns:
+        (best wall time in seconds, decode passes per transcription)
+
+    Raises:
+        RuntimeError: If a transcription fails, or runs differ in passes
+    """
+    best = float("inf")
+    passes = set()
+    for i in range(repeats + 1):
+        torch.manual_seed(0)
+        started = time.perf_counter()
+        transcriber.transcribe(clip, normalized=True)
+        elapsed = time.perf_counter() - started
+        # transcribe returns "" on errors, which would look fastest
+        if transcriber.last_error is not None:
+            raise RuntimeError(f"Benchmark transcription failed: {transcriber.last_error}") from transcriber.last_error
+        passes.add(transcriber.last_decode_passes)
+        if i:  # The first pass is warm-up
+            best = min(best, elapsed)
+    if len(passes) > 1:
+        raise RuntimeError(f"Benchmark runs decoded in different numbers of passes: {sorted(passes)}")
+    return best, passes.pop()
+
+
+def tune(transcriber, candidates: Optional[List[int]] = None, repeats: int = 3) -> dict:
+    """Benchmark a loaded Transcriber across thread counts.
+
+    Args:
+        transcriber: Transcriber with its model loaded
+        candidates: Thread counts to try (default thread_candidates())
+        repeats: Timed transcriptions per thread count
+
+    Returns:
+        Profile of the fastest setting, with every measurement under "results"
+
+    Raises:
+        RuntimeError: If a benchmark transcription fails, or thread counts
+            differ in decode passes
+    """
+    clip = benchmark_clip()
+    original = torch.get_num_threads()
+    results = {}
+    passes = {}
+    try:
+        for threads in candidates or thread_candidates():
+            torch.set_num_threads(threads)
+            results[threads], passes[threads] = time_transcription(transcriber, clip, repeats=repeats)
+            log(f"{threads:>3} thread(s): {results[threads] * 1000:.0f} ms in {passes[threads]} pass(es)")
+    finally:
+        torch.set_num_threads(original)
+
+    if len(set(passes.values())) > 1:
+        # Then the timings compare decode lengths, not thread counts
+        raise RuntimeError(
+            f"Decode passes differ across thread counts ({passes}); tune with --decoding fastest"
+        )
+
+    best = min(results, key=results.get)
+    return {
+        "machine": machine_signature(),
+        "model": transcriber.model_name,
+        "precision": transcriber.precision,
+        "num_threads": best,
+        # Whisper inference is a chain of single ops, so a second inter-op
+        # pool only competes with the intra-op threads for cores
+        "interop_threads": 1,
+        "seconds": results[best],
+        "decode_passes": passes[best],
+        "results": {str(k): v for k, v in results.items()},
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Entry point for ``prosody tune``."""
+    parser = argparse.ArgumentParser(
+        prog="prosody tune",
+        description="Find the fastest CPU thread count for transcription and save it.",
+    )
+    parser.add_argument("--model", default="base.en", help="Whisper model to benchmark")
+    parser.add_argument("--precision", default=os.environ.get("PROSODY_PRECISION", "fp32"))
+    parser.add_argument("--decoding", default=os.environ.get("PROSODY_DECODING", "balanced"))
+    parser.add_argument("--threads", help="Comma-separated thread counts to try")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed transcriptions per thread count")
+    parser.add_argument("--output", default=default_profile_path(), help="Where to save the profile")
+    args = parser.parse_args(argv)
+
+    from .transcription import Transcriber
+
+    transcriber = Transcriber(
+        model_name=args.model, precision=args.precision, thread_profile=False, decoding=args.decoding
+    )
+    candidates = [int(n) for n in args.threads.split(",")] if args.threads else None
+
+    print(f"Tuning {args.model} ({transcriber.precision}) on {machine_signature()}")
+    try:
+        profile = tune(transcriber, candidates=candidates, repeats=args.repeats)
+    except RuntimeError as e:
+        sys.exit(f"Tuning failed: {e}")
+    for threads, seconds in profile["results"].items():
+        marker = "  <- fastest" if int(threads) == profile["num_threads"] else ""
+        print(f"  {threads:>3} thread(s): {seconds * 1000:7.0f} ms{marker}")
+    print(f"Saved profile to {save_profile(profile, args.output)}")
@@ -15,20 +15,28 @@ except ImportError:
 class PolishedWaveformIndicator:
     """Pill-shaped waveform that uses the full width including rounded edges."""
 
-    def __init__(self, get_audio_level: Callable[[], float]):
+    def __init__(
+        self,
+        get_audio_level: Callable[[], float],
+        get_level_history: Optional[Callable[[int], np.ndarray]] = None,
+    ):
         """Initialize the waveform indicator.
 
         Args:
             get_audio_level: Function that returns current audio level (0.0 to 1.0)
+            get_level_history: Optional function returning the last N levels,
+                oldest first. When given, the waveform draws the recorder's
+                real history instead of sampling one level per frame.
         """
         self.get_audio_level = get_audio_level
+        self.get_level_history = get_level_history
         self.root: Optional[tk.Tk] = None
         self.window: Optional[tk.Toplevel] = None
         self.canvas: Optional[tk.Canvas] = None
         self.command_queue = queue.Queue()
         self.thread: Optional[threading.Thread] = None
         self.waveform_lines = []
-        self.history = [0.0] * 50  # Audio level history
+        self.history = np.zeros(50, dtype=np.float32)  # Audio level history
         self._start_gui_thread()
 
     def _start_gui_thread(self):
@@ -118,12 +126,7 @@ class PolishedWaveformIndicator:
             self.canvas.delete(line)
         self.waveform_lines = []
 
-        # Get current audio level
-        current_level = self.get_audio_level()
-
-        # Update history
-        self.history.pop(0)
-        self.history.append(current_level)
+        self._update_history()
 
         # Draw waveform
         width = 140
@@ -169,6 +172,15 @@ class PolishedWaveformIndicator:
         # Continue animation
         self.window.after(40, self._animate_waveform)
 
+    def _update_history(self):
+        """Refresh the level history for the next frame."""
+        if self.get_level_history is not None:
+            self.history[:] = self.get_level_history(len(self.history))
+        else:
+            # Shift in place and append the current level
+            self.history[:-1] = self.history[1:]
+            self.history[-1] = self.get_audio_level()
+
     def _destroy_waveform(self):
         """Destroy the waveform window."""
         if self.window:
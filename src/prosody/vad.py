@@ -0,0 +1,110 @@
+"""Voice activity detection for trimming silence before transcription."""
+
+import numpy as np
+from typing import Tuple
+
+
+class VoiceActivityDetector:
+    """Frame-based energy and zero-crossing voice activity detector.
+
+    A frame counts as speech when its energy clears the threshold and its
+    zero-crossing rate stays below ``max_zcr``, which rejects broadband hiss
+    that is loud but not voiced. Everything is computed over a strided
+    frame view of the recording, with no Python loop per frame.
+    """
+
+    def __init__(
+        self,
+        samplerate: int = 16000,
+        frame_ms: float = 30.0,
+        energy_threshold_db: float = -45.0,
+        noise_margin_db: float = 10.0,
+        max_zcr: float = 0.35,
+        min_speech_ms: float = 150.0,
+        padding_ms: float = 200.0,
+    ):
+        """Initialize the detector.
+
+        Args:
+            samplerate: Sample rate of the audio being analysed
+            frame_ms: Analysis frame length in milliseconds
+            energy_threshold_db: Absolute frame energy floor in dBFS
+            noise_margin_db: How far above the estimated noise floor speech must be
+            max_zcr: Highest zero-crossing rate (crossings per sample) counted as speech
+            min_speech_ms: Less speech than this in total means the recording is empty
+            padding_ms: Audio kept either side of the detected speech
+        """
+        self.samplerate = samplerate
+        self.frame_length = max(1, int(samplerate * frame_ms / 1000))
+        self.energy_threshold_db = energy_threshold_db
+        self.noise_margin_db = noise_margin_db
+        self.max_zcr = max_zcr
+        self.min_speech_frames = max(1, int(round(min_speech_ms / frame_ms)))
+        self.padding = int(samplerate * padding_ms / 1000)
+
+    def _frames(self, audio: np.ndarray) -> np.ndarray:
+        """Return a (num_frames, frame_length) view of the audio."""
+        num_frames = len(audio) // self.frame_length
+        return audio[: num_frames * self.frame_length].reshape(num_frames, self.frame_length)
+
+    def speech_frames(self, audio: np.ndarray) -> np.ndarray:
+        """Classify each frame of the audio as speech or non-speech.
+
+        Args:
+            audio: Mono float samples in the range -1.0 to 1.0, or int16 samples
+
+        Returns:
+            Boolean array with one entry per frame
+        """
+        audio = np.asarray(audio)
+        if audio.dtype.kind not in "fi":
+            audio = audio.astype(np.float32)
+        frames = self._frames(audio)
+        if len(frames) == 0:
+            return np.zeros(0, dtype=bool)
+
+        # Energy per frame in dBFS, without squaring into a temporary array.
+        # Integer audio is analysed as-is, accumulated in float64.
+        full_scale = 1.0 if audio.dtype.kind == "f" else float(-np.iinfo(audio.dtype).min)
+        power = np.einsum("ij,ij->i", frames, frames, dtype=np.float64)
+        power /= self.frame_length * full_scale ** 2
+        energy_db = 10.0 * np.log10(power + 1e-12)
+
+        # Adapt to the room: speech must stand out from the quietest frames
+        noise_floor_db = np.percentile(energy_db, 10)
+        threshold_db = max(self.energy_threshold_db, noise_floor_db + self.noise_margin_db)
+
+        signs = frames < 0
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / self.frame_length
+
+        return (energy_db > threshold_db) & (zcr < self.max_zcr)
+
+    def detect(self, audio: np.ndarray) -> Tuple[int, int]:
+        """Find the span of the audio that contains speech.
+
+        Args:
+            audio: Mono float samples in the range -1.0 to 1.0, or int16 samples
+
+        Returns:
+            (start, end) sample indices of the speech, or (0, 0) if there is none
+        """
+        speech = self.speech_frames(audio)
+        if np.count_nonzero(speech) < self.min_speech_frames:
+            return 0, 0
+
+        voiced = np.flatnonzero(speech)
+        start = max(0, voiced[0] * self.frame_length - self.padding)
+        end = min(len(audio), (voiced[-1] + 1) * self.frame_length + self.padding)
+        return int(start), int(end)
+
+    def trim(self, audio: np.ndarray) -> np.ndarray:
+        """Trim leading and trailing non-speech from the audio.
+
+        Args:
+            audio: Mono float samples in the range -1.0 to 1.0, or int16 samples
+
+        Returns:
+            A view of the speech portion, empty if no speech was found
+        """
+        start, end = self.detect(audio)
+        return audio[start:end]
@@ -0,0 +1,286 @@
+"""Out-of-process transcription with shared-memory audio handoff."""
+
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Callable, Optional
+
+# Check if running in development mode
+DEV_MODE = os.environ.get('PROSODY_DEV') == '1' or sys.argv[0].endswith('__main__.py')
+# Suppress output in tests
+if 'pytest' in sys.modules:
+    DEV_MODE = False
+
+
+def log(message: str, important: bool = False):
+    """Log a message, respecting dev/production mode."""
+    if DEV_MODE:
+        print(message)
+
+
+class WorkerCrashed(RuntimeError):
+    """The worker process exited while handling a request."""
+
+
+def _serve(conn, factory: Optional[Callable], options: dict):
+    """Worker process main loop: answer requests until told to stop.
+
+    Requests are small tuples; audio never goes through the pipe, only the
+    name, shape and dtype of the shared memory block that holds it.
+    """
+    # Ctrl+C goes to the whole process group; shutdown comes from the parent
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    if factory is None:
+        from .transcription import Transcriber as factory
+
+    transcriber = factory(load=False, **options)
+    attached = None
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            break  # Parent went away
+
+        command = request[0]
+        try:
+            if command == "load":
+                transcriber.load()
+                reply = (transcriber.load_seconds, transcriber.precision)
+            elif command == "transcribe":
+                _, name, shape, dtype, kwargs = request
+                if attached is None or attached.name != name:
+                    if attached is not None:
+                        attached.close()
+                    attached = shared_memory.SharedMemory(name=name)
+                audio = np.ndarray(shape, dtype=dtype, buffer=attached.buf)
+                text = transcriber.transcribe(audio, **kwargs)
+                reply = (text, getattr(transcriber, "last_decode_passes", None))
+                del audio  # Release the buffer export before the block can be closed
+            elif command == "stop":
+                conn.send(("ok", None))
+                break
+            else:
+                raise ValueError(f"Unknown worker command '{command}'")
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+        else:
+            conn.send(("ok", reply))
+
+    if attached is not None:
+        attached.close()
+
+
+class TranscriptionWorker:
+    """Runs a Transcriber in a long-lived child process.
+
+    Offers the same ``ready``/``load``/``unload``/``transcribe`` interface as
+    Transcriber, so it can stand in for one. Keeping torch out of the main
+    process keeps heavy inference off the GIL that the hotkey listener and
+    the Tk waveform need.
+
+    Audio is copied once into a shared memory block that is reused between
+    recordings and only grows, and the child reads it in place. If the child
+    dies mid-request it is restarted, the model is reloaded, and the request
+    is retried once.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "base.en",
+        load: bool = True,
+        precision: str = "fp32",
+        cache_dir: Optional[str] = None,
+        factory: Optional[Callable] = None,
+        scheduling=None,
+        decoding: str = "balanced",
+        short_window: bool = False,
+        warmup: bool = False,
+        model_cache: bool = False,
+    ):
+        """Initialize the worker.
+
+        Args:
+            model_name: Whisper model the child loads
+            load: Start the child and load the model now
+            precision: Inference precision, as for Transcriber
+            cache_dir: Cache directory, as for Transcriber
+            factory: Picklable callable building the child's transcriber
+                (default Transcriber)
+            scheduling: SchedulingPolicy for the child, applied before it
+                creates any inference threads
+            decoding: Decoding profile, as for Transcriber
+            short_window: Short-window encoding, as for Transcriber
+            warmup: Warm-up inference after loading, as for Transcriber
+            model_cache: Memory-mapped model cache, as for Transcriber
+        """
+        self.model_name = model_name
+        self.precision = precision
+        self.decoding = decoding
+        self.last_decode_passes: Optional[int] = None
+        self.load_seconds: Optional[float] = None
+        self.restarts = 0
+        self._options = {"model_name": model_name, "precision": precision, "cache_dir": cache_dir,
+                         "decoding": decoding, "short_window": short_window, "warmup": warmup,
+                         "model_cache": model_cache}
+        if scheduling is not None:
+            self._options["scheduling"] = scheduling
+        self._factory = factory
+        # Spawn, not fork: the parent has Tk, pynput and audio threads running
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        if load:
+            self.load()
+
+    @property
+    def ready(self) -> bool:
+        """Whether the child has the model loaded."""
+        return self._loaded
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Process id of the child, if it is running."""
+        return self._process.pid if self._process is not None else None
+
+    def _start(self) -> None:
+        """Start the child process. Call with the lock held."""
+        parent, child = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_serve, args=(child, self._factory, self._options), name="prosody-worker", daemon=True
+        )
+        self._process.start()
+        child.close()
+        self._conn = parent
+
+    def _stop(self) -> None:
+        """Stop the child process. Call with the lock held."""
+        if self._process is None:
+            return
+        try:
+            if self._process.is_alive():
+                self._conn.send(("stop",))
+                self._conn.poll(2.0)
+        except (OSError, EOFError):
+            pass
+        self._process.join(timeout=2.0)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._conn.close()
+        self._process = None
+        self._conn = None
+        self._loaded = False
+
+    def _call(self, request: tuple):
+        """Send one request and wait for its reply. Call with the lock held."""
+        if self._process is None:
+            self._start()
+        try:
+            self._conn.send(request)
+            while not self._conn.poll(0.1):
+                if not self._process.is_alive():
+                    raise EOFError
+            status, value = self._conn.recv()
+        except (EOFError, OSError):
+            code = self._process.exitcode
+            self._stop()
+            raise WorkerCrashed(f"Transcription worker exited (code {code})")
+        if status == "error":
+            raise RuntimeError(value)
+        return value
+
+    def _load(self) -> None:
+        """Load the model in the child. Call with the lock held."""
+        self.load_seconds, self.precision = self._call(("load",))
+        self._loaded = True
+
+    def load(self) -> None:
+        """Start the child if needed and load the model in it.
+
+        Raises:
+            RuntimeError: If the model cannot be loaded
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+
+    def unload(self) -> None:
+        """Stop the child, giving all of its memory back to the system."""
+        with self._lock:
+            self._stop()
+
+    def close(self) -> None:
+        """Stop the child and free the shared memory block."""
+        with self._lock:
+            self._stop()
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+                self._shm = None
+
+    def _share(self, audio_data: np.ndarray) -> np.ndarray:
+        """Copy audio into the shared block, growing it if needed. Call with the lock held."""
+        if self._shm is None or self._shm.size < audio_data.nbytes:
+            if self._shm is not None:
+                self._shm.close()
+                self._shm.unlink()
+            size = max(audio_data.nbytes, 16000 * 4 * 30)
+            if self._shm is not None:
+                size = max(size, 2 * self._shm.size)
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+        shared = np.ndarray(audio_data.shape, dtype=audio_data.dtype, buffer=self._shm.buf)
+        shared[...] = audio_data
+        return shared
+
+    def transcribe(
+        self,
+        audio_data: np.ndarray,
+        language: str = "en",
+        normalized: bool = False,
+        prompt: Optional[str] = None,
+        mel=None,
+    ) -> str:
+        """Transcribe audio in the child process.
+
+        Takes the same arguments as Transcriber.transcribe, except that
+        ``mel`` is ignored: the child computes features from the audio itself.
+
+        Returns:
+            Transcribed text string, empty if transcription failed
+        """
+        if not self._loaded:
+            raise RuntimeError("Model not loaded")
+
+        if len(audio_data) == 0:
+            return ""
+
+        audio_data = np.ascontiguousarray(audio_data)
+        kwargs = {"language": language, "normalized": normalized, "prompt": prompt}
+        with self._lock:
+            shared = self._share(audio_data)
+            request = ("transcribe", self._shm.name, shared.shape, shared.dtype.str, kwargs)
+            del shared
+            for attempt in range(2):
+                try:
+                    if not self._loaded:
+                        self._load()
+                    text, self.last_decode_passes = self._call(request)
+                    return text
+                except WorkerCrashed as e:
+                    log(f"{e}, restarting", important=True)
+                    self.restarts += 1
+                    if attempt:
+                        return ""
+                except Exception as e:
+                    log(f"Transcription error: {e}", important=True)
+                    return ""
+        return ""
@@ -4,7 +4,9 @@ import unittest
 import numpy as np
 import time
 from unittest.mock import Mock, patch, MagicMock
-from src.prosody.audio import AudioRecorder
+from src.prosody.audio import AudioRecorder, CaptureBuffer, LevelEnvelope
+from src.prosody.preprocess import AudioPreprocessor
+from src.prosody.sources import ArraySource
 
 
 class TestAudioRecorder(unittest.TestCase):
@@ -12,7 +14,7 @@ class TestAudioRecorder(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures."""
-        self.recorder = AudioRecorder()
+        self.recorder = AudioRecorder(capture_rate=16000)
 
     def test_initialization(self):
         """Test AudioRecorder initialization."""
@@ -21,7 +23,7 @@ class TestAudioRecorder(unittest.TestCase):
         )  # Stream not created until recording starts
         self.assertEqual(self.recorder.samplerate, 16000)
         self.assertEqual(self.recorder.channels, 1)
-        self.assertIsNotNone(self.recorder.audio_queue)
+        self.assertIsNone(self.recorder._buffer)
         self.assertFalse(self.recorder.recording)
         self.assertEqual(self.recorder.current_level, 0.0)
 
@@ -47,12 +49,13 @@ class TestAudioRecorder(unittest.TestCase):
         # Call the callback
         self.recorder._audio_callback(test_audio, None, None, None)
 
-        # Check that audio was queued
-        self.assertFalse(self.recorder.audio_queue.empty())
+        # Check that audio was written to the capture buffer
+        self.assertEqual(len(self.recorder._buffer), 1024)
 
         # Check that level was calculated
         expected_level = float(np.sqrt(np.mean(test_audio**2)))
-        self.assertEqual(self.recorder.current_level, expected_level)
+        self.assertAlmostEqual(self.recorder.current_level, expected_level, places=6)
+        self.assertEqual(self.recorder.envelope.count, 1)
 
     @patch("sounddevice.InputStream")
     def test_start_stop_recording(self, mock_stream_class):
@@ -72,27 +75,39 @@ class TestAudioRecorder(unittest.TestCase):
         mock_stream.close.assert_called_once()
         self.assertIsInstance(audio_data, np.ndarray)
 
-    def test_stop_recording_with_data(self):
-        """Test stopping recording with queued audio data."""
-        # Add some test audio to queue
+    @patch("sounddevice.InputStream")
+    def test_stop_recording_with_data(self, mock_stream_class):
+        """Test stopping recording with buffered audio data."""
         test_chunks = [
             np.random.randn(1024, 1).astype(np.float32) * 0.1,
             np.random.randn(1024, 1).astype(np.float32) * 0.1,
             np.random.randn(1024, 1).astype(np.float32) * 0.1,
         ]
 
-        self.recorder.recording = True
+        self.recorder.start_recording()
         for chunk in test_chunks:
-            self.recorder.audio_queue.put(chunk)
+            self.recorder._audio_callback(chunk, len(chunk), None, None)
 
         # Stop recording and get audio data
-        with patch("sounddevice.InputStream"):
-            audio_data = self.recorder.stop_recording()
+        audio_data = self.recorder.stop_recording()
 
         # Verify
         expected_length = sum(len(chunk) for chunk in test_chunks)
-        self.assertEqual(len(audio_data), expected_length)
-        self.assertTrue(self.recorder.audio_queue.empty())
+        self.assertEqual(audio_data.shape, (expected_length,))
+        np.testing.assert_array_equal(audio_data, np.concatenate(test_chunks).ravel())
+        self.assertIsNone(self.recorder._buffer)
+
+    @patch("sounddevice.InputStream")
+    def test_stop_recording_returns_buffer_view(self, mock_stream_class):
+        """Test that stop_recording hands back the buffer without copying."""
+        recorder = AudioRecorder(capture_rate=16000, buffer_seconds=1.0)
+        recorder.start_recording()
+        buffer = recorder._buffer
+        recorder._audio_callback(np.ones((512, 1), dtype=np.float32), 512, None, None)
+
+        audio_data = recorder.stop_recording()
+
+        self.assertTrue(np.shares_memory(audio_data, buffer._data))
 
     def test_get_current_level(self):
         """Test getting current audio level."""
@@ -120,8 +135,199 @@ class TestAudioRecorder(unittest.TestCase):
         # Call callback
         self.recorder._audio_callback(test_audio, None, None, None)
 
-        # Check that nothing was queued
-        self.assertTrue(self.recorder.audio_queue.empty())
+        # Check that nothing was buffered
+        self.assertIsNone(self.recorder._buffer)
+
+    @patch("sounddevice.InputStream")
+    def test_get_level_history(self, mock_stream_class):
+        """Test that level history is scaled and ordered oldest first."""
+        self.recorder.start_recording()
+        for level in (0.01, 0.05, 0.2):
+            block = np.full((256, 1), level, dtype=np.float32)
+            self.recorder._audio_callback(block, 256, None, None)
+
+        history = self.recorder.get_level_history(5)
+
+        np.testing.assert_allclose(history, [0.0, 0.0, 0.1, 0.5, 1.0], rtol=1e-5)
+
+    @patch("sounddevice.InputStream")
+    def test_stream_settings(self, mock_stream_class):
+        """Test that blocksize and latency are passed to the stream."""
+        recorder = AudioRecorder(capture_rate=16000, blocksize=256, latency="low")
+        recorder.start_recording()
+
+        kwargs = mock_stream_class.call_args[1]
+        self.assertEqual(kwargs["blocksize"], 256)
+        self.assertEqual(kwargs["latency"], "low")
+
+    def test_overflow_counters(self):
+        """Test that callback overflow and underflow flags are counted."""
+        status = Mock(input_overflow=True, input_underflow=False)
+        block = np.zeros((16, 1), dtype=np.float32)
+
+        self.recorder._audio_callback(block, 16, None, status)
+        self.recorder._audio_callback(block, 16, None, status)
+        status.input_underflow = True
+        self.recorder._audio_callback(block, 16, None, status)
+
+        self.assertEqual(self.recorder.overflow_count, 3)
+        self.assertEqual(self.recorder.underflow_count, 1)
+
+    @patch("sounddevice.InputStream")
+    def test_warm_mode_keeps_stream_open(self, mock_stream_class):
+        """Test that warm mode opens the stream once and reuses it."""
+        mock_stream = Mock()
+        mock_stream_class.return_value = mock_stream
+        recorder = AudioRecorder(warm=True)
+
+        recorder.start_recording()
+        recorder.stop_recording()
+        recorder.start_recording()
+        recorder.stop_recording()
+
+        mock_stream_class.assert_called_once()
+        mock_stream.stop.assert_not_called()
+        self.assertIsNotNone(recorder.stream)
+
+        recorder.close()
+        mock_stream.close.assert_called_once()
+        self.assertIsNone(recorder.stream)
+
+    @patch("sounddevice.InputStream")
+    def test_warm_mode_prepends_preroll(self, mock_stream_class):
+        """Test that audio captured before start is included up to the pre-roll."""
+        recorder = AudioRecorder(capture_rate=16000, warm=True, preroll_seconds=0.1)
+        recorder.open()
+
+        # 0.2s of audio arrives before recording starts; only 0.1s is kept
+        before = np.arange(3200, dtype=np.float32).reshape(-1, 1)
+        recorder._audio_callback(before[:1600], 1600, None, None)
+        recorder._audio_callback(before[1600:], 1600, None, None)
+
+        recorder.start_recording()
+        during = np.full((800, 1), -1.0, dtype=np.float32)
+        recorder._audio_callback(during, 800, None, None)
+        audio_data = recorder.stop_recording()
+
+        np.testing.assert_array_equal(audio_data[:1600], before[1600:].ravel())
+        np.testing.assert_array_equal(audio_data[1600:], during.ravel())
+
+        # The pre-roll starts over for the next recording
+        recorder.start_recording()
+        self.assertEqual(len(recorder._buffer), 0)
+
+    @patch("sounddevice.InputStream")
+    @patch("sounddevice.query_devices")
+    def test_captures_at_native_rate(self, mock_query, mock_stream_class):
+        """Test that the device's native rate is used and resampled to 16 kHz."""
+        mock_query.side_effect = lambda device=None, kind=None: (
+            {"default_samplerate": 48000.0} if kind else []
+        )
+        recorder = AudioRecorder()
+        recorder.start_recording()
+
+        self.assertEqual(mock_stream_class.call_args[1]["samplerate"], 48000)
+        recorder._audio_callback(np.zeros((4800, 1), dtype=np.float32), 4800, None, None)
+        audio_data = recorder.stop_recording()
+
+        self.assertEqual(audio_data.shape, (1600,))
+
+    @patch("sounddevice.InputStream")
+    @patch("sounddevice.query_devices")
+    def test_native_rate_query_failure(self, mock_query, mock_stream_class):
+        """Test falling back to the target rate when the device can't be queried."""
+        mock_query.side_effect = Exception("no device")
+        recorder = AudioRecorder()
+        recorder.start_recording()
+
+        self.assertEqual(mock_stream_class.call_args[1]["samplerate"], 16000)
+        self.assertIsNone(recorder._resampler)
+
+    @patch("sounddevice.InputStream")
+    @patch("sounddevice.query_devices")
+    def test_falls_back_to_next_device(self, mock_query, mock_stream_class):
+        """Test that a device that fails to open is skipped, not fatal."""
+        mock_query.return_value = [
+            {"name": "Headset", "max_input_channels": 1},
+            {"name": "Built-in Mic", "max_input_channels": 2},
+        ]
+        good_stream = Mock()
+        mock_stream_class.side_effect = [Exception("device unavailable"), good_stream]
+        recorder = AudioRecorder(capture_rate=16000, device="headset")
+
+        recorder.start_recording()
+
+        self.assertTrue(recorder.recording)
+        self.assertIs(recorder.stream, good_stream)
+        tried = [call[1]["device"] for call in mock_stream_class.call_args_list]
+        self.assertEqual(tried, [0, None])
+        self.assertIsNone(recorder.device_index)
+
+    @patch("sounddevice.InputStream")
+    @patch("sounddevice.query_devices")
+    def test_no_device_opens(self, mock_query, mock_stream_class):
+        """Test that a RuntimeError is raised once every device has failed."""
+        mock_query.return_value = []
+        mock_stream_class.side_effect = Exception("no device")
+
+        with self.assertRaises(RuntimeError) as context:
+            self.recorder.start_recording()
+
+        self.assertIn("Failed to start audio recording", str(context.exception))
+        self.assertFalse(self.recorder.recording)
+
+    @patch("sounddevice.InputStream")
+    def test_int16_capture(self, mock_stream_class):
+        """Test that int16 mode keeps the whole recording as int16."""
+        recorder = AudioRecorder(capture_rate=16000, dtype="int16")
+        recorder.start_recording()
+        self.assertEqual(mock_stream_class.call_args[1]["dtype"], "int16")
+
+        block = np.full((1024, 1), 16384, dtype=np.int16)
+        recorder._audio_callback(block, 1024, None, None)
+        audio_data = recorder.stop_recording()
+
+        self.assertEqual(audio_data.dtype, np.int16)
+        self.assertEqual(audio_data.nbytes, 2048)
+        self.assertAlmostEqual(recorder.envelope.history(1)[0], 0.5)
+
+    @patch("sounddevice.InputStream")
+    @patch("sounddevice.query_devices")
+    def test_int16_capture_with_resampling(self, mock_query, mock_stream_class):
+        """Test that resampled int16 audio is clipped back into range."""
+        mock_query.side_effect = lambda device=None, kind=None: (
+            {"default_samplerate": 48000.0} if kind else []
+        )
+        recorder = AudioRecorder(dtype="int16")
+        recorder.start_recording()
+
+        # A full-scale square wave makes the filter overshoot
+        block = np.tile(np.repeat(np.array([32767, -32768], dtype=np.int16), 240), 10)
+        recorder._audio_callback(block.reshape(-1, 1), len(block), None, None)
+        audio_data = recorder.stop_recording()
+
+        self.assertEqual(audio_data.dtype, np.int16)
+        self.assertEqual(len(audio_data), 1600)
+        self.assertGreater(audio_data.max(), 30000)
+
+    def test_int16_resampled_levels(self):
+        """Test that resampled int16 audio is metered relative to int16 full scale."""
+        # A -40 dBFS tone at a typical microphone rate
+        tone = 0.01 * np.sin(2 * np.pi * 440 * np.arange(48000) / 48000)
+        source = ArraySource((tone * 32767).astype(np.int16), samplerate=48000, realtime=False)
+        recorder = AudioRecorder(dtype="int16", source=source)
+        recorder.start_recording()
+        self.assertTrue(source.wait(timeout=2.0))
+        audio_data = recorder.stop_recording()
+
+        self.assertEqual(audio_data.dtype, np.int16)
+        self.assertAlmostEqual(recorder.envelope.history(1)[0], 0.01 / np.sqrt(2), delta=0.001)
+        self.assertLess(recorder.get_level_history(10).max(), 0.1)
+
+    def test_unsupported_dtype(self):
+        """Test that unsupported sample formats are rejected."""
+        with self.assertRaises(ValueError):
+            AudioRecorder(dtype="int32")
 
     @patch("sounddevice.query_devices")
     def test_get_available_devices(self, mock_query):
@@ -139,6 +345,10 @@ class TestAudioRecorder(unittest.TestCase):
         self.assertEqual(devices[0]["name"], "Device 1")
         self.assertEqual(devices[1]["name"], "Device 3")
 
+        # The enumeration is cached
+        self.recorder.get_available_devices()
+        mock_query.assert_called_once()
+
     def test_cleanup(self):
         """Test cleanup on deletion."""
         # Create a recorder
@@ -155,36 +365,266 @@ class TestAudioRecorder(unittest.TestCase):
         mock_stream.stop.assert_called_once()
         mock_stream.close.assert_called_once()
 
-    def test_thread_safety(self):
-        """Test that audio queue is thread-safe."""
-        import threading
+    def test_recordings_do_not_share_buffers(self):
+        """Test that a stopped recording is not overwritten by the next one."""
+        with patch("sounddevice.InputStream"):
+            self.recorder.start_recording()
+            self.recorder._audio_callback(np.ones((256, 1), dtype=np.float32), 256, None, None)
+            first = self.recorder.stop_recording()
+
+            self.recorder.start_recording()
+            self.recorder._audio_callback(np.zeros((256, 1), dtype=np.float32), 256, None, None)
+            self.recorder.stop_recording()
 
-        def producer():
-            for i in range(100):
-                self.recorder.audio_queue.put(np.array([i]))
+        np.testing.assert_array_equal(first, np.ones(256, dtype=np.float32))
 
-        def consumer():
-            items = []
-            while len(items) < 100:
-                try:
-                    item = self.recorder.audio_queue.get(timeout=0.1)
-                    items.append(item[0])
-                except:
-                    pass
-            return items
+    def test_recorded_since(self):
+        """Test reading the live recording without stopping it."""
+        with patch("sounddevice.InputStream"):
+            self.recorder.start_recording()
+            block = np.arange(100, dtype=np.float32).reshape(-1, 1)
+            self.recorder._audio_callback(block, 100, None, None)
 
-        # Start producer thread
-        producer_thread = threading.Thread(target=producer)
-        producer_thread.start()
+            audio_data, end = self.recorder.recorded_since(40)
+            self.recorder._audio_callback(block, 100, None, None)
 
-        # Consume in main thread
-        items = consumer()
+            self.assertEqual(end, 100)
+            np.testing.assert_array_equal(audio_data, np.arange(40, 100))
+            self.assertEqual(self.recorder.recorded_since(100)[1], 200)
+            self.recorder.stop_recording()
 
-        producer_thread.join()
+        self.assertEqual(len(self.recorder.recorded_since(0)[0]), 0)
 
-        # Verify all items were received
-        self.assertEqual(len(items), 100)
-        self.assertEqual(sorted(items), list(range(100)))
+    def test_preprocessor_applied_in_callback(self):
+        """Test that blocks are preprocessed before they are buffered."""
+        recorder = AudioRecorder(capture_rate=16000, preprocessor=AudioPreprocessor(highpass_hz=None, agc=False))
+        with patch("sounddevice.InputStream"):
+            recorder.start_recording()
+            for _ in range(200):
+                recorder._audio_callback(np.full((160, 1), 0.3, dtype=np.float32), 160, None, None)
+            audio_data = recorder.stop_recording()
+
+        # The DC tracker has pulled the constant offset most of the way out
+        self.assertLess(abs(audio_data[-160:]).max(), 0.3 * 0.3)
+
+    def test_preprocessor_int16_output(self):
+        """Test that preprocessed audio is stored at int16 full scale."""
+        preprocessor = AudioPreprocessor(dc_removal=False, highpass_hz=None, agc=False)
+        recorder = AudioRecorder(capture_rate=16000, dtype="int16", preprocessor=preprocessor)
+        with patch("sounddevice.InputStream"):
+            recorder.start_recording()
+            recorder._audio_callback(np.array([[16384], [-16384]], dtype=np.int16), 2, None, None)
+            audio_data = recorder.stop_recording()
+
+        self.assertEqual(audio_data.dtype, np.int16)
+        np.testing.assert_allclose(audio_data, [16383, -16383], atol=1)
+
+    def test_preprocessor_int16_with_resampling(self):
+        """Test that resampled int16 audio reaches the preprocessor at float scale."""
+        preprocessor = AudioPreprocessor(dc_removal=False, highpass_hz=None, agc=False)
+        recorder = AudioRecorder(capture_rate=48000, dtype="int16", preprocessor=preprocessor)
+        tone = (3400 * np.sin(2 * np.pi * 440 * np.arange(48000) / 48000)).astype(np.int16)
+        with patch("sounddevice.InputStream"):
+            recorder.start_recording()
+            recorder._audio_callback(tone.reshape(-1, 1), len(tone), None, None)
+            audio_data = recorder.stop_recording()
+
+        self.assertEqual(audio_data.dtype, np.int16)
+        self.assertEqual(len(audio_data), 16000)
+        # Past the filter's start-up, the tone keeps its level instead of clipping
+        steady = np.abs(audio_data[1000:].astype(np.int32))
+        self.assertAlmostEqual(steady.max(), 3400, delta=100)
+        self.assertLess(np.mean(steady > 32000), 0.01)
+
+    def test_preprocessor_int16_levels(self):
+        """Test that preprocessed int16 audio is metered relative to int16 full scale."""
+        preprocessor = AudioPreprocessor(dc_removal=False, highpass_hz=None, agc=False)
+        # A -40 dBFS tone at the native rate
+        tone = 0.01 * np.sin(2 * np.pi * 440 * np.arange(16000) / 16000)
+        source = ArraySource((tone * 32767).astype(np.int16), samplerate=16000, realtime=False)
+        recorder = AudioRecorder(dtype="int16", source=source, preprocessor=preprocessor)
+        recorder.start_recording()
+        self.assertTrue(source.wait(timeout=2.0))
+        audio_data = recorder.stop_recording()
+
+        self.assertEqual(audio_data.dtype, np.int16)
+        self.assertAlmostEqual(recorder.envelope.history(1)[0], 0.01 / np.sqrt(2), delta=0.001)
+        self.assertLess(recorder.get_level_history(10).max(), 0.1)
+
+    def test_preprocessor_requires_mono(self):
+        """Test that preprocessing is refused for multi-channel recording."""
+        with self.assertRaises(ValueError):
+            AudioRecorder(channels=2, preprocessor=AudioPreprocessor())
+
+
+class TestCaptureBufferSpill(unittest.TestCase):
+    """Test cases for spilling CaptureBuffer to disk."""
+
+    def test_spills_past_threshold(self):
+        """Test that growing past the RAM threshold moves data to a memmap."""
+        buffer = CaptureBuffer(initial_frames=100, spill_bytes=1000)
+        data = np.random.randn(1000, 1).astype(np.float32)
+
+        for start in range(0, 1000, 64):
+            buffer.write(data[start:start + 64])
+        buffer.drain()
+
+        self.assertTrue(buffer.spilled)
+        self.assertEqual(len(buffer), 1000)
+        self.assertEqual(buffer._data.nbytes, 0)
+
+        view = buffer.view()
+        self.assertIsInstance(view, np.memmap)
+        buffer.close()
+        self.assertTrue(buffer._file.closed)
+        np.testing.assert_array_equal(view, data)
+
+    def test_write_only_stages(self):
+        """Test that writes leave growing and spilling to drain."""
+        buffer = CaptureBuffer(initial_frames=100, spill_bytes=1000, staging_frames=500)
+        self.addCleanup(buffer.close)
+        data = np.random.randn(400, 1).astype(np.float32)
+        buffer.write(data)
+
+        self.assertFalse(buffer.spilled)
+        self.assertEqual(buffer.capacity, 100)
+        self.assertEqual(len(buffer), 400)
+
+        buffer.drain()
+        self.assertTrue(buffer.spilled)
+        np.testing.assert_array_equal(buffer.view(), data)
+
+    def test_staging_overrun_drains_inline(self):
+        """Test that no audio is lost when the writer falls behind."""
+        buffer = CaptureBuffer(initial_frames=100, staging_frames=64)
+        data = np.arange(1000, dtype=np.float32).reshape(-1, 1)
+        for start, size in ((0, 40), (40, 40), (80, 200), (280, 720)):
+            buffer.write(data[start:start + size])
+
+        np.testing.assert_array_equal(buffer.view(), data)
+        self.assertEqual(buffer.read_since(990)[1], 1000)
+        np.testing.assert_array_equal(buffer.read_since(990)[0], data[990:])
+
+    def test_no_spill_below_threshold(self):
+        """Test that small recordings stay in RAM."""
+        buffer = CaptureBuffer(initial_frames=100, spill_bytes=10000)
+        buffer.write(np.ones((300, 1), dtype=np.float32))
+
+        self.assertFalse(buffer.spilled)
+        self.assertNotIsInstance(buffer.view(), np.memmap)
+
+    @patch("sounddevice.InputStream")
+    def test_recorder_writer_thread_spills(self, mock_stream_class):
+        """Test that the recorder's writer thread, not the callback, spills the recording."""
+        recorder = AudioRecorder(capture_rate=16000, buffer_seconds=0.01, spill_threshold_mb=0.001)
+        recorder.start_recording()
+        buffer = recorder._buffer
+        with patch.object(buffer, "_spill", wraps=buffer._spill) as spill:
+            recorder._audio_callback(np.ones((1024, 1), dtype=np.float32), 1024, None, None)
+            spill.assert_not_called()
+            for _ in range(200):
+                if buffer.spilled:
+                    break
+                time.sleep(0.01)
+        audio_data = recorder.stop_recording()
+
+        spill.assert_called_once()
+        self.assertIsInstance(audio_data, np.memmap)
+        self.assertEqual(len(audio_data), 1024)
+
+    @patch("sounddevice.InputStream")
+    def test_recorder_returns_memmap(self, mock_stream_class):
+        """Test that a spilled recording comes back memory-mapped and flat."""
+        recorder = AudioRecorder(capture_rate=16000, buffer_seconds=0.01, spill_threshold_mb=0.001)
+        recorder.start_recording()
+        buffer = recorder._buffer
+        block = np.random.randn(512, 1).astype(np.float32)
+        for _ in range(4):
+            recorder._audio_callback(block, 512, None, None)
+
+        audio_data = recorder.stop_recording()
+
+        self.assertTrue(buffer._file.closed)
+        self.assertIsInstance(audio_data, np.memmap)
+        self.assertEqual(audio_data.shape, (2048,))
+        np.testing.assert_array_equal(audio_data[-512:], block.ravel())
+
+
+class TestLevelEnvelope(unittest.TestCase):
+    """Test cases for LevelEnvelope class."""
+
+    def test_rms_and_peak(self):
+        """Test per-block RMS and peak measurements."""
+        envelope = LevelEnvelope(size=4)
+        block = np.array([[0.5], [-0.5], [0.5], [-1.0]], dtype=np.float32)
+
+        rms = envelope.push(block)
+
+        self.assertAlmostEqual(rms, float(np.sqrt(np.mean(block**2))), places=6)
+        self.assertEqual(envelope.history(1, peak=True)[0], 1.0)
+
+    def test_history_wraps(self):
+        """Test that history keeps the latest entries in order after wrapping."""
+        envelope = LevelEnvelope(size=4)
+        for level in range(1, 7):
+            envelope.push(np.full(8, level / 10, dtype=np.float32))
+
+        np.testing.assert_allclose(envelope.history(4), [0.3, 0.4, 0.5, 0.6], rtol=1e-6)
+        np.testing.assert_allclose(envelope.history(10), [0.3, 0.4, 0.5, 0.6], rtol=1e-6)
+
+    def test_int16_levels_relative_to_full_scale(self):
+        """Test that int16 blocks are metered without overflowing."""
+        envelope = LevelEnvelope(size=4)
+        block = np.array([32767, -32768, 32767, -32768], dtype=np.int16)
+
+        rms = envelope.push(block)
+
+        self.assertAlmostEqual(rms, 1.0, places=4)
+        self.assertAlmostEqual(envelope.history(1, peak=True)[0], 1.0, places=4)
+
+    def test_reset(self):
+        """Test that reset clears the history."""
+        envelope = LevelEnvelope(size=4)
+        envelope.push(np.ones(8, dtype=np.float32))
+        envelope.reset()
+
+        self.assertEqual(envelope.count, 0)
+        np.testing.assert_array_equal(envelope.history(4), np.zeros(4))
+
+
+class TestCaptureBuffer(unittest.TestCase):
+    """Test cases for CaptureBuffer class."""
+
+    def test_growable_buffer(self):
+        """Test that the buffer grows by doubling and keeps all frames."""
+        buffer = CaptureBuffer(initial_frames=100)
+        blocks = [np.full((60, 1), i, dtype=np.float32) for i in range(5)]
+        for block in blocks:
+            buffer.write(block)
+        buffer.drain()
+
+        self.assertEqual(len(buffer), 300)
+        self.assertEqual(buffer.capacity, 400)
+        np.testing.assert_array_equal(buffer.view(), np.concatenate(blocks))
+
+    def test_ring_buffer_keeps_latest_frames(self):
+        """Test that a fixed-size buffer keeps only the most recent frames."""
+        buffer = CaptureBuffer(max_frames=100)
+        data = np.arange(250, dtype=np.float32).reshape(-1, 1)
+        for start in range(0, 250, 30):
+            buffer.write(data[start:start + 30])
+
+        self.assertEqual(len(buffer), 100)
+        self.assertEqual(buffer.capacity, 100)
+        np.testing.assert_array_equal(buffer.view(), data[150:])
+
+    def test_ring_buffer_block_larger_than_capacity(self):
+        """Test writing a single block that overflows the ring."""
+        buffer = CaptureBuffer(max_frames=10)
+        data = np.arange(25, dtype=np.float32).reshape(-1, 1)
+        buffer.write(data)
+
+        np.testing.assert_array_equal(buffer.view(), data[15:])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""Tests for the checkpoints module."""
+
+import base64
+import dataclasses
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import torch
+import whisper
+from unittest.mock import patch
+from src.prosody import checkpoints
+from src.prosody.checkpoints import VerifiedModels, load_model
+from whisper.model import ModelDimensions, Whisper
+
+
+class TestLoadModel(unittest.TestCase):
+    """Test cases for loading checkpoints through the verified-model manifest."""
+
+    def setUp(self):
+        """Write a small checkpoint where Whisper would download it."""
+        self.temp_dir = tempfile.mkdtemp()
+        model = Whisper(
+            ModelDimensions(
+                n_mels=80, n_audio_ctx=1500, n_audio_state=32, n_audio_head=2, n_audio_layer=1,
+                n_vocab=51864, n_text_ctx=448, n_text_state=32, n_text_head=2, n_text_layer=1,
+            )
+        )
+        # Whisper leaves this uninitialized (torch.empty) until a checkpoint is loaded
+        torch.nn.init.normal_(model.decoder.positional_embedding, std=0.01)
+        self.path = os.path.join(self.temp_dir, "whisper", "tiny-test.pt")
+        os.makedirs(os.path.dirname(self.path))
+        torch.save({"dims": dataclasses.asdict(model.dims), "model_state_dict": model.state_dict()}, self.path)
+        with open(self.path, "rb") as f:
+            sha256 = hashlib.sha256(f.read()).hexdigest()
+        heads = base64.b85encode(gzip.compress(np.array([False, True]).tobytes()))
+
+        self.manifest = VerifiedModels(os.path.join(self.temp_dir, "prosody", "verified.json"))
+        self.patches = [
+            patch.dict(os.environ, {"XDG_CACHE_HOME": self.temp_dir}),
+            patch.dict(whisper._MODELS, {"tiny-test": f"https://example.com/{sha256}/tiny-test.pt"}),
+            patch.dict(whisper._ALIGNMENT_HEADS, {"tiny-test": heads}),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        for p in reversed(self.patches):
+            p.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def test_hashed_once(self):
+        """Test that a verified file is loaded without hashing it again."""
+        with patch.object(checkpoints, "file_sha256", wraps=checkpoints.file_sha256) as spy:
+            first = load_model("tiny-test", self.manifest)
+            second = load_model("tiny-test", self.manifest)
+
+        spy.assert_called_once_with(self.path)
+        self.assertTrue(self.manifest.is_verified(self.path, checkpoints.expected_sha256("tiny-test")))
+        for name, tensor in first.state_dict().items():
+            torch.testing.assert_close(second.state_dict()[name], tensor, rtol=0, atol=0)
+        self.assertEqual(second.alignment_heads.to_dense().tolist(), [[False, True]])
+
+    def test_changed_file_verified_again(self):
+        """Test that a new modification time sends the file back through hashing."""
+        load_model("tiny-test", self.manifest)
+        os.utime(self.path, ns=(0, 0))
+
+        with patch.object(checkpoints, "file_sha256", wraps=checkpoints.file_sha256) as spy:
+            load_model("tiny-test", self.manifest)
+
+        spy.assert_called_once_with(self.path)
+
+    @patch("whisper.load_model")
+    def test_corrupt_file_goes_through_whisper(self, mock_load_model):
+        """Test that a file failing its checksum is left to Whisper to download again."""
+        with open(self.path, "ab") as f:
+            f.write(b"junk")
+
+        model = load_model("tiny-test", self.manifest, device="cpu")
+
+        mock_load_model.assert_called_once_with("tiny-test", device="cpu")
+        self.assertIs(model, mock_load_model.return_value)
+
+    @patch("whisper.load_model")
+    def test_other_names_passed_through(self, mock_load_model):
+        """Test that checkpoint paths and unknown names are loaded by Whisper as given."""
+        load_model("/models/custom.pt", self.manifest)
+
+        mock_load_model.assert_called_once_with("/models/custom.pt")
+        self.assertFalse(os.path.exists(self.manifest.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""Tests for the devices module."""
+
+import unittest
+from unittest.mock import Mock, patch
+from src.prosody import devices
+from src.prosody.devices import DeviceRegistry, hardware_signature
+
+
+DEVICES = [
+    {"name": "HDA Intel PCH: ALC3246 Analog", "max_input_channels": 2, "default_samplerate": 48000.0},
+    {"name": "HDMI Output", "max_input_channels": 0, "default_samplerate": 48000.0},
+    {"name": "Jabra Link 380: USB Audio", "max_input_channels": 1, "default_samplerate": 16000.0},
+]
+
+
+@patch("sounddevice.query_devices", return_value=DEVICES)
+class TestDeviceRegistry(unittest.TestCase):
+    """Test cases for DeviceRegistry class."""
+
+    def test_enumeration_is_cached(self, mock_query):
+        """Test that devices are queried once and reused."""
+        registry = DeviceRegistry()
+
+        first = registry.devices()
+        second = registry.devices()
+
+        self.assertIs(first, second)
+        self.assertEqual([d["index"] for d in first], [0, 2])
+        self.assertEqual(first[1]["default_samplerate"], 16000.0)
+        mock_query.assert_called_once()
+
+    def test_find_by_partial_name(self, mock_query):
+        """Test that devices can be found by a case-insensitive name fragment."""
+        registry = DeviceRegistry()
+
+        self.assertEqual(registry.find("jabra")["index"], 2)
+        self.assertIsNone(registry.find("webcam"))
+
+    @patch("sounddevice.default")
+    def test_candidates_order(self, mock_default, mock_query):
+        """Test that the pinned device comes first, then the default."""
+        mock_default.device = [0, 1]
+        registry = DeviceRegistry(preferred="Jabra")
+
+        self.assertEqual(registry.candidates(), [2, None])
+
+    @patch("sounddevice.default")
+    def test_candidates_without_pinned_device(self, mock_default, mock_query):
+        """Test that a missing pinned device falls back to the default."""
+        mock_default.device = [-1, -1]
+        registry = DeviceRegistry(preferred="Webcam")
+
+        self.assertEqual(registry.candidates(), [None, 0, 2])
+
+    @patch("src.prosody.devices.hardware_signature")
+    def test_hotplug_marks_stale_and_notifies(self, mock_signature, mock_query):
+        """Test that a hardware change marks the cache stale and calls back."""
+        mock_signature.return_value = "card0"
+        registry = DeviceRegistry()
+        registry.on_change = Mock()
+        registry.devices()
+
+        self.assertFalse(registry.check())
+        mock_signature.return_value = "card0\ncard1"
+        self.assertTrue(registry.check())
+
+        self.assertTrue(registry.stale)
+        registry.on_change.assert_called_once()
+
+        # A refresh that may reinitialize PortAudio re-enumerates
+        with patch("sounddevice._terminate", create=True) as mock_terminate, \
+                patch("sounddevice._initialize", create=True) as mock_initialize:
+            registry.devices(reinitialize=True)
+            mock_terminate.assert_called_once()
+            mock_initialize.assert_called_once()
+        self.assertFalse(registry.stale)
+        self.assertEqual(mock_query.call_count, 2)
+
+    def test_stale_cache_kept_without_reinitialize(self, mock_query):
+        """Test that a stale cache is not refreshed while a stream may be open."""
+        registry = DeviceRegistry()
+        registry.devices()
+        registry.stale = True
+
+        registry.devices()
+        mock_query.assert_called_once()
+
+    def test_start_stop_monitor(self, mock_query):
+        """Test that the monitor thread starts and stops."""
+        registry = DeviceRegistry(poll_interval=0.01)
+        registry.start()
+        self.assertTrue(registry._thread.is_alive())
+
+        registry.stop()
+        self.assertIsNone(registry._thread)
+
+
+class TestHardwareSignature(unittest.TestCase):
+    """Test cases for the hardware fingerprint."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        devices._pactl_available = True
+
+    @patch("subprocess.run")
+    def test_bluetooth_source_changes_signature(self, mock_run):
+        """Test that a source appearing on the sound server changes the signature."""
+        builtin = "52\talsa_input.pci-0000_00_1f.3.analog-stereo\tPipeWire\ts32le 2ch 48000Hz\tSUSPENDED\n"
+        headset = "77\tbluez_input.AA_BB_CC_DD_EE_FF.0\tPipeWire\ts16le 1ch 16000Hz\tRUNNING\n"
+        mock_run.return_value = Mock(stdout=builtin)
+        before = hardware_signature()
+
+        mock_run.return_value = Mock(stdout=builtin.replace("SUSPENDED", "RUNNING"))
+        self.assertEqual(hardware_signature(), before)
+        mock_run.return_value = Mock(stdout=builtin + headset)
+        self.assertNotEqual(hardware_signature(), before)
+
+    @patch("subprocess.run", side_effect=FileNotFoundError)
+    def test_without_sound_server(self, mock_run):
+        """Test that a missing pactl is only looked for once."""
+        hardware_signature()
+        hardware_signature()
+
+        mock_run.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
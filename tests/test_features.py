@@ -0,0 +1,115 @@
+"""Tests for the features module."""
+
+import unittest
+import numpy as np
+import torch
+from unittest.mock import Mock
+from whisper.audio import N_FRAMES, N_SAMPLES, log_mel_spectrogram
+from src.prosody.features import CaptureFeatures, StreamingLogMel
+
+
+def whisper_mel(audio):
+    """Content frames of the spectrogram Whisper's transcribe computes."""
+    return log_mel_spectrogram(torch.from_numpy(audio), 80, padding=N_SAMPLES)[:, :-N_FRAMES]
+
+
+class TestStreamingLogMel(unittest.TestCase):
+    """Test cases for StreamingLogMel class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rng = np.random.default_rng(0)
+
+    def test_matches_whisper_across_blocks(self):
+        """Test that block-wise frames match Whisper's whole-buffer spectrogram."""
+        for length in (16000, 16037, 48077):
+            audio = (self.rng.standard_normal(length) * 0.1).astype(np.float32)
+            mel = StreamingLogMel()
+            position = 0
+            while position < length:
+                size = int(self.rng.integers(1, 1500))
+                mel.push(audio[position:position + size])
+                position += size
+
+            expected = whisper_mel(audio)
+            result = mel.finalize()
+            self.assertEqual(result.shape, expected.shape)
+            torch.testing.assert_close(result, expected, atol=1e-5, rtol=0)
+
+    def test_short_audio(self):
+        """Test recordings shorter than the reflected padding."""
+        audio = (self.rng.standard_normal(180) * 0.1).astype(np.float32)
+        mel = StreamingLogMel()
+        mel.push(audio)
+
+        torch.testing.assert_close(mel.finalize(), whisper_mel(audio), atol=1e-5, rtol=0)
+        self.assertEqual(StreamingLogMel().finalize().shape, (80, 0))
+
+    def test_int16_scaled_like_transcriber(self):
+        """Test that int16 capture gives the same features as float."""
+        audio = (self.rng.standard_normal(8000) * 3000).astype(np.int16)
+        from_int, from_float = StreamingLogMel(), StreamingLogMel()
+        from_int.push(audio)
+        from_float.push(audio.astype(np.float32) / 32768)
+
+        torch.testing.assert_close(from_int.finalize(), from_float.finalize())
+
+    def test_push_after_finalize(self):
+        """Test that finalizing does not disturb later frames."""
+        audio = (self.rng.standard_normal(32000) * 0.1).astype(np.float32)
+        mel = StreamingLogMel()
+        mel.push(audio[:10000])
+        mel.finalize()
+        mel.push(audio[10000:])
+
+        torch.testing.assert_close(mel.finalize(), whisper_mel(audio), atol=1e-5, rtol=0)
+
+    def test_range(self):
+        """Test that a sample range takes the frames covering it."""
+        audio = (self.rng.standard_normal(48000) * 0.01).astype(np.float32)
+        audio[16000:32000] *= 10
+        mel = StreamingLogMel()
+        mel.push(audio)
+
+        result = mel.finalize(start=16000, end=32000)
+
+        self.assertEqual(result.shape, (80, 100))
+        # Away from the edges, frames only see audio inside the range
+        expected = whisper_mel(audio[16000:32000])
+        torch.testing.assert_close(result[:, 2:-2], expected[:, 2:-2], atol=1e-5, rtol=0)
+
+
+class TestCaptureFeatures(unittest.TestCase):
+    """Test cases for CaptureFeatures class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.audio = (np.random.default_rng(0).standard_normal(32000) * 0.1).astype(np.float32)
+        self.recorder = Mock(samplerate=16000, channels=1)
+        self.features = CaptureFeatures(self.recorder)
+
+    def test_follows_recording(self):
+        """Test that polled audio and the final tail add up to the whole recording."""
+        self.recorder.recorded_since.return_value = (self.audio[:20000], 20000)
+        self.features.poll()
+        self.assertEqual(self.features.mel.samples, 20000)
+
+        result = self.features.finish(self.audio)
+
+        torch.testing.assert_close(result, whisper_mel(self.audio), atol=1e-5, rtol=0)
+
+    def test_ring_overwrite_invalidates(self):
+        """Test that audio lost to a ring buffer gives no features."""
+        self.recorder.recorded_since.return_value = (self.audio[:100], 20000)
+        self.features.poll()
+
+        self.assertIsNone(self.features.finish(self.audio))
+
+    def test_rejects_other_formats(self):
+        """Test that only 16 kHz mono recorders are accepted."""
+        with self.assertRaises(ValueError):
+            CaptureFeatures(Mock(samplerate=48000, channels=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
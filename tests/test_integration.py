@@ -8,6 +8,7 @@ import time
 import numpy as np
 from unittest.mock import Mock, patch, MagicMock
 from src.prosody.main import ProsodyApp
+from src.prosody.residency import RUNNER_NAME
 
 
 class TestProsodyIntegration(unittest.TestCase):
@@ -26,7 +27,8 @@ class TestProsodyIntegration(unittest.TestCase):
             patch("tkinter.Tk"),
             patch("pynput.keyboard.Listener"),
             patch("subprocess.run"),  # For notifications
-            patch.dict(os.environ, {"HOME": self.temp_dir}),
+            # No warm-up inference or model cache with the mocked model
+            patch.dict(os.environ, {"HOME": self.temp_dir, "PROSODY_WARMUP": "0", "PROSODY_MODEL_CACHE": "0"}),
         ]
 
         for p in self.patches:
@@ -34,6 +36,11 @@ class TestProsodyIntegration(unittest.TestCase):
 
     def tearDown(self):
         """Clean up after tests."""
+        # Let background model loads finish while whisper is still patched
+        for thread in threading.enumerate():
+            if thread.name == RUNNER_NAME:
+                thread.join(timeout=2.0)
+
         for p in self.patches:
             p.stop()
 
@@ -71,8 +78,10 @@ class TestProsodyIntegration(unittest.TestCase):
         app.toggle_recording()
         self.assertTrue(app.is_recording)
 
-        # Mock audio data
-        test_audio = np.array([0.1, 0.2, 0.3], dtype=np.float32)
+        # Mock audio data: a voiced tone with silence either side
+        test_audio = np.zeros(32000, dtype=np.float32)
+        tone = np.sin(2 * np.pi * 200 * np.arange(16000) / 16000)
+        test_audio[8000:24000] = 0.3 * tone
         app.audio_recorder.stop_recording = Mock(return_value=test_audio)
 
         # Stop recording - this triggers transcription in a thread
@@ -90,6 +99,135 @@ class TestProsodyIntegration(unittest.TestCase):
         # Verify text was typed
         mock_type_text.assert_called_once_with("Test transcription")
 
+    @patch("src.prosody.main.type_text")
+    def test_silent_recording_skips_transcription(self, mock_type_text):
+        """Test that a recording with no speech never reaches the model."""
+        app = ProsodyApp()
+        app.transcriber.transcribe = Mock(return_value="hallucination")
+
+        app.toggle_recording()
+        app.audio_recorder.stop_recording = Mock(
+            return_value=np.zeros(16000, dtype=np.float32)
+        )
+        app.toggle_recording()
+
+        time.sleep(0.1)
+        app.transcriber.transcribe.assert_not_called()
+        mock_type_text.assert_not_called()
+
+    @patch("src.prosody.main.type_text")
+    def test_recording_from_array_source(self, mock_type_text):
+        """Test the record-transcribe-type pipeline with replayed audio."""
+        from src.prosody.sources import ArraySource
+
+        audio = np.zeros(32000, dtype=np.float32)
+        audio[8000:24000] = 0.3 * np.sin(2 * np.pi * 200 * np.arange(16000) / 16000)
+        source = ArraySource(audio, samplerate=16000, realtime=False)
+        app = ProsodyApp(audio_source=source)
+        app.transcriber.transcribe = Mock(return_value="Replayed")
+
+        app.toggle_recording()
+        self.assertTrue(source.wait(timeout=2.0))
+        app.toggle_recording()
+
+        time.sleep(0.2)
+        passed = app.transcriber.transcribe.call_args[0][0]
+        self.assertGreater(len(passed), 16000)
+        self.assertLess(len(passed), 32000)
+        mock_type_text.assert_called_once_with("Replayed")
+
+    @patch("src.prosody.main.type_text")
+    def test_streaming_recording(self, mock_type_text):
+        """Test that streaming mode types the joined segment text."""
+        from src.prosody.sources import ArraySource
+
+        audio = np.zeros(32000, dtype=np.float32)
+        audio[8000:24000] = 0.3 * np.sin(2 * np.pi * 200 * np.arange(16000) / 16000)
+        source = ArraySource(audio, samplerate=16000, realtime=False)
+        with patch.dict(os.environ, {"PROSODY_STREAMING": "1"}):
+            app = ProsodyApp(audio_source=source)
+        app.transcriber.transcribe = Mock(return_value="Streamed")
+
+        app.toggle_recording()
+        self.assertIsNotNone(app.streamer)
+        self.assertTrue(source.wait(timeout=2.0))
+        app.toggle_recording()
+
+        time.sleep(0.2)
+        self.assertIsNone(app.streamer)
+        mock_type_text.assert_called_once_with("Streamed")
+
+    @patch("src.prosody.main.type_text")
+    def test_live_mel_recording(self, mock_type_text):
+        """Test that PROSODY_LIVE_MEL hands features of the speech to the transcriber."""
+        from src.prosody.sources import ArraySource
+
+        audio = np.zeros(32000, dtype=np.float32)
+        audio[8000:24000] = 0.3 * np.sin(2 * np.pi * 200 * np.arange(16000) / 16000)
+        source = ArraySource(audio, samplerate=16000, realtime=False)
+        with patch.dict(os.environ, {"PROSODY_LIVE_MEL": "1"}):
+            app = ProsodyApp(audio_source=source)
+        app.transcriber.transcribe = Mock(return_value="Featured")
+
+        app.toggle_recording()
+        self.assertTrue(source.wait(timeout=2.0))
+        app.toggle_recording()
+
+        time.sleep(0.2)
+        speech = app.transcriber.transcribe.call_args[0][0]
+        mel = app.transcriber.transcribe.call_args[1]["mel"]
+        self.assertEqual(mel.shape[0], 80)
+        self.assertLessEqual(abs(mel.shape[1] - len(speech) // 160), 1)
+        mock_type_text.assert_called_once_with("Featured")
+
+    def record_while_loading(self, audio, replies):
+        """Make two recordings before the model loads, then let it load."""
+        loading = threading.Event()
+        with patch("src.prosody.main.Transcriber.load", side_effect=lambda: loading.wait(2.0)):
+            app = ProsodyApp()
+            app.transcriber.transcribe = Mock(side_effect=replies)
+
+            for _ in range(2):
+                app.toggle_recording()
+                app.audio_recorder.stop_recording = Mock(return_value=audio)
+                app.toggle_recording()
+
+            self.assertEqual(app.residency.queued, 2)
+            self.assertGreater(app.residency.oldest_wait, 0)
+            app.transcriber.transcribe.assert_not_called()
+
+            loading.set()
+            self.assertTrue(app.residency.join(timeout=2.0))
+
+        self.assertEqual(app.residency.queued, 0)
+        self.assertFalse(app.residency.busy)
+        return app
+
+    @patch("src.prosody.main.type_text")
+    def test_recordings_queued_until_model_loads(self, mock_type_text):
+        """Test that short recordings waiting for the model are merged into one transcription."""
+        audio = np.zeros(32000, dtype=np.float32)
+        audio[8000:24000] = 0.3 * np.sin(2 * np.pi * 200 * np.arange(16000) / 16000)
+
+        app = self.record_while_loading(audio, ["first second"])
+
+        self.assertEqual(app.residency.merged, 1)
+        merged = app.transcriber.transcribe.call_args[0][0]
+        self.assertGreater(len(merged), 2 * 16000)
+        mock_type_text.assert_called_once_with("first second")
+
+    @patch("src.prosody.main.type_text")
+    def test_long_recordings_typed_in_order(self, mock_type_text):
+        """Test that recordings too long to merge are transcribed one by one, in order."""
+        # 18 s of tone; the VAD needs enough silence around it to find the noise floor
+        audio = np.zeros(22 * 16000, dtype=np.float32)
+        audio[32000:-32000] = 0.3 * np.sin(2 * np.pi * 200 * np.arange(len(audio) - 64000) / 16000)
+
+        app = self.record_while_loading(audio, ["first", "second"])
+
+        self.assertEqual(app.residency.merged, 0)
+        self.assertEqual([c[0][0] for c in mock_type_text.call_args_list], ["first", "second"])
+
     def test_cancel_recording(self):
         """Test canceling a recording."""
         app = ProsodyApp()
@@ -106,6 +244,41 @@ class TestProsodyIntegration(unittest.TestCase):
         app.transcriber.transcribe = Mock()
         app.transcriber.transcribe.assert_not_called()
 
+    def test_warm_stream_from_environment(self):
+        """Test that PROSODY_WARM_STREAM enables the warm recorder."""
+        with patch.dict(os.environ, {"PROSODY_WARM_STREAM": "1"}):
+            app = ProsodyApp()
+        self.assertTrue(app.audio_recorder.warm)
+
+        self.assertFalse(ProsodyApp().audio_recorder.warm)
+
+    def test_worker_process_from_environment(self):
+        """Test that PROSODY_WORKER=process moves transcription to a child process."""
+        from src.prosody.worker import TranscriptionWorker
+
+        with patch.dict(os.environ, {"PROSODY_WORKER": "process"}), patch.object(TranscriptionWorker, "load"):
+            app = ProsodyApp()
+            self.assertIsInstance(app.transcriber, TranscriptionWorker)
+            app.residency.join(timeout=2.0)
+        app.transcriber.close()
+
+    def test_warmup_from_environment(self):
+        """Test that warm-up is on unless PROSODY_WARMUP=0."""
+        self.assertFalse(ProsodyApp().transcriber.warmup)
+        with patch.dict(os.environ, {"PROSODY_WARMUP": "1"}), patch("src.prosody.main.Transcriber.load"):
+            self.assertTrue(ProsodyApp().transcriber.warmup)
+
+    def test_preprocess_from_environment(self):
+        """Test that PROSODY_PREPROCESS selects the preprocessing stages."""
+        with patch.dict(os.environ, {"PROSODY_PREPROCESS": "dc, agc"}):
+            app = ProsodyApp()
+        preprocessor = app.audio_recorder.preprocessor
+        self.assertTrue(preprocessor.dc_removal)
+        self.assertTrue(preprocessor.agc)
+        self.assertIsNone(preprocessor.highpass_hz)
+
+        self.assertIsNone(ProsodyApp().audio_recorder.preprocessor)
+
     def test_signal_handling(self):
         """Test graceful shutdown on signals."""
         app = ProsodyApp()
@@ -0,0 +1,104 @@
+"""Tests for the preprocess module."""
+
+import unittest
+import numpy as np
+from src.prosody.preprocess import AudioPreprocessor, OnePoleRecursion
+
+
+def tone(freq, seconds=1.0, amplitude=0.1, samplerate=16000):
+    """Build a sine tone."""
+    t = np.arange(int(seconds * samplerate)) / samplerate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+class TestOnePoleRecursion(unittest.TestCase):
+    """Test cases for OnePoleRecursion class."""
+
+    def test_matches_sample_loop(self):
+        """Test that the vectorized recursion matches the direct loop."""
+        u = np.random.default_rng(0).standard_normal(1000)
+        recursion = OnePoleRecursion(0.995, chunk=64)
+
+        y = np.concatenate([recursion.process(u[:333]), recursion.process(u[333:])])
+
+        expected = np.empty_like(u)
+        state = 0.0
+        for i, value in enumerate(u):
+            state = 0.995 * state + value
+            expected[i] = state
+        np.testing.assert_allclose(y, expected, atol=1e-9)
+
+    def test_empty_block(self):
+        """Test that an empty block leaves the state alone."""
+        recursion = OnePoleRecursion(0.5)
+        recursion.process(np.ones(10))
+        state = recursion.state
+
+        self.assertEqual(len(recursion.process(np.zeros(0))), 0)
+        self.assertEqual(recursion.state, state)
+
+
+class TestAudioPreprocessor(unittest.TestCase):
+    """Test cases for AudioPreprocessor class."""
+
+    def test_removes_dc_offset(self):
+        """Test that a constant offset is removed."""
+        preprocessor = AudioPreprocessor(highpass_hz=None, agc=False)
+        audio = tone(300, seconds=5) + 0.2
+
+        out = np.concatenate([preprocessor.process(b) for b in np.split(audio, 500)])
+
+        self.assertLess(abs(out[-16000:].mean()), 0.005)
+
+    def test_highpass_attenuates_rumble(self):
+        """Test that low-frequency rumble is cut and speech band kept."""
+        preprocessor = AudioPreprocessor(dc_removal=False, agc=False)
+        rumble = preprocessor.process(tone(20, seconds=2))[16000:]
+        preprocessor.reset()
+        voice = preprocessor.process(tone(500, seconds=2))[16000:]
+
+        self.assertLess(np.abs(rumble).max(), 0.03)
+        self.assertGreater(np.abs(voice).max(), 0.09)
+
+    def test_agc_raises_quiet_audio(self):
+        """Test that quiet audio is brought up towards the target level."""
+        preprocessor = AudioPreprocessor(dc_removal=False, highpass_hz=None)
+        audio = tone(300, seconds=3, amplitude=0.01)
+
+        out = np.concatenate([preprocessor.process(b) for b in np.split(audio, 300)])
+
+        rms = np.sqrt(np.mean(out[-8000:] ** 2))
+        self.assertGreater(rms, 0.05)
+        self.assertLessEqual(np.abs(out).max(), 1.0)
+
+    def test_agc_gain_is_capped(self):
+        """Test that silence is not amplified without bound."""
+        preprocessor = AudioPreprocessor(dc_removal=False, highpass_hz=None, max_gain_db=20.0)
+        for _ in range(100):
+            preprocessor.process(np.full(160, 1e-6, dtype=np.float32))
+
+        self.assertLessEqual(preprocessor.gain, 10.0 + 1e-9)
+
+    def test_int16_input_scaled(self):
+        """Test that int16 input comes out as normalized float32."""
+        preprocessor = AudioPreprocessor(dc_removal=False, highpass_hz=None, agc=False)
+        block = np.array([[16384], [-16384]], dtype=np.int16)
+
+        out = preprocessor.process(block)
+
+        self.assertEqual(out.dtype, np.float32)
+        self.assertEqual(out.shape, (2, 1))
+        np.testing.assert_allclose(out[:, 0], [0.5, -0.5])
+
+    def test_block_size_independent(self):
+        """Test that filter output does not depend on how audio is split."""
+        audio = tone(300, seconds=1) + 0.1
+        whole = AudioPreprocessor(agc=False).process(audio)
+        preprocessor = AudioPreprocessor(agc=False)
+        split = np.concatenate([preprocessor.process(b) for b in np.array_split(audio, 37)])
+
+        np.testing.assert_allclose(split, whole, atol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
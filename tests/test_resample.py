@@ -0,0 +1,92 @@
+"""Tests for the resample module."""
+
+import unittest
+import numpy as np
+from src.prosody.resample import StreamingResampler, design_lowpass
+
+
+def tone(frequency, rate, seconds=1.0):
+    """Generate a sine tone."""
+    t = np.arange(int(rate * seconds)) / rate
+    return np.sin(2 * np.pi * frequency * t).astype(np.float32)
+
+
+class TestStreamingResampler(unittest.TestCase):
+    """Test cases for StreamingResampler class."""
+
+    def test_ratio(self):
+        """Test that common device rates reduce to small ratios."""
+        resampler = StreamingResampler(48000, 16000)
+        self.assertEqual((resampler.up, resampler.down), (1, 3))
+
+        resampler = StreamingResampler(44100, 16000)
+        self.assertEqual((resampler.up, resampler.down), (160, 441))
+
+    def test_output_length(self):
+        """Test that one second in gives one second out."""
+        for rate in (8000, 22050, 44100, 48000):
+            resampler = StreamingResampler(rate, 16000)
+            self.assertEqual(len(resampler.process(tone(440, rate))), 16000)
+
+    def test_blocks_match_whole_signal(self):
+        """Test that block boundaries do not change the output."""
+        signal = tone(440, 44100)
+        resampler = StreamingResampler(44100, 16000)
+        whole = resampler.process(signal)
+
+        resampler.reset()
+        blocks = [resampler.process(signal[i:i + 517]) for i in range(0, len(signal), 517)]
+
+        np.testing.assert_allclose(np.concatenate(blocks), whole, atol=1e-6)
+
+    def test_passband_tone_preserved(self):
+        """Test that an in-band tone comes through, delayed by the filter."""
+        resampler = StreamingResampler(48000, 16000)
+        out = resampler.process(tone(440, 48000))
+
+        t = (np.arange(len(out)) - resampler.delay) / 16000
+        expected = np.sin(2 * np.pi * 440 * t)
+        np.testing.assert_allclose(out[200:-200], expected[200:-200], atol=1e-3)
+
+    def test_aliasing_rejected(self):
+        """Test that content above the new Nyquist frequency is filtered out."""
+        resampler = StreamingResampler(48000, 16000)
+        out = resampler.process(tone(10000, 48000))
+
+        self.assertLess(np.abs(out[200:]).max(), 1e-3)
+
+    def test_multichannel(self):
+        """Test that channels are resampled independently."""
+        signal = np.stack([tone(440, 48000), tone(880, 48000)], axis=1)
+        resampler = StreamingResampler(48000, 16000)
+        out = resampler.process(signal)
+
+        mono = StreamingResampler(48000, 16000).process(signal[:, 1])
+        self.assertEqual(out.shape, (16000, 2))
+        np.testing.assert_allclose(out[:, 1], mono, atol=1e-6)
+
+    def test_same_rate_passthrough(self):
+        """Test that equal rates return the input unchanged."""
+        signal = tone(440, 16000)
+        self.assertIs(StreamingResampler(16000, 16000).process(signal), signal)
+
+    def test_tiny_blocks(self):
+        """Test blocks too short to produce any output."""
+        resampler = StreamingResampler(48000, 16000)
+        outputs = [resampler.process(np.ones(1, dtype=np.float32)) for _ in range(6)]
+
+        self.assertEqual(sum(len(o) for o in outputs), 2)
+
+
+class TestDesignLowpass(unittest.TestCase):
+    """Test cases for design_lowpass function."""
+
+    def test_unity_gain_and_symmetry(self):
+        """Test that the filter has unity DC gain and linear phase."""
+        taps = design_lowpass(63, 0.1)
+        self.assertAlmostEqual(taps.sum(), 1.0)
+        np.testing.assert_allclose(taps, taps[::-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""Tests for the residency module."""
+
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+from src.prosody.residency import ModelResidency
+
+
+class FakeTranscriber:
+    """Transcriber stand-in that counts loads and unloads."""
+
+    def __init__(self, loaded=False):
+        self.model = object() if loaded else None
+        self.loads = 0
+        self.unloads = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    @property
+    def ready(self):
+        return self.model is not None
+
+    def load(self):
+        self.gate.wait(2.0)
+        self.loads += 1
+        self.model = object()
+
+    def unload(self):
+        self.unloads += 1
+        self.model = None
+
+
+class TestModelResidency(unittest.TestCase):
+    """Test cases for ModelResidency class."""
+
+    def wait_loaded(self, residency):
+        self.assertTrue(residency.join(timeout=2.0))
+
+    def test_jobs_queue_until_loaded(self):
+        """Test that jobs submitted during loading run in order after it."""
+        transcriber = FakeTranscriber()
+        transcriber.gate.clear()
+        ran = []
+        residency = ModelResidency(transcriber, on_ready=Mock())
+
+        residency.submit(ran.append, 1)
+        residency.submit(ran.append, 2)
+        self.assertEqual(residency.queued, 2)
+        self.assertEqual(ran, [])
+
+        transcriber.gate.set()
+        self.wait_loaded(residency)
+
+        self.assertEqual(ran, [1, 2])
+        self.assertFalse(residency.busy)
+        residency.on_ready.assert_called_once()
+
+    def test_jobs_run_one_at_a_time(self):
+        """Test that jobs on a loaded model run in order, never concurrently."""
+        residency = ModelResidency(FakeTranscriber(loaded=True))
+        running = []
+        ran = []
+
+        def job(n):
+            running.append(n)
+            self.assertEqual(len(running), 1)
+            time.sleep(0.01)
+            ran.append(n)
+            running.remove(n)
+
+        for n in range(4):
+            residency.submit(job, n)
+        self.wait_loaded(residency)
+
+        self.assertEqual(ran, [0, 1, 2, 3])
+        self.assertIsNotNone(residency.last_wait)
+        self.assertEqual(residency._users, 0)
+
+    def test_waiting_jobs_coalesced(self):
+        """Test that consecutive jobs for the same target merge as far as coalesce allows."""
+        transcriber = FakeTranscriber()
+        transcriber.gate.clear()
+        ran = []
+        other = []
+        # Merge while the total stays under 6
+        coalesce = Mock(side_effect=lambda target, args, next_args: (
+            (args[0] + next_args[0],) if args[0] + next_args[0] < 6 else None
+        ))
+        residency = ModelResidency(transcriber, coalesce=coalesce)
+
+        for n in (1, 2, 4):
+            residency.submit(ran.append, n)
+        residency.submit(other.append, 1)
+        residency.submit(ran.append, 5)
+        transcriber.gate.set()
+        self.wait_loaded(residency)
+
+        self.assertEqual(ran, [3, 4, 5])
+        self.assertEqual(other, [1])
+        self.assertEqual(residency.merged, 1)
+        self.assertEqual(residency._users, 0)
+
+    def test_failed_job_keeps_queue_running(self):
+        """Test that an error in one job does not stop the ones behind it."""
+        residency = ModelResidency(FakeTranscriber(loaded=True))
+        ran = []
+
+        residency.submit(Mock(side_effect=RuntimeError("boom")))
+        residency.submit(ran.append, 1)
+        self.wait_loaded(residency)
+
+        self.assertEqual(ran, [1])
+        self.assertFalse(residency.busy)
+
+    def test_evicts_when_idle(self):
+        """Test that an unused model is unloaded after the timeout."""
+        transcriber = FakeTranscriber(loaded=True)
+        residency = ModelResidency(transcriber, idle_timeout=0.05)
+
+        self.assertFalse(residency.evict_if_idle())
+        time.sleep(0.06)
+        self.assertTrue(residency.evict_if_idle())
+
+        self.assertFalse(transcriber.ready)
+        self.assertEqual(residency.evictions, 1)
+
+    def test_hold_prevents_eviction_and_reloads(self):
+        """Test that a recording keeps the model and starts a reload."""
+        transcriber = FakeTranscriber()
+        residency = ModelResidency(transcriber, idle_timeout=0.01)
+
+        residency.hold()
+        self.wait_loaded(residency)
+        time.sleep(0.02)
+
+        self.assertTrue(transcriber.ready)
+        self.assertFalse(residency.evict_if_idle())
+
+        residency.release()
+        time.sleep(0.02)
+        self.assertTrue(residency.evict_if_idle())
+
+    def test_no_eviction_without_timeout(self):
+        """Test that the default keeps the model loaded for good."""
+        residency = ModelResidency(FakeTranscriber(loaded=True))
+
+        residency.start()
+        self.assertIsNone(residency._monitor)
+        self.assertFalse(residency.evict_if_idle())
+
+    def test_load_error_discards_queue(self):
+        """Test that a failed load reports and drops the queued jobs."""
+        transcriber = FakeTranscriber()
+        transcriber.load = Mock(side_effect=RuntimeError("no model"))
+        on_error = Mock()
+        residency = ModelResidency(transcriber, on_error=on_error)
+        job = Mock()
+
+        residency.submit(job)
+        self.wait_loaded(residency)
+
+        job.assert_not_called()
+        self.assertEqual(residency.queued, 0)
+        self.assertEqual(on_error.call_args[0][1], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
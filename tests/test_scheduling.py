@@ -0,0 +1,64 @@
+"""Tests for the scheduling module."""
+
+import os
+import threading
+import unittest
+from unittest.mock import patch
+from src.prosody.scheduling import SchedulingPolicy, parse_cpu_list
+
+
+class TestSchedulingPolicy(unittest.TestCase):
+    """Test cases for SchedulingPolicy class."""
+
+    def test_parse_cpu_list(self):
+        """Test parsing ranges and single CPUs."""
+        self.assertEqual(parse_cpu_list("0-3, 6"), {0, 1, 2, 3, 6})
+        self.assertEqual(parse_cpu_list(""), set())
+
+    @patch("os.sched_getaffinity", return_value={0, 1, 2, 3})
+    def test_inference_cpus(self, mock_affinity):
+        """Test that reserved cores are taken from the allowed CPUs."""
+        self.assertIsNone(SchedulingPolicy(nice=5).inference_cpus())
+        self.assertEqual(SchedulingPolicy(reserved_cores=1).inference_cpus(), {1, 2, 3})
+        self.assertEqual(SchedulingPolicy(cpus={0, 1, 7}, reserved_cores=1).inference_cpus(), {1})
+        # The last usable CPU is never reserved away
+        self.assertEqual(SchedulingPolicy(cpus={2}, reserved_cores=1).inference_cpus(), {2})
+
+    def test_active(self):
+        """Test that an empty policy is recognised as a no-op."""
+        self.assertFalse(SchedulingPolicy().active)
+        self.assertTrue(SchedulingPolicy(nice=10).active)
+
+    def test_apply_affects_only_calling_thread(self):
+        """Test that niceness and affinity are set per thread."""
+        policy = SchedulingPolicy(nice=7, cpus={min(os.sched_getaffinity(0))})
+        seen = {}
+
+        def worker():
+            policy.apply()
+            seen["nice"] = os.getpriority(os.PRIO_PROCESS, 0)
+            seen["cpus"] = os.sched_getaffinity(0)
+
+        before = os.getpriority(os.PRIO_PROCESS, 0)
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        self.assertEqual(seen["nice"], 7)
+        self.assertEqual(seen["cpus"], policy.cpus)
+        self.assertEqual(os.getpriority(os.PRIO_PROCESS, 0), before)
+
+    @patch("os.sched_setaffinity")
+    @patch("torch.set_num_threads")
+    @patch("torch.get_num_threads", return_value=8)
+    @patch("os.sched_getaffinity", return_value={0, 1, 2, 3})
+    def test_apply_limits_torch_threads(self, mock_affinity, mock_get, mock_set, mock_setaffinity):
+        """Test that torch never gets more threads than pinned CPUs."""
+        SchedulingPolicy(reserved_cores=1).apply()
+
+        mock_setaffinity.assert_called_once_with(0, {1, 2, 3})
+        mock_set.assert_called_once_with(3)
+
+
+if __name__ == "__main__":
+    unittest.main()
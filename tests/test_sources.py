@@ -0,0 +1,159 @@
+"""Tests for the sources module."""
+
+import os
+import tempfile
+import unittest
+import wave
+import numpy as np
+from unittest.mock import Mock, patch
+from src.prosody.audio import AudioRecorder
+from src.prosody.sources import ArraySource, FileSource, MicrophoneSource, read_wav
+
+
+class TestArraySource(unittest.TestCase):
+    """Test cases for ArraySource class."""
+
+    def test_replays_all_blocks(self):
+        """Test that every frame is delivered in order, in blocks."""
+        audio = np.arange(1000, dtype=np.float32) / 1000
+        source = ArraySource(audio, samplerate=16000, realtime=False)
+        callback = Mock()
+
+        stream, rate = source.open_stream(callback, channels=1, dtype="float32", blocksize=300)
+        stream.start()
+        self.assertTrue(source.wait(timeout=1.0))
+
+        self.assertEqual(rate, 16000)
+        blocks = [call[0][0] for call in callback.call_args_list]
+        self.assertEqual([len(b) for b in blocks], [300, 300, 300, 100])
+        np.testing.assert_array_equal(np.concatenate(blocks).ravel(), audio)
+
+    def test_realtime_pacing(self):
+        """Test that realtime playback takes about as long as the audio."""
+        source = ArraySource(np.zeros(1600, dtype=np.float32), samplerate=16000)
+        stream, _ = source.open_stream(Mock(), channels=1, dtype="float32")
+
+        stream.start()
+        self.assertFalse(source.wait(timeout=0.05))
+        self.assertTrue(source.wait(timeout=1.0))
+
+    def test_stop_interrupts_playback(self):
+        """Test that stopping the stream ends playback early."""
+        source = ArraySource(np.zeros(16000 * 10, dtype=np.float32), samplerate=16000)
+        callback = Mock()
+        stream, _ = source.open_stream(callback, channels=1, dtype="float32")
+
+        stream.start()
+        stream.stop()
+
+        self.assertFalse(stream.active)
+        self.assertLess(callback.call_count, 10)
+
+    def test_format_conversion(self):
+        """Test conversion between float and int16 and channel counts."""
+        stereo = np.array([[0.5, -0.5], [1.0, 1.0]], dtype=np.float32)
+        source = ArraySource(stereo)
+
+        np.testing.assert_array_equal(source._convert(1, "float32"), [[0.0], [1.0]])
+        np.testing.assert_array_equal(source._convert(2, "int16"), [[16384, -16384], [32767, 32767]])
+
+        mono = ArraySource(np.array([16384, -32768], dtype=np.int16))
+        np.testing.assert_array_equal(mono._convert(1, "float32"), [[0.5], [-1.0]])
+        self.assertEqual(mono._convert(2, "int16").shape, (2, 2))
+
+    def test_recorder_with_array_source(self):
+        """Test recording from an array source, including resampling."""
+        audio = np.sin(np.arange(48000) / 10).astype(np.float32)
+        source = ArraySource(audio, samplerate=48000, realtime=False)
+        recorder = AudioRecorder(source=source)
+
+        recorder.start_recording()
+        self.assertTrue(source.wait(timeout=2.0))
+        audio_data = recorder.stop_recording()
+
+        self.assertEqual(len(audio_data), 16000)
+        self.assertEqual(recorder.get_available_devices(), [])
+        self.assertIsNone(recorder.device_index)
+
+
+class TestFileSource(unittest.TestCase):
+    """Test cases for FileSource and WAV reading."""
+
+    def setUp(self):
+        """Create a temporary directory for audio files."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove temporary files."""
+        for name in os.listdir(self.temp_dir):
+            os.remove(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+
+    def _write_wav(self, samples, samplerate=22050, channels=1, width=2):
+        path = os.path.join(self.temp_dir, "test.wav")
+        with wave.open(path, "wb") as f:
+            f.setnchannels(channels)
+            f.setsampwidth(width)
+            f.setframerate(samplerate)
+            f.writeframes(samples.tobytes())
+        return path
+
+    def test_read_wav_16bit_stereo(self):
+        """Test reading a 16-bit stereo WAV file."""
+        samples = np.array([[1, -1], [1000, -1000], [32767, -32768]], dtype=np.int16)
+        audio, rate = read_wav(self._write_wav(samples, channels=2))
+
+        self.assertEqual(rate, 22050)
+        np.testing.assert_array_equal(audio, samples)
+
+    def test_read_wav_8bit(self):
+        """Test that unsigned 8-bit WAV is recentred."""
+        samples = np.array([128, 255, 0], dtype=np.uint8)
+        audio, _ = read_wav(self._write_wav(samples, width=1))
+
+        np.testing.assert_array_equal(audio.ravel(), [0, 127 << 8, -128 << 8])
+
+    def test_wav_file_source(self):
+        """Test that a WAV file source carries the file's sample rate."""
+        source = FileSource(self._write_wav(np.zeros(100, dtype=np.int16)))
+        self.assertEqual(source.samplerate, 22050)
+        self.assertEqual(source.audio.shape, (100, 1))
+
+    def test_npy_file_source(self):
+        """Test that a .npy file is memory-mapped with the given rate."""
+        path = os.path.join(self.temp_dir, "test.npy")
+        np.save(path, np.ones(50, dtype=np.float32))
+
+        source = FileSource(path, samplerate=8000)
+        self.assertEqual(source.samplerate, 8000)
+        self.assertEqual(len(source.audio), 50)
+        del source
+
+
+class TestMicrophoneSource(unittest.TestCase):
+    """Test cases for MicrophoneSource class."""
+
+    @patch("sounddevice.query_devices", return_value=[])
+    @patch("sounddevice.InputStream")
+    def test_open_stream_at_requested_rate(self, mock_stream_class, mock_query):
+        """Test that an explicit rate skips the native rate lookup."""
+        source = MicrophoneSource()
+        stream, rate = source.open_stream(Mock(), channels=1, dtype="float32", samplerate=16000)
+
+        self.assertIs(stream, mock_stream_class.return_value)
+        self.assertEqual(rate, 16000)
+        mock_stream_class.return_value.start.assert_not_called()
+
+    @patch("sounddevice.query_devices", return_value=[])
+    def test_on_change_forwarded(self, mock_query):
+        """Test that hardware changes reach the source's owner."""
+        source = MicrophoneSource()
+        source.on_change = Mock()
+
+        source.devices.on_change()
+
+        source.on_change.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""Tests for the streaming module."""
+
+import unittest
+import numpy as np
+from unittest.mock import Mock
+from src.prosody.streaming import StreamingTranscriber
+
+
+def make_dictation(phrases, pause=1.0, samplerate=16000):
+    """Build voiced phrases (length in seconds) separated by quiet pauses."""
+    rng = np.random.default_rng(0)
+    parts = []
+    for seconds in phrases:
+        t = np.arange(int(seconds * samplerate)) / samplerate
+        parts.append(0.3 * np.sin(2 * np.pi * 200 * t))
+        parts.append(np.zeros(int(pause * samplerate)))
+    audio = np.concatenate(parts)
+    return (audio + rng.standard_normal(len(audio)) * 1e-4).astype(np.float32)
+
+
+class FakeRecorder:
+    """Recorder stand-in whose live recording grows as the test feeds it."""
+
+    def __init__(self, audio, samplerate=16000):
+        self.audio = audio
+        self.samplerate = samplerate
+        self.available = 0
+
+    def recorded_since(self, start):
+        return self.audio[start:self.available].copy(), self.available
+
+
+class TestStreamingTranscriber(unittest.TestCase):
+    """Test cases for StreamingTranscriber class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.audio = make_dictation([3.0, 3.0, 1.0])
+        self.recorder = FakeRecorder(self.audio)
+        self.transcriber = Mock()
+        self.transcriber.transcribe.side_effect = lambda audio, **kwargs: f"part{self.transcriber.transcribe.call_count}"
+        self.streamer = StreamingTranscriber(self.recorder, self.transcriber)
+
+    def test_no_cut_while_speaking(self):
+        """Test that nothing is transcribed before a pause."""
+        self.recorder.available = int(2.5 * 16000)
+
+        self.assertFalse(self.streamer.poll())
+        self.transcriber.transcribe.assert_not_called()
+
+    def test_cuts_at_pause(self):
+        """Test that a segment is cut inside the pause after speech."""
+        self.recorder.available = int(3.9 * 16000)
+
+        self.assertTrue(self.streamer.poll())
+
+        cut = self.streamer._cursor
+        self.assertGreater(cut, 3.0 * 16000)
+        self.assertLess(cut, 3.9 * 16000)
+        self.assertEqual(self.streamer.texts, ["part1"])
+
+    def test_finish_transcribes_only_tail(self):
+        """Test that finishing leaves earlier segments alone and joins the text."""
+        for seconds in (2.0, 4.0, 6.0, 8.0):
+            self.recorder.available = int(seconds * 16000)
+            while self.streamer.poll():
+                pass
+
+        text = self.streamer.finish(self.audio)
+
+        self.assertEqual(self.transcriber.transcribe.call_count, 3)
+        self.assertEqual(text, "part1 part2 part3")
+        # The tail holds only the last phrase and its padding
+        tail = self.transcriber.transcribe.call_args[0][0]
+        self.assertLess(len(tail), 2 * 16000)
+        # Earlier text is passed along as context
+        self.assertEqual(self.transcriber.transcribe.call_args[1]["prompt"], "part1 part2")
+
+    def test_segments_submitted_to_queue(self):
+        """Test that segments go to the model queue and finish takes any still waiting."""
+        jobs = []
+        streamer = StreamingTranscriber(self.recorder, self.transcriber, submit=jobs.append)
+        for seconds in (4.0, 8.0):
+            self.recorder.available = int(seconds * 16000)
+            while streamer.poll():
+                pass
+
+        self.assertEqual(len(jobs), 2)
+        self.transcriber.transcribe.assert_not_called()
+        jobs[0]()
+        self.assertEqual(streamer.texts, ["part1"])
+
+        text = streamer.finish(self.audio)
+        # The second segment's job is left with nothing to do
+        jobs[1]()
+
+        self.assertEqual(text, "part1 part2 part3")
+        self.assertEqual(self.transcriber.transcribe.call_count, 3)
+
+    def test_cancel_discards_queued_segments(self):
+        """Test that a cancelled recording's waiting segments are dropped."""
+        jobs = []
+        streamer = StreamingTranscriber(self.recorder, self.transcriber, submit=jobs.append)
+        self.recorder.available = int(4.0 * 16000)
+        streamer.poll()
+
+        streamer.cancel(discard=True)
+        jobs[0]()
+
+        self.transcriber.transcribe.assert_not_called()
+
+    def test_forced_cut_without_pause(self):
+        """Test that continuous speech is cut at the maximum segment length."""
+        streamer = StreamingTranscriber(FakeRecorder(self.audio), self.transcriber, max_segment_seconds=2.0)
+        t = np.arange(3 * 16000) / 16000
+        speech = (0.3 * np.sin(2 * np.pi * 200 * t)).astype(np.float32)
+
+        cut = streamer.find_cut(speech)
+        self.assertLessEqual(cut, 2 * 16000)
+        self.assertGreater(cut, 2 * 16000 - 2 * streamer.vad.frame_length)
+
+    def test_background_thread(self):
+        """Test that segments are picked up by the polling thread."""
+        streamer = StreamingTranscriber(self.recorder, self.transcriber, poll_interval=0.01)
+        self.recorder.available = int(4.0 * 16000)
+        streamer.start()
+        try:
+            for _ in range(200):
+                if streamer.texts:
+                    break
+                streamer._stop_event.wait(0.01)
+        finally:
+            streamer.cancel()
+
+        self.assertEqual(streamer.texts, ["part1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,8 +3,32 @@
 import unittest
 import numpy as np
 import os
+import tempfile
+import torch
 from unittest.mock import Mock, patch, MagicMock
-from src.prosody.transcription import Transcriber
+from src.prosody.features import StreamingLogMel, hann_window
+from src.prosody.transcription import (
+    DECODING_PROFILES,
+    Transcriber,
+    autocast_bf16,
+    bucket_frames,
+    short_window_encoder,
+)
+from whisper.model import ModelDimensions, Whisper
+
+
+def tiny_whisper():
+    """Build a randomly initialized one-layer Whisper model."""
+    torch.manual_seed(0)
+    model = Whisper(
+        ModelDimensions(
+            n_mels=80, n_audio_ctx=1500, n_audio_state=32, n_audio_head=2, n_audio_layer=1,
+            n_vocab=51864, n_text_ctx=448, n_text_state=32, n_text_head=2, n_text_layer=1,
+        )
+    )
+    # Whisper leaves this uninitialized (torch.empty) until a checkpoint is loaded
+    torch.nn.init.normal_(model.decoder.positional_embedding, std=0.01)
+    return model
 
 
 class TestTranscriber(unittest.TestCase):
@@ -17,8 +41,8 @@ class TestTranscriber(unittest.TestCase):
         self.mock_model = Mock()
         mock_load_model.return_value = self.mock_model
 
-        # Create transcriber instance
-        self.transcriber = Transcriber(model_name="base.en")
+        # Create transcriber instance; the mock model goes through whisper.transcribe
+        self.transcriber = Transcriber(model_name="base.en", direct_decode=False)
 
     def test_initialization(self):
         """Test Transcriber initialization."""
@@ -35,6 +59,51 @@ class TestTranscriber(unittest.TestCase):
 
         self.assertIn("Failed to load Whisper model", str(context.exception))
 
+    @patch("whisper.load_model")
+    def test_deferred_loading(self, mock_load_model):
+        """Test that load=False leaves loading to an explicit load()."""
+        transcriber = Transcriber(model_name="base.en", load=False)
+        self.assertFalse(transcriber.ready)
+        mock_load_model.assert_not_called()
+
+        transcriber.load()
+        transcriber.load()
+
+        self.assertTrue(transcriber.ready)
+        mock_load_model.assert_called_once_with("base.en")
+        self.assertIsNotNone(transcriber.load_seconds)
+
+    def test_unload(self):
+        """Test that unloading drops the model until the next load."""
+        self.transcriber.unload()
+
+        self.assertFalse(self.transcriber.ready)
+        with self.assertRaises(RuntimeError):
+            self.transcriber.transcribe(np.ones(160, dtype=np.float32))
+
+    @patch("src.prosody.transcription.apply_profile")
+    @patch("src.prosody.transcription.load_profile", return_value={"num_threads": 2, "interop_threads": 1})
+    @patch("whisper.load_model")
+    def test_thread_profile_applied_at_load(self, mock_load_model, mock_load_profile, mock_apply):
+        """Test that the tuned thread profile is applied before loading."""
+        Transcriber(cache_dir="/tmp/prosody-test")
+
+        mock_load_profile.assert_called_once_with(os.path.join("/tmp/prosody-test", "threads.json"))
+        mock_apply.assert_called_once_with({"num_threads": 2, "interop_threads": 1})
+
+        mock_apply.reset_mock()
+        Transcriber(thread_profile=False)
+        mock_apply.assert_not_called()
+
+    def test_scheduling_applied_when_transcribing(self):
+        """Test that the scheduling policy is applied on the transcribing thread."""
+        self.transcriber.scheduling = Mock()
+        self.mock_model.transcribe.return_value = {"text": "Test"}
+
+        self.transcriber.transcribe(np.ones(160, dtype=np.float32) * 0.1)
+
+        self.transcriber.scheduling.apply.assert_called_once()
+
     def test_transcribe_empty_audio(self):
         """Test transcribing empty audio data."""
         empty_audio = np.array([], dtype=np.float32)
@@ -76,6 +145,35 @@ class TestTranscriber(unittest.TestCase):
         normalized_audio = call_args[0][0]
         self.assertLessEqual(np.abs(normalized_audio).max(), 1.0)
 
+    def test_transcribe_skips_scan_when_normalized(self):
+        """Test that pre-normalized audio is passed through untouched."""
+        audio_data = np.random.randn(16000).astype(np.float32) * 0.1
+        self.mock_model.transcribe.return_value = {"text": "Test"}
+
+        self.transcriber.transcribe(audio_data, normalized=True)
+
+        self.assertIs(self.mock_model.transcribe.call_args[0][0], audio_data)
+
+    def test_transcribe_float32_not_copied(self):
+        """Test that float32 audio in range reaches the model without a copy."""
+        audio_data = np.random.randn(16000).astype(np.float32) * 0.1
+        self.mock_model.transcribe.return_value = {"text": "Test"}
+
+        self.transcriber.transcribe(audio_data)
+
+        self.assertIs(self.mock_model.transcribe.call_args[0][0], audio_data)
+
+    def test_transcribe_int16_audio(self):
+        """Test that int16 audio is converted to float32 at full scale."""
+        audio_data = np.array([16384, -32768, 0, 32767] * 4000, dtype=np.int16)
+        self.mock_model.transcribe.return_value = {"text": "Test"}
+
+        self.transcriber.transcribe(audio_data)
+
+        passed = self.mock_model.transcribe.call_args[0][0]
+        self.assertEqual(passed.dtype, np.float32)
+        np.testing.assert_allclose(passed[:4], [0.5, -1.0, 0.0, 32767 / 32768])
+
     def test_transcribe_error_handling(self):
         """Test error handling during transcription."""
         audio_data = np.random.randn(16000).astype(np.float32)
@@ -108,9 +206,7 @@ class TestTranscriber(unittest.TestCase):
     @patch("whisper.load_model")
     def test_get_model_info_not_loaded(self, mock_load_model):
         """Test getting model info when model is not loaded."""
-        transcriber = Transcriber.__new__(Transcriber)
-        transcriber.model_name = "test_model"
-        transcriber.model = None
+        transcriber = Transcriber(model_name="test_model", load=False)
 
         info = transcriber.get_model_info()
 
@@ -130,5 +226,283 @@ class TestTranscriber(unittest.TestCase):
         self.assertEqual(call_args[1]["language"], "fr")
 
 
+class TestPrecision(unittest.TestCase):
+    """Test cases for reduced-precision inference."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cache_dir = tempfile.mkdtemp()
+
+    def test_invalid_precision(self):
+        """Test that an unknown precision is rejected."""
+        with self.assertRaises(ValueError):
+            Transcriber(load=False, precision="fp8")
+
+    @patch("whisper.load_model", side_effect=lambda *args, **kwargs: tiny_whisper())
+    def test_int8_quantized_and_cached(self, mock_load_model):
+        """Test that int8 quantizes Linear layers and reuses the cached weights."""
+        transcriber = Transcriber(precision="int8", cache_dir=self.cache_dir)
+
+        layer = transcriber.model.decoder.blocks[0].mlp[0]
+        self.assertIsInstance(layer, torch.ao.nn.quantized.dynamic.Linear)
+        self.assertTrue(os.path.exists(transcriber.quantized_path))
+
+        mock_load_model.reset_mock()
+        cached = Transcriber(precision="int8", cache_dir=self.cache_dir)
+        mock_load_model.assert_not_called()
+        self.assertIsInstance(cached.model.decoder.blocks[0].mlp[0], torch.ao.nn.quantized.dynamic.Linear)
+
+    @patch("src.prosody.transcription.bf16_supported", return_value=False)
+    def test_bf16_falls_back_without_cpu_support(self, mock_supported):
+        """Test that bf16 is only used where the CPU supports it."""
+        self.assertEqual(Transcriber(load=False, precision="bf16").precision, "fp32")
+
+    def test_bf16_forward_returns_float32(self):
+        """Test that autocast models still hand float32 to the decoding loop."""
+        model = autocast_bf16(tiny_whisper())
+        mel = torch.zeros(1, 80, 3000)
+
+        with torch.no_grad():
+            features = model.encoder(mel)
+            logits = model.decoder(torch.tensor([[50257]]), features)
+
+        self.assertEqual(features.dtype, torch.float32)
+        self.assertEqual(logits.dtype, torch.float32)
+
+
+class TestDecodingProfiles(unittest.TestCase):
+    """Test cases for decoding profiles."""
+
+    def test_invalid_profile(self):
+        """Test that an unknown decoding profile is rejected."""
+        with self.assertRaises(ValueError):
+            Transcriber(load=False, decoding="greedy")
+
+    @patch("whisper.load_model")
+    def test_profile_options_passed_to_whisper(self, mock_load_model):
+        """Test that the profile's decoding options reach model.transcribe."""
+        mock_load_model.return_value.transcribe.return_value = {"text": "Test"}
+        transcriber = Transcriber(decoding="fastest", direct_decode=False)
+
+        transcriber.transcribe(np.ones(160, dtype=np.float32) * 0.1)
+
+        kwargs = mock_load_model.return_value.transcribe.call_args[1]
+        self.assertEqual(kwargs["temperature"], 0.0)
+        self.assertTrue(kwargs["without_timestamps"])
+        self.assertFalse(kwargs["condition_on_previous_text"])
+        self.assertEqual(kwargs["sample_len"], DECODING_PROFILES["fastest"]["sample_len"])
+        self.assertEqual(transcriber.get_model_info()["decoding"], "fastest")
+
+    @patch("whisper.load_model")
+    def test_decode_passes_counted(self, mock_load_model):
+        """Test that every decode pass, including fallbacks, is counted per call."""
+        model = mock_load_model.return_value
+        transcriber = Transcriber(direct_decode=False)
+
+        def transcribe(audio, **kwargs):
+            # A first pass that is rejected, then a fallback
+            model.decode(audio)
+            model.decode(audio)
+            return {"text": "Test"}
+
+        model.transcribe.side_effect = transcribe
+        transcriber.transcribe(np.ones(160, dtype=np.float32) * 0.1)
+        self.assertEqual(transcriber.last_decode_passes, 2)
+
+    @patch("whisper.load_model", side_effect=lambda *args, **kwargs: tiny_whisper())
+    def test_fastest_runs_one_pass(self, mock_load_model):
+        """Test that the fastest profile decodes a short clip in a single pass."""
+        transcriber = Transcriber(decoding="fastest", thread_profile=False)
+        audio = np.random.RandomState(0).randn(16000).astype(np.float32) * 0.1
+
+        transcriber.transcribe(audio, normalized=True)
+
+        self.assertEqual(transcriber.last_decode_passes, 1)
+
+    @patch("whisper.load_model", side_effect=lambda *args, **kwargs: tiny_whisper())
+    def test_precomputed_mel_matches_audio_path(self, mock_load_model):
+        """Test that a precomputed mel is decoded as Whisper's transcribe would decode the audio."""
+        transcriber = Transcriber(decoding="fastest", thread_profile=False)
+        audio = np.random.RandomState(0).randn(16000 * 35).astype(np.float32) * 0.1
+        mel = StreamingLogMel()
+        mel.push(audio)
+
+        calls = {"audio": [], "mel": []}
+        decode = transcriber.model.decode
+        for path, kwargs in (("audio", {}), ("mel", {"mel": mel.finalize()})):
+            def recording_decode(segment, options, path=path):
+                calls[path].append((segment, options))
+                return decode(segment, options)
+
+            transcriber.model.decode = recording_decode
+            with patch.object(transcriber.model, "transcribe", wraps=transcriber.model.transcribe) as wrapped:
+                transcriber.transcribe(audio, normalized=True, prompt="Earlier text", **kwargs)
+            self.assertEqual(wrapped.called, path == "audio")
+
+        # Two 30 s windows, with the same features and options
+        self.assertEqual(len(calls["mel"]), 2)
+        self.assertEqual(len(calls["mel"]), len(calls["audio"]))
+        for (expected, expected_options), (segment, options) in zip(calls["audio"], calls["mel"]):
+            torch.testing.assert_close(segment, expected, atol=1e-5, rtol=0)
+            self.assertEqual(options, expected_options)
+
+    @patch("whisper.load_model", side_effect=lambda *args, **kwargs: tiny_whisper())
+    def test_short_clip_decoded_directly(self, mock_load_model):
+        """Test that clips up to 30 s skip whisper.transcribe unless direct decoding is off."""
+        audio = np.random.RandomState(0).randn(16000 * 3).astype(np.float32) * 0.1
+        for direct in (True, False):
+            transcriber = Transcriber(decoding="fastest", direct_decode=direct, thread_profile=False)
+            with patch.object(transcriber.model, "transcribe", wraps=transcriber.model.transcribe) as wrapped:
+                transcriber.transcribe(audio, normalized=True)
+            self.assertEqual(wrapped.called, not direct)
+            self.assertEqual(transcriber.last_decode_passes, 1)
+
+        accurate = Transcriber(decoding="accurate", thread_profile=False)
+        with patch.object(accurate.model, "transcribe", return_value={"text": ""}) as mock_transcribe:
+            accurate.transcribe(audio, normalized=True)
+        mock_transcribe.assert_called_once()
+
+
+class TestModelCache(unittest.TestCase):
+    """Test cases for the memory-mapped model cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cache_dir = tempfile.mkdtemp()
+
+    @patch("whisper.load_model", side_effect=lambda *args, **kwargs: tiny_whisper())
+    def test_cached_and_reused(self, mock_load_model):
+        """Test that the first load writes the cache and later loads map it."""
+        transcriber = Transcriber(model_cache=True, cache_dir=self.cache_dir, thread_profile=False)
+        self.assertTrue(os.path.exists(transcriber.mmap_path))
+
+        mock_load_model.reset_mock()
+        cached = Transcriber(model_cache=True, cache_dir=self.cache_dir, thread_profile=False)
+        mock_load_model.assert_not_called()
+
+        expected = tiny_whisper()
+        for name, tensor in expected.state_dict().items():
+            torch.testing.assert_close(cached.model.state_dict()[name], tensor, rtol=0, atol=0)
+        self.assertTrue(torch.equal(cached.model.alignment_heads.to_dense(), expected.alignment_heads.to_dense()))
+        mel = torch.zeros(1, 80, 3000)
+        with torch.no_grad():
+            torch.testing.assert_close(cached.model.encoder(mel), expected.encoder(mel))
+
+    @patch("torch.cuda.is_available", return_value=True)
+    @patch("whisper.load_model", side_effect=lambda *args, **kwargs: tiny_whisper())
+    def test_not_used_with_cuda(self, mock_load_model, mock_cuda):
+        """Test that fp32 still loads through Whisper, onto its default device, when CUDA is present."""
+        transcriber = Transcriber(model_cache=True, cache_dir=self.cache_dir, thread_profile=False)
+
+        mock_load_model.assert_called_once_with("base.en")
+        self.assertFalse(os.path.exists(transcriber.mmap_path))
+
+    @patch("whisper.load_model", side_effect=lambda *args, **kwargs: tiny_whisper())
+    def test_rebuilt_for_newer_checkpoint(self, mock_load_model):
+        """Test that a checkpoint newer than the cache is converted again."""
+        transcriber = Transcriber(load=False, model_cache=True, cache_dir=self.cache_dir)
+        checkpoint = os.path.join(self.cache_dir, "base.en.pt")
+        open(checkpoint, "w").close()
+        os.utime(checkpoint, (0, 0))
+        transcriber._load_cached(checkpoint)
+        mock_load_model.reset_mock()
+
+        transcriber._load_cached(checkpoint)
+        mock_load_model.assert_not_called()
+
+        os.utime(checkpoint)
+        os.utime(transcriber.mmap_path, (1, 1))
+        transcriber._load_cached(checkpoint)
+        mock_load_model.assert_called_once()
+
+    @patch("whisper.load_model", side_effect=lambda *args, **kwargs: tiny_whisper())
+    def test_unreadable_cache_ignored(self, mock_load_model):
+        """Test that a corrupt cache falls back to the checkpoint."""
+        transcriber = Transcriber(load=False, model_cache=True, cache_dir=self.cache_dir)
+        with open(transcriber.mmap_path, "w") as f:
+            f.write("not a checkpoint")
+
+        model = transcriber._load_cached(os.path.join(self.cache_dir, "missing.pt"))
+
+        mock_load_model.assert_called_once()
+        self.assertIsInstance(model, Whisper)
+
+
+class TestWarmup(unittest.TestCase):
+    """Test cases for the warm-up pass at load."""
+
+    @patch("whisper.load_model", side_effect=lambda *args, **kwargs: tiny_whisper())
+    def test_warmup_runs_inference(self, mock_load_model):
+        """Test that warm-up transcribes synthetic audio and builds the caches."""
+        with patch.object(Transcriber, "transcribe", autospec=True, side_effect=Transcriber.transcribe) as spy:
+            transcriber = Transcriber(decoding="fastest", warmup=True, thread_profile=False)
+
+        spy.assert_called_once()
+        self.assertIsNotNone(transcriber.warmup_seconds)
+        self.assertIsNone(transcriber.last_decode_passes)
+        self.assertEqual(hann_window.cache_info().currsize, 1)
+        self.assertIsNone(Transcriber(thread_profile=False).warmup_seconds)
+
+    @patch("whisper.load_model")
+    def test_failed_warmup_keeps_model(self, mock_load_model):
+        """Test that a warm-up error does not fail the load."""
+        transcriber = Transcriber(warmup=True, thread_profile=False)
+
+        self.assertTrue(transcriber.ready)
+        self.assertIsNone(transcriber.warmup_seconds)
+
+    @patch("whisper.load_model", side_effect=lambda *args, **kwargs: tiny_whisper())
+    def test_failed_warmup_inference_reported(self, mock_load_model):
+        """Test that an inference error during warm-up is reported, not timed."""
+        with patch.object(Whisper, "decode", side_effect=RuntimeError("broken kernel")), \
+                patch("src.prosody.transcription.log") as mock_log:
+            transcriber = Transcriber(decoding="fastest", warmup=True, thread_profile=False)
+
+        self.assertTrue(transcriber.ready)
+        self.assertIsNone(transcriber.warmup_seconds)
+        self.assertIsInstance(transcriber.last_error, RuntimeError)
+        mock_log.assert_any_call("Warm-up failed: broken kernel", important=True)
+
+
+class TestShortWindow(unittest.TestCase):
+    """Test cases for short-window encoding."""
+
+    def test_bucket_frames(self):
+        """Test that windows are padded to the smallest bucket with a second to spare."""
+        self.assertEqual(bucket_frames(300), 500)
+        self.assertEqual(bucket_frames(401), 1000)
+        self.assertEqual(bucket_frames(1500), 2000)
+        self.assertEqual(bucket_frames(2950), 3000)
+
+    def test_encoder_matches_full_window(self):
+        """Test that the patched encoder is unchanged on 30 s and accepts shorter windows."""
+        model = tiny_whisper()
+        mel = torch.randn(1, 80, 3000)
+        with torch.no_grad():
+            expected = model.encoder(mel)
+            short_window_encoder(model)
+            torch.testing.assert_close(model.encoder(mel), expected)
+            self.assertEqual(model.encoder(torch.randn(1, 80, 500)).shape, (1, 250, 32))
+            with self.assertRaises(ValueError):
+                model.encoder(torch.randn(1, 80, 3200))
+
+    @patch("whisper.load_model", side_effect=lambda *args, **kwargs: tiny_whisper())
+    def test_short_clip_uses_bucket(self, mock_load_model):
+        """Test that short clips are encoded in their bucket and long ones as before."""
+        transcriber = Transcriber(decoding="fastest", short_window=True, thread_profile=False)
+        decode = transcriber.model.decode
+        segments = []
+        transcriber.model.decode = lambda segment, options: segments.append(segment) or decode(segment, options)
+        rng = np.random.RandomState(0)
+
+        with patch.object(transcriber.model, "transcribe", wraps=transcriber.model.transcribe) as wrapped:
+            transcriber.transcribe(rng.randn(16000 * 3).astype(np.float32) * 0.1, normalized=True)
+            wrapped.assert_not_called()
+            self.assertEqual(segments[-1].shape, (80, 500))
+
+            transcriber.transcribe(rng.randn(16000 * 31).astype(np.float32) * 0.1, normalized=True)
+            wrapped.assert_called_once()
+
+
 if __name__ == "__main__":
     unittest.main()
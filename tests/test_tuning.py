@@ -0,0 +1,152 @@
+"""Tests for the tuning module."""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+import torch
+from unittest.mock import Mock, patch
+from src.prosody.tuning import (
+    apply_profile,
+    load_profile,
+    machine_signature,
+    save_profile,
+    thread_candidates,
+    benchmark_clip,
+    time_inference,
+    time_transcription,
+    tune,
+)
+
+
+class TestTuning(unittest.TestCase):
+    """Test cases for thread tuning."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.path = os.path.join(tempfile.mkdtemp(), "threads.json")
+
+    def test_thread_candidates(self):
+        """Test that candidates cover powers of two, half and all CPUs."""
+        self.assertEqual(thread_candidates(12), [1, 2, 4, 6, 8, 12])
+        self.assertEqual(thread_candidates(1), [1])
+
+    def test_profile_round_trip(self):
+        """Test that a saved profile loads back on the same machine."""
+        profile = {"machine": machine_signature(), "num_threads": 4, "interop_threads": 1}
+        save_profile(profile, self.path)
+
+        self.assertEqual(load_profile(self.path), profile)
+
+    def test_profile_from_other_machine_ignored(self):
+        """Test that a profile measured on other hardware is not used."""
+        save_profile({"machine": "other", "num_threads": 4, "interop_threads": 1}, self.path)
+
+        self.assertIsNone(load_profile(self.path))
+        self.assertIsNone(load_profile(self.path + ".missing"))
+
+    @patch("torch.set_num_interop_threads")
+    @patch("torch.set_num_threads")
+    def test_apply_profile(self, mock_threads, mock_interop):
+        """Test that a profile sets both thread pools unless overridden by env."""
+        profile = {"num_threads": 3, "interop_threads": 1}
+        with patch.dict(os.environ, {"OMP_NUM_THREADS": "", "MKL_NUM_THREADS": ""}):
+            self.assertTrue(apply_profile(profile))
+        mock_threads.assert_called_once_with(3)
+        mock_interop.assert_called_once_with(1)
+
+        mock_threads.reset_mock()
+        with patch.dict(os.environ, {"OMP_NUM_THREADS": "2"}):
+            self.assertFalse(apply_profile(profile))
+        mock_threads.assert_not_called()
+
+    def test_tune_picks_fastest(self):
+        """Test that tuning measures each candidate and keeps the fastest."""
+        transcriber = Mock(model_name="tiny", precision="fp32")
+        timings = {1: 0.5, 2: 0.2}
+        original = torch.get_num_threads()
+
+        with patch(
+            "src.prosody.tuning.time_transcription",
+            side_effect=lambda transcriber, clip, repeats: (timings[torch.get_num_threads()], 1),
+        ):
+            profile = tune(transcriber, candidates=[1, 2], repeats=1)
+
+        self.assertEqual(torch.get_num_threads(), original)
+        self.assertEqual(profile["num_threads"], 2)
+        self.assertEqual(profile["machine"], machine_signature())
+        self.assertEqual(set(profile["results"]), {"1", "2"})
+        self.assertEqual(profile["decode_passes"], 1)
+
+    def test_tune_rejects_differing_passes(self):
+        """Test that thread counts decoding in different numbers of passes are not compared."""
+        transcriber = Mock(model_name="tiny", precision="fp32")
+        passes = {1: 1, 2: 3}
+
+        with patch(
+            "src.prosody.tuning.time_transcription",
+            side_effect=lambda transcriber, clip, repeats: (0.1, passes[torch.get_num_threads()]),
+        ):
+            with self.assertRaises(RuntimeError):
+                tune(transcriber, candidates=[1, 2], repeats=1)
+
+    def test_time_inference_fixed_workload(self):
+        """Test that timing runs the encoder and a fixed-length decoder pass."""
+        model = Mock()
+        model.dims.n_mels = 80
+        model.dims.n_audio_ctx = 10
+
+        seconds = time_inference(model, repeats=2, tokens=8)
+
+        self.assertGreaterEqual(seconds, 0.0)
+        self.assertEqual(model.embed_audio.call_count, 3)
+        self.assertEqual(model.embed_audio.call_args[0][0].shape, (1, 80, 20))
+        self.assertEqual(model.logits.call_args[0][0].shape, (1, 8))
+
+    def test_time_transcription_decodes_fixed_clip(self):
+        """Test that timing runs full transcriptions of the same clip."""
+        transcriber = Mock(last_error=None, last_decode_passes=1)
+        clip = benchmark_clip()
+
+        seconds, passes = time_transcription(transcriber, clip, repeats=2)
+
+        self.assertGreaterEqual(seconds, 0.0)
+        self.assertEqual(passes, 1)
+        self.assertEqual(transcriber.transcribe.call_count, 3)
+        for call in transcriber.transcribe.call_args_list:
+            self.assertIs(call[0][0], clip)
+        self.assertEqual(len(clip), 48000)
+        self.assertLessEqual(float(np.abs(clip).max()), 1.0)
+        np.testing.assert_array_equal(benchmark_clip(), clip)
+
+    def test_time_transcription_raises_on_error(self):
+        """Test that a failed transcription is not timed as a fast one."""
+        transcriber = Mock(last_error=ValueError("bad"), last_decode_passes=0)
+
+        with self.assertRaises(RuntimeError):
+            time_transcription(transcriber, benchmark_clip(), repeats=1)
+
+    def test_time_transcription_seeds_sampling(self):
+        """Test that every run starts from the same RNG state."""
+        draws = []
+        transcriber = Mock(last_error=None, last_decode_passes=2)
+        transcriber.transcribe.side_effect = lambda *args, **kwargs: draws.append(torch.rand(1).item())
+
+        time_transcription(transcriber, benchmark_clip(), repeats=2)
+
+        self.assertEqual(len(set(draws)), 1)
+
+    @patch("src.prosody.tuning.main")
+    def test_tune_command(self, mock_tune_main):
+        """Test that `prosody tune` runs the tuner instead of the app."""
+        from src.prosody.main import main
+
+        with patch("src.prosody.main.ProsodyApp") as mock_app_class:
+            main(["tune", "--threads", "1,2"])
+
+        mock_tune_main.assert_called_once_with(["--threads", "1,2"])
+        mock_app_class.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@
 import unittest
 import time
 import threading
+import numpy as np
 from unittest.mock import Mock, patch, MagicMock
 from src.prosody.ui_polished import PolishedWaveformIndicator, type_text
 
@@ -79,6 +80,32 @@ class TestPolishedWaveformIndicator(unittest.TestCase):
 
         # Note: Can't test animation directly without running GUI
 
+    @patch("tkinter.Tk")
+    def test_history_from_current_level(self, mock_tk):
+        """Test that history shifts in the current level without a history source."""
+        indicator = PolishedWaveformIndicator(self.get_audio_level)
+
+        self.audio_level = 0.4
+        indicator._update_history()
+        self.audio_level = 0.7
+        indicator._update_history()
+
+        self.assertAlmostEqual(float(indicator.history[-2]), 0.4, places=6)
+        self.assertAlmostEqual(float(indicator.history[-1]), 0.7, places=6)
+        self.assertEqual(len(indicator.history), 50)
+
+    @patch("tkinter.Tk")
+    def test_history_from_level_history(self, mock_tk):
+        """Test that the recorder's level history is drawn when provided."""
+        levels = np.linspace(0.0, 1.0, 50, dtype=np.float32)
+        get_history = Mock(return_value=levels)
+        indicator = PolishedWaveformIndicator(self.get_audio_level, get_history)
+
+        indicator._update_history()
+
+        get_history.assert_called_once_with(50)
+        np.testing.assert_array_equal(indicator.history, levels)
+
     @patch("tkinter.Tk")
     def test_cleanup(self, mock_tk):
         """Test cleanup on deletion."""
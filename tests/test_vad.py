@@ -0,0 +1,92 @@
+"""Tests for the vad module."""
+
+import unittest
+import numpy as np
+from src.prosody.vad import VoiceActivityDetector
+
+
+def make_utterance(lead=0.5, speech=1.0, tail=0.5, samplerate=16000):
+    """Build a voiced tone surrounded by low-level background noise."""
+    rng = np.random.default_rng(0)
+    total = int((lead + speech + tail) * samplerate)
+    audio = (rng.standard_normal(total) * 1e-4).astype(np.float32)
+    start = int(lead * samplerate)
+    t = np.arange(int(speech * samplerate)) / samplerate
+    audio[start:start + len(t)] += (0.3 * np.sin(2 * np.pi * 200 * t)).astype(np.float32)
+    return audio
+
+
+class TestVoiceActivityDetector(unittest.TestCase):
+    """Test cases for VoiceActivityDetector class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.vad = VoiceActivityDetector(padding_ms=0)
+
+    def test_trims_leading_and_trailing_silence(self):
+        """Test that silence around speech is removed."""
+        audio = make_utterance()
+
+        start, end = self.vad.detect(audio)
+
+        # Speech starts at 0.5s and ends at 1.5s, to within one frame
+        frame = self.vad.frame_length
+        self.assertLessEqual(abs(start - 8000), frame)
+        self.assertLessEqual(abs(end - 24000), frame)
+
+    def test_trim_returns_view(self):
+        """Test that trimming does not copy the audio."""
+        audio = make_utterance()
+        speech = self.vad.trim(audio)
+
+        self.assertTrue(np.shares_memory(speech, audio))
+        self.assertLess(len(speech), len(audio))
+
+    def test_silence_has_no_speech(self):
+        """Test that pure silence yields an empty span."""
+        audio = np.zeros(16000, dtype=np.float32)
+        self.assertEqual(self.vad.detect(audio), (0, 0))
+        self.assertEqual(len(self.vad.trim(audio)), 0)
+
+    def test_white_noise_rejected_by_zcr(self):
+        """Test that loud broadband noise is not mistaken for speech."""
+        rng = np.random.default_rng(1)
+        noise = (rng.standard_normal(16000) * 0.2).astype(np.float32)
+        self.assertEqual(self.vad.detect(noise), (0, 0))
+
+    def test_short_blip_ignored(self):
+        """Test that speech shorter than min_speech_ms is ignored."""
+        audio = make_utterance(speech=0.05)
+        self.assertEqual(self.vad.detect(audio), (0, 0))
+
+    def test_padding_kept_around_speech(self):
+        """Test that padding extends the detected span."""
+        vad = VoiceActivityDetector(padding_ms=100)
+        start, end = vad.detect(make_utterance())
+
+        self.assertLessEqual(abs(start - 6400), vad.frame_length)
+        self.assertLessEqual(abs(end - 25600), vad.frame_length)
+
+    def test_configurable_threshold(self):
+        """Test that a high energy threshold rejects quiet speech."""
+        audio = make_utterance() * 0.05
+        self.assertNotEqual(self.vad.detect(audio), (0, 0))
+
+        strict = VoiceActivityDetector(energy_threshold_db=-20.0)
+        self.assertEqual(strict.detect(audio), (0, 0))
+
+    def test_int16_audio(self):
+        """Test that int16 audio is analysed directly and matches float audio."""
+        audio = make_utterance()
+        audio_int16 = np.round(audio * 32767).astype(np.int16)
+
+        self.assertEqual(self.vad.detect(audio_int16), self.vad.detect(audio))
+        self.assertEqual(self.vad.trim(audio_int16).dtype, np.int16)
+
+    def test_audio_shorter_than_frame(self):
+        """Test that audio shorter than one frame is treated as empty."""
+        self.assertEqual(self.vad.detect(np.ones(10, dtype=np.float32)), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Tests for the worker module."""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.prosody.worker import TranscriptionWorker
+
+
+class FakeTranscriber:
+    """Transcriber stand-in built inside the worker process."""
+
+    def __init__(self, load=False, model_name="fake", precision="fp32", cache_dir=None, decoding="balanced",
+                 short_window=False, warmup=False, model_cache=False):
+        self.precision = precision
+        self.cache_dir = cache_dir
+        self.load_seconds = None
+        self.last_decode_passes = None
+
+    def load(self):
+        self.load_seconds = 0.01
+
+    def transcribe(self, audio, language="en", normalized=False, prompt=None):
+        # Crash once, leaving a marker, if asked to
+        if audio[0] == -1 and not os.path.exists(os.path.join(self.cache_dir, "crashed")):
+            open(os.path.join(self.cache_dir, "crashed"), "w").close()
+            os._exit(1)
+        self.last_decode_passes = 1
+        return f"{len(audio)} {audio.dtype} {float(audio.sum()):.1f} {os.getpid()} {prompt}"
+
+
+class TestTranscriptionWorker(unittest.TestCase):
+    """Test cases for TranscriptionWorker class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cache_dir = tempfile.mkdtemp()
+        self.worker = TranscriptionWorker(load=False, cache_dir=self.cache_dir, factory=FakeTranscriber)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.worker.close()
+
+    def test_transcribes_in_child_process(self):
+        """Test that audio reaches the child through shared memory."""
+        self.worker.load()
+        self.assertTrue(self.worker.ready)
+
+        text = self.worker.transcribe(np.ones(1000, dtype=np.float32), prompt="before")
+
+        length, dtype, total, pid, prompt = text.split()
+        self.assertEqual((length, dtype, total, prompt), ("1000", "float32", "1000.0", "before"))
+        self.assertNotEqual(int(pid), os.getpid())
+        self.assertEqual(int(pid), self.worker.pid)
+
+    def test_shared_block_reused_and_grown(self):
+        """Test that the shared block is kept between calls and grows for long audio."""
+        self.worker.load()
+        self.worker.transcribe(np.ones(100, dtype=np.int16))
+        name = self.worker._shm.name
+        self.worker.transcribe(np.ones(200, dtype=np.int16))
+        self.assertEqual(self.worker._shm.name, name)
+
+        long_audio = np.ones(16000 * 60, dtype=np.float32)
+        self.assertTrue(self.worker.transcribe(long_audio).startswith("960000 float32 960000.0"))
+        self.assertNotEqual(self.worker._shm.name, name)
+
+    def test_restarts_after_crash(self):
+        """Test that a crashed worker is restarted and the request retried."""
+        self.worker.load()
+        first_pid = self.worker.pid
+        audio = np.full(10, -1, dtype=np.float32)
+
+        text = self.worker.transcribe(audio)
+
+        self.assertTrue(text.startswith("10 float32 -10.0"))
+        self.assertEqual(self.worker.restarts, 1)
+        self.assertNotEqual(self.worker.pid, first_pid)
+        self.assertTrue(self.worker.ready)
+
+    def test_unload_stops_child(self):
+        """Test that unloading ends the child process."""
+        self.worker.load()
+        self.worker.unload()
+
+        self.assertFalse(self.worker.ready)
+        self.assertIsNone(self.worker.pid)
+        with self.assertRaises(RuntimeError):
+            self.worker.transcribe(np.ones(10, dtype=np.float32))
+
+
+if __name__ == "__main__":
+    unittest.main()